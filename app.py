@@ -8,110 +8,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"  # 사이드바를 항상 펼쳐진 상태로 시작
 )
 
-import pandas as pd
-import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
 import re
-from collections import Counter
-from wordcloud import WordCloud
-import matplotlib.font_manager as fm
-from konlpy.tag import Okt
-import platform
+import sys
 import os
-from utils import (
-    generate_wordcloud_data, 
-    create_wordcloud, 
-    simple_sentiment_analysis, 
-    analyze_options,
-    get_font_path,
-    get_stopwords,
-    add_stopword,
-    reset_stopwords,
-    remove_stopword,
-    DEFAULT_STOPWORDS,
-    analyze_positive_review_categories,
-    analyze_neutral_review_categories,
-    analyze_negative_review_categories,
-    check_sales_columns,
-    get_sales_periods,
-    analyze_top_products_by_period,
-    analyze_sales_efficiency,
-    analyze_price_segments,
-    analyze_review_sales_correlation,
-    calculate_sales_growth_pattern,
-    get_sales_summary_stats,
-    analyze_review_efficiency,
-    analyze_hidden_gems,
-    analyze_underperforming_products,
-    analyze_review_needed_products,
-    analyze_value_products
-)
-
-# 한글 폰트 설정 함수를 캐시된 리소스로 생성
-@st.cache_resource
-def setup_korean_font():
-    """한글 폰트를 설정하고 폰트 속성을 반환합니다."""
-    korean_font_path = get_font_path()
-    korean_font_prop = None
-
-    if korean_font_path:
-        try:
-            korean_font_prop = fm.FontProperties(fname=korean_font_path)
-            plt.rcParams['font.family'] = korean_font_prop.get_name()
-            print(f"한글 폰트 설정 완료: {korean_font_path}")
-        except Exception as e:
-            print(f"폰트 설정 오류: {e}")
-            # 폰트 파일 경로를 직접 사용
-            plt.rcParams['font.family'] = korean_font_path
-    else:
-        # 폰트 경로를 찾을 수 없는 경우 시스템 내장 폰트 사용 시도
-        try:
-            # Windows
-            if platform.system() == 'Windows':
-                plt.rcParams['font.family'] = 'Malgun Gothic'
-                korean_font_prop = fm.FontProperties(family='Malgun Gothic')
-            # macOS
-            elif platform.system() == 'Darwin':
-                plt.rcParams['font.family'] = 'AppleGothic'
-                korean_font_prop = fm.FontProperties(family='AppleGothic')
-            # Linux (Streamlit Cloud)
-            else:
-                # 나눔고딕 폰트 시도
-                available_fonts = [f.name for f in fm.fontManager.ttflist]
-                nanum_fonts = [f for f in available_fonts if 'Nanum' in f]
-                
-                if nanum_fonts:
-                    plt.rcParams['font.family'] = nanum_fonts[0]
-                    korean_font_prop = fm.FontProperties(family=nanum_fonts[0])
-                    print(f"나눔 폰트 설정: {nanum_fonts[0]}")
-                else:
-                    plt.rcParams['font.family'] = 'DejaVu Sans'
-                    korean_font_prop = fm.FontProperties(family='DejaVu Sans')
-                    print("기본 폰트 사용: DejaVu Sans")
-        except Exception as e:
-            print(f"폰트 설정 실패: {e}")
-            st.warning("한글 폰트를 설정할 수 없습니다. 시각화에서 한글이 제대로 표시되지 않을 수 있습니다.")
-
-    plt.rcParams['axes.unicode_minus'] = False
-    return korean_font_prop
-
-# 폰트 설정 실행 (캐시됨)
-korean_font_prop = setup_korean_font()
-
-# 전역 폰트 속성 설정 함수
-def set_korean_font(ax):
-    """matplotlib axes에 한글 폰트를 설정합니다."""
-    if korean_font_prop:
-        ax.set_xlabel(ax.get_xlabel(), fontproperties=korean_font_prop)
-        ax.set_ylabel(ax.get_ylabel(), fontproperties=korean_font_prop)
-        ax.set_title(ax.get_title(), fontproperties=korean_font_prop)
-        
-        # x축, y축 틱 레이블에 폰트 적용
-        for label in ax.get_xticklabels():
-            label.set_fontproperties(korean_font_prop)
-        for label in ax.get_yticklabels():
-            label.set_fontproperties(korean_font_prop)
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 
 # CSS 스타일 추가
 st.markdown("""
@@ -292,9 +195,388 @@ def save_stopwords_list(stopwords_list):
     except Exception as e:
         st.error(f"불용어 저장 중 오류가 발생했습니다: {e}")
 
+# 함수: 업로드 파일 읽기 (내용 해시 기준 캐시)
+def load_uploaded_file(uploaded_file, streaming_mode=False, upload_cache=None, parse_pool=None):
+    """업로드 파일을 읽어 (파일 유형, 데이터)를 반환합니다 (parse_pool: 엑셀 파싱에 쓰는 프로세스 풀)"""
+    if upload_cache is None:
+        upload_cache = get_upload_cache()
+    key = upload_cache.content_key(uploaded_file)
+    
+    # 리뷰 파일이 아니면 스트리밍 모드와 관계없이 같은 결과 사용
+    cached = upload_cache.get(key)
+    if cached is not None and not (streaming_mode and cached[0] == "review"):
+        return cached
+    
+    if streaming_mode:
+        cached = upload_cache.get(key + ":stream")
+        if cached is not None:
+            return cached
+    
+    # 헤더만 읽어 파일 유형 감지
+    columns = read_file_header(uploaded_file.getvalue(), uploaded_file.name)
+    file_type = detect_file_type(columns, uploaded_file.name)
+    
+    # 스트리밍 모드: 리뷰 파일이면 청크 단위로 집계
+    if streaming_mode and file_type == "review":
+        result = ("review_stream", aggregate_review_file(uploaded_file.getvalue(), uploaded_file.name))
+        upload_cache.put(key + ":stream", result)
+        return result
+    
+    # 분석에 쓰는 컬럼만 읽기 (한 번 파싱한 내용은 사이드카 사본에서 읽음)
+    usecols, dtype = select_analysis_columns(file_type, columns)
+    df = read_uploaded_workbook(uploaded_file.getvalue(), uploaded_file.name, usecols, dtype, parse_pool)
+    
+    # 컬럼 표준화
+    if file_type == "review":
+        df = check_review_columns(df)
+    elif file_type == "option":
+        df = check_option_columns(df)
+    
+    # 내용 해시를 데이터셋 지문으로 사용 (분석 캐시가 프레임 전체를 다시 해시하지 않도록)
+    result = (file_type, Dataset(df, f"{key}:{file_type}"))
+    upload_cache.put(key, result)
+    return result
+
+# 함수: 여러 업로드 파일 동시 읽기
+def load_uploaded_files(uploaded_files, streaming_mode=False):
+    """업로드 파일들을 동시에 읽어 파일별 (파일명, 파일 유형, 데이터, 오류, 소요 시간)을 반환합니다
+    
+    스레드는 캐시 조회, CSV 파싱, 사이드카 읽기를 맡고, 처음 보는 엑셀 파일의 파싱은 GIL을 잡고 있는
+    openpyxl 대신 워커 프로세스에서 실행해 여러 엑셀 파일도 실제로 동시에 읽습니다.
+    """
+    upload_cache = get_upload_cache()
+    script_ctx = get_script_run_ctx()
+    parallel = len(uploaded_files) > 1 and UPLOAD_PARSE_WORKERS > 1
+    parse_pool = get_parse_pool() if parallel else None
+    
+    def load(uploaded_file):
+        # 작업 스레드에서도 캐시 함수가 현재 세션 컨텍스트를 쓰도록 연결
+        add_script_run_ctx(threading.current_thread(), script_ctx)
+        start = time.time()
+        try:
+            file_type, data = load_uploaded_file(uploaded_file, streaming_mode, upload_cache, parse_pool)
+            return uploaded_file.name, file_type, data, None, time.time() - start
+        except Exception as e:
+            # 한 파일의 오류가 다른 파일 처리를 막지 않도록 결과로 돌려줌
+            return uploaded_file.name, None, None, e, time.time() - start
+    
+    if not parallel:
+        return [load(uploaded_file) for uploaded_file in uploaded_files]
+    
+    with ThreadPoolExecutor(max_workers=min(UPLOAD_PARSE_WORKERS, len(uploaded_files))) as executor:
+        return list(executor.map(load, uploaded_files))
+
+# 함수: 샘플 데이터 파일 읽기
+def load_sample_file(path, file_type):
+    """샘플 데이터 파일에서 분석에 쓰는 컬럼만 읽어 표준화한 Dataset을 반환합니다"""
+    usecols, dtype = select_analysis_columns(file_type, read_file_header(path, path))
+    df = read_workbook(path, usecols, dtype)
+    
+    if file_type == "review":
+        df = check_review_columns(df)
+    elif file_type == "option":
+        df = check_option_columns(df)
+    
+    # 파일 경로, 수정 시각, 크기를 데이터셋 지문으로 사용
+    return Dataset(df, f"{file_fingerprint(path)}:{file_type}")
+
+# 함수: 스트리밍 모드 집계 안내 및 표본 리뷰 표시
+def render_review_sample(review_aggregates):
+    """스트리밍 모드일 때 집계 건수와 보관 중인 표본 리뷰를 보여줍니다"""
+    if review_aggregates is None:
+        return
+    
+    st.info(f"📦 스트리밍 모드: 리뷰 {review_aggregates.n_reviews:,}건을 나눠 읽어 집계한 결과입니다.")
+    sample_df = review_aggregates.sample()
+    if not sample_df.empty:
+        with st.expander(f"📄 표본 리뷰 ({len(sample_df):,}건)", expanded=False):
+            st.dataframe(check_review_columns(sample_df), use_container_width=True, hide_index=True)
+
+# 함수: 워드클라우드 이미지 표시 (고해상도 이미지가 아직 없으면 미리보기)
+def show_wordcloud_image(word_count, rendering=False):
+    """캐시된 고해상도 워드클라우드를 표시하고, 없으면 미리보기와 고해상도 보기 버튼을 표시합니다"""
+    wordcloud_png = cached_wordcloud_image(word_count, 'full')
+    if wordcloud_png is None and st.button("고해상도로 보기", key="wordcloud_full"):
+        wordcloud_png = wordcloud_image(word_count, 'full')
+    if wordcloud_png is not None:
+        st.image(wordcloud_png)
+    else:
+        st.image(wordcloud_image(word_count, 'preview'))
+        if rendering:
+            st.caption("미리보기 이미지입니다. 고해상도 이미지는 백그라운드에서 생성 중이며, 완성되면 자동으로 바뀝니다.")
+        else:
+            st.caption("미리보기 이미지입니다.")
+
+# 함수: 고해상도 워드클라우드 완성 확인 (백그라운드 스레드는 화면을 다시 그릴 수 없으므로 이 영역만 1초마다 다시 실행)
+@st.fragment(run_every=1)
+def poll_wordcloud_image(word_count):
+    """고해상도 워드클라우드를 그리는 동안 미리보기를 보여주고, 완성되면 화면을 한 번 다시 실행해 교체합니다"""
+    if not wordcloud_render_pending(word_count, 'full'):
+        # 다시 실행하면 워드클라우드 영역이 캐시된 고해상도 이미지를 표시하고 이 주기 실행은 멈춤
+        st.rerun()
+    show_wordcloud_image(word_count, rendering=True)
+
+# 함수: 불용어 관리와 워드클라우드 결과 (불용어를 바꾸면 이 영역만 다시 실행)
+@st.fragment
+def render_wordcloud_section(review_dataset, review_aggregates, chart_render_mode):
+    """불용어 관리 UI와 워드클라우드, 상위 20개 단어 차트를 표시합니다"""
+    try:
+        # 불용어 관리 UI 표시
+        render_stopwords_ui()
+
+
+        st.markdown("<br>", unsafe_allow_html=True)
+        st.subheader("📊 워드클라우드 분석 결과")
+        st.markdown("<br>", unsafe_allow_html=True)
+
+        with st.spinner("워드클라우드 생성 중..."):
+            if review_aggregates is not None:
+                word_count, top_words = review_aggregates.word_counts(get_stopwords())
+            else:
+                word_count, top_words = generate_wordcloud_data(review_dataset, 'review_content', get_stopwords())
+
+            # 워드클라우드 생성
+            if word_count:
+                # 고해상도 이미지가 캐시에 없으면 미리보기를 먼저 보여주고 백그라운드에서 생성
+                wordcloud_rendering = False
+                if cached_wordcloud_image(word_count, 'full') is None:
+                    wordcloud_rendering = start_wordcloud_render(word_count, 'full')
+
+                # 워드클라우드와 상위 20개 단어를 좌우로 배치
+                col1, col2 = st.columns([1, 1])
+
+                with col1:
+                    # 워드클라우드 제목 추가 (중앙 정렬)
+                    st.markdown("<h3 style='text-align: center;'>워드클라우드</h3>", unsafe_allow_html=True)
+
+                    # 워드클라우드 표시 (캐시된 PNG를 그대로 사용, 생성 중이면 완성될 때까지 이 영역만 주기적으로 확인)
+                    if wordcloud_rendering:
+                        poll_wordcloud_image(word_count)
+                    else:
+                        show_wordcloud_image(word_count)
+
+                with col2:
+                    # 상위 20개 단어 표시 (중앙 정렬)
+                    st.markdown("<h3 style='text-align: center;'>상위 20개 단어</h3>", unsafe_allow_html=True)
+
+                    # 상위 20개 단어 차트 (같은 단어/빈도면 캐시된 이미지 사용)
+                    show_keyword_chart(top_words, chart_render_mode)
+            else:
+                st.warning("분석할 리뷰 데이터가 충분하지 않습니다.")
+    except Exception as e:
+        st.error(f"데이터 처리 중 오류가 발생했습니다: {e}")
+
+# 함수: 기간 선택과 판매현황 분석 탭 (기간을 바꾸면 이 영역만 다시 실행)
+@st.fragment
+def render_sales_section(sales_catalog, available_periods, chart_render_mode):
+    """분석 기간 선택, 매출 요약 통계와 판매현황 분석 탭을 표시합니다"""
+    try:
+        # 기간 선택 필터
+        st.subheader("📅 분석 기간 선택")
+
+        selected_period = st.selectbox(
+            "매출 분석 기간을 선택하세요:",
+            available_periods,
+            index=len(available_periods) - 1 if '1년' in available_periods else 0
+        )
+
+        # 매출 요약 통계
+        st.subheader("📊 매출 요약 통계")
+        summary_stats = get_sales_summary_stats(sales_catalog, selected_period)
+
+        if summary_stats:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("총 매출", f"{summary_stats['총매출']:,}원")
+            with col2:
+                st.metric("평균 매출", f"{summary_stats['평균매출']:,}원")
+            with col3:
+                st.metric("상품 수", f"{summary_stats['상품수']:,}개")
+            with col4:
+                st.metric("최대 매출", f"{summary_stats['최대매출']:,}원")
+
+        # 탭 폰트 크기 강제 적용 (감정분석과 동일한 크기)
+        st.markdown("""
+        <style>
+        .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {
+            font-size: 24px !important;
+            font-weight: 600 !important;
+        }
+        </style>
+        """, unsafe_allow_html=True)
+
+        # 분석 탭 생성
+        tab1, tab2, tab3, tab4, tab5 = st.tabs(["매출 랭킹", "매출 효율성", "가격대별 분석", "리뷰-매출 인사이트", "성장 패턴"])
+
+        with tab1:
+            st.subheader(f"🏆 {selected_period} 매출 상위 10개 상품")
+            top_products = analyze_top_products_by_period(sales_catalog, selected_period, 10)
+
+            if not top_products.empty:
+                st.dataframe(top_products, use_container_width=True, hide_index=True)
+
+                # 매출 랭킹 시각화 (긴 상품명은 15자로 줄임)
+                product_labels = [name[:15] + '...' if len(name) > 15 else name for name in top_products['상품명']]
+                show_bar_chart('sales_ranking', product_labels, top_products[f'{selected_period} 매출'], figsize=(12, 6),
+                               mode=chart_render_mode, title=f'{selected_period} 매출 상위 10개 상품', ylabel='매출 (원)',
+                               value_format='{:,.0f}', value_fontsize=8, rotation=45, ha='right')
+            else:
+                st.info("매출 데이터가 없습니다.")
+
+        with tab2:
+            st.subheader(f"⚡ {selected_period} 매출 효율성 분석")
+            efficiency_data = analyze_sales_efficiency(sales_catalog, selected_period)
+
+            if not efficiency_data.empty:
+                st.dataframe(efficiency_data, use_container_width=True, hide_index=True)
+            else:
+                st.info("매출 효율성 분석을 위한 데이터가 부족합니다.")
+
+        with tab3:
+            st.subheader(f"💰 가격대별 {selected_period} 매출 분석")
+            price_segments = analyze_price_segments(sales_catalog, selected_period)
+
+            if not price_segments.empty:
+                st.dataframe(price_segments, use_container_width=True, hide_index=True)
+            else:
+                st.info("가격대별 분석을 위한 데이터가 부족합니다.")
+
+        with tab4:
+            st.subheader(f"💡 {selected_period} 리뷰-매출 인사이트")
+
+            # 리뷰 데이터 컬럼 확인
+            has_review_score = sales_catalog.has('리뷰점수')
+            has_review_count = sales_catalog.has('리뷰수')
+            has_price = sales_catalog.has('기본판매가격')
+
+            if not has_review_score and not has_review_count:
+                st.info("💡 리뷰-매출 인사이트 분석을 위해서는 리뷰 점수 또는 리뷰수 데이터가 필요합니다.")
+                st.info("📋 필요한 컬럼: '리뷰점수', '리뷰수', '기본판매가격' (선택사항)")
+            else:
+                # 리뷰 효율성 분석
+                st.markdown("#### 📈 리뷰 효율성 분석")
+                if has_review_count:
+                    st.info("💡 리뷰 1건당 매출이 높은 상품 분석")
+
+                    with st.spinner("리뷰 효율성 분석 중..."):
+                        efficiency_result = analyze_review_efficiency(sales_catalog, selected_period)
+
+                        if not efficiency_result.empty:
+                            st.dataframe(efficiency_result, use_container_width=True, hide_index=True)
+                        else:
+                            st.info("분석 가능한 데이터가 부족합니다.")
+                else:
+                    st.info("리뷰 효율성 분석을 위해서는 '리뷰수' 컬럼이 필요합니다.")
+
+                st.divider()
+
+                # 숨겨진 보석 상품
+                st.markdown("#### 💎 숨겨진 보석 상품")
+                if has_review_score:
+                    st.info("💡 매출은 낮지만 리뷰 점수가 높은 상품 (리뷰 점수 4.5+ & 매출 하위 50%)")
+
+                    with st.spinner("숨겨진 보석 분석 중..."):
+                        gems_result = analyze_hidden_gems(sales_catalog, selected_period)
+
+                        if not gems_result.empty:
+                            st.dataframe(gems_result, use_container_width=True, hide_index=True)
+                        else:
+                            st.info("조건에 맞는 숨겨진 보석 상품이 없습니다.")
+                else:
+                    st.info("숨겨진 보석 분석을 위해서는 '리뷰점수' 컬럼이 필요합니다.")
+
+                st.divider()
+
+                # 잠재력 미달 상품
+                st.markdown("#### ⚠️ 잠재력 미달 상품")
+                if has_review_score:
+                    st.info("💡 리뷰는 좋은데 매출이 예상보다 낮은 상품 (리뷰 점수 4.0+ & 매출 상위 75% 미달)")
+
+                    with st.spinner("잠재력 미달 분석 중..."):
+                        underperform_result = analyze_underperforming_products(sales_catalog, selected_period)
+
+                        if not underperform_result.empty:
+                            st.dataframe(underperform_result, use_container_width=True, hide_index=True)
+                        else:
+                            st.info("조건에 맞는 잠재력 미달 상품이 없습니다.")
+                else:
+                    st.info("잠재력 미달 분석을 위해서는 '리뷰점수' 컬럼이 필요합니다.")
+
+                st.divider()
+
+                # 리뷰 확보 필요 상품
+                st.markdown("#### 📝 리뷰 확보 필요 상품")
+                if has_review_count:
+                    st.info("💡 매출은 높은데 리뷰가 적은 상품 (매출 상위 50% & 리뷰수 하위 50%)")
+
+                    with st.spinner("리뷰 확보 필요 분석 중..."):
+                        review_needed_result = analyze_review_needed_products(sales_catalog, selected_period)
+
+                        if not review_needed_result.empty:
+                            st.dataframe(review_needed_result, use_container_width=True, hide_index=True)
+                        else:
+                            st.info("조건에 맞는 리뷰 확보 필요 상품이 없습니다.")
+                else:
+                    st.info("리뷰 확보 필요 분석을 위해서는 '리뷰수' 컬럼이 필요합니다.")
+
+                st.divider()
+
+                # 가성비 인증 상품
+                st.markdown("#### 💰 가성비 인증 상품")
+                if has_review_score and has_price:
+                    st.info("💡 저렴한 가격 + 높은 리뷰 점수 상품 (가격 하위 50% & 리뷰 점수 4.0+)")
+
+                    with st.spinner("가성비 인증 분석 중..."):
+                        value_result = analyze_value_products(sales_catalog, selected_period)
+
+                        if not value_result.empty:
+                            st.dataframe(value_result, use_container_width=True, hide_index=True)
+                        else:
+                            st.info("조건에 맞는 가성비 인증 상품이 없습니다.")
+                else:
+                    st.info("가성비 인증 분석을 위해서는 '리뷰점수'와 '기본판매가격' 컬럼이 필요합니다.")
+
+        with tab5:
+            st.subheader("📈 기간별 성장 패턴")
+
+            if len(available_periods) < 2:
+                st.info("성장 패턴 분석을 위해서는 2개 이상의 매출 기간 컬럼이 필요합니다.")
+            else:
+                st.info("💡 단기 매출을 장기 기간 기준으로 환산해 비교 (성장률 1.2 초과 성장형, 0.8~1.2 안정형, 0.8 미만 감소형)")
+
+                # 비교할 기간 선택 (단기 기간보다 긴 기간만 장기 기간으로 선택 가능)
+                col1, col2 = st.columns(2)
+                with col1:
+                    short_period = st.selectbox("단기 기간:", available_periods[:-1], index=0)
+                long_periods = available_periods[available_periods.index(short_period) + 1:]
+                with col2:
+                    long_period = st.selectbox(
+                        "장기 기간:",
+                        long_periods,
+                        index=long_periods.index('1년') if '1년' in long_periods else len(long_periods) - 1
+                    )
+
+                growth_result = calculate_sales_growth_pattern(sales_catalog, short_period, long_period)
+
+                if not growth_result.empty:
+                    # 패턴별 상품 수
+                    pattern_counts = growth_result['성장패턴'].value_counts()
+                    col1, col2, col3 = st.columns(3)
+                    col1.metric("📈 성장형", f"{pattern_counts.get('성장형', 0):,}개")
+                    col2.metric("➖ 안정형", f"{pattern_counts.get('안정형', 0):,}개")
+                    col3.metric("📉 감소형", f"{pattern_counts.get('감소형', 0):,}개")
+
+                    # 성장률이 높은 순으로 표시
+                    growth_display = growth_result.sort_values('매출성장률', ascending=False).round(2)
+                    st.dataframe(growth_display, use_container_width=True, hide_index=True)
+                else:
+                    st.info(f"{long_period} 매출이 있는 상품이 없습니다.")
+    except Exception as e:
+        st.error(f"데이터 처리 중 오류가 발생했습니다: {e}")
+
 # 함수: 파일 유형 자동 감지
-def detect_file_type(df, filename=""):
-    """업로드된 파일의 유형을 자동으로 감지합니다"""
+def detect_file_type(columns, filename=""):
+    """파일명과 컬럼 이름(헤더)만으로 파일 유형을 자동으로 감지합니다"""
     
     # 1. 파일명 기반 감지 (우선순위 최고)
     filename_lower = filename.lower()
@@ -315,7 +597,7 @@ def detect_file_type(df, filename=""):
         return "sales"
     
     # 2. 컬럼명 기반 감지
-    columns_lower = [col.lower() for col in df.columns]
+    columns_lower = [str(col).lower() for col in columns]
     columns_str = ' '.join(columns_lower)
     print(f"[DEBUG] 컬럼명들(소문자): {columns_lower}")
     
@@ -357,13 +639,7 @@ def detect_file_type(df, filename=""):
 def check_review_columns(df):
     """리뷰 데이터 컬럼 이름 확인 및 표준화"""
     # 리뷰 내용을 담는 컬럼 확인
-    potential_review_columns = ['REVIEW_CONTENT', 'review_content', '리뷰내용', '내용', 'CONTENT']
-    review_col = None
-    
-    for col in potential_review_columns:
-        if col in df.columns:
-            review_col = col
-            break
+    review_col = find_review_column(df.columns)
     
     if review_col and review_col != 'review_content':
         df = df.rename(columns={review_col: 'review_content'})
@@ -373,23 +649,8 @@ def check_review_columns(df):
 # 함수: 옵션 데이터프레임 컬럼 이름 확인 및 수정
 def check_option_columns(df):
     """옵션 데이터 컬럼 이름 확인 및 표준화"""
-    # 옵션 정보를 담는 컬럼 확인
-    potential_option_columns = ['OPTION_INFO', 'option_info', '옵션정보', '옵션명', '상품옵션']
-    option_col = None
-    
-    for col in potential_option_columns:
-        if col in df.columns:
-            option_col = col
-            break
-    
-    # 수량/판매량 정보를 담는 컬럼 확인
-    potential_count_columns = ['COUNT', 'count', '수량', '판매량', '판매수량']
-    count_col = None
-    
-    for col in potential_count_columns:
-        if col in df.columns:
-            count_col = col
-            break
+    # 옵션 정보 컬럼과 수량/판매량 컬럼 확인
+    option_col, count_col = find_option_columns(df.columns)
     
     # 컬럼명 표준화
     if option_col and option_col != 'option_info':
@@ -405,6 +666,11 @@ with st.sidebar:
     st.header("데이터 업로드")
     uploaded_files = st.file_uploader("스마트스토어 데이터 파일", type=["xlsx", "csv"], accept_multiple_files=True, help="리뷰 분석, 옵션 비율, 판매 현황 등의 파일을 업로드하세요. (최대 3개 파일)")
     
+    # 대용량 리뷰 파일은 청크 단위로 읽어 집계만 보관
+    streaming_mode = st.toggle("대용량 리뷰 스트리밍 모드", value=False,
+                               help="리뷰 파일을 나눠 읽으며 단어 빈도, 감정, 카테고리 집계만 남깁니다. 리뷰 원문은 일부 표본만 보관합니다. "
+                                    "엑셀 파일은 리뷰 문자열 표를 한 번에 읽으므로 CSV로 올리면 메모리를 가장 적게 씁니다.")
+    
     # 파일 타입 설명
     with st.expander("📁 파일 타입 설명"):
         st.markdown("""
@@ -440,34 +706,148 @@ with st.sidebar:
         label_visibility="collapsed"
     )
     
-    # 데이터 저장 변수
+    # 데이터 저장 변수 (Dataset은 분석 캐시 키로 쓰는 지문을 함께 보관)
     review_df = None
+    review_dataset = None
+    review_aggregates = None
     option_df = None
     sales_df = None
+    sales_dataset = None
+
+# 분석 모듈(pandas, matplotlib, utils)은 업로드 파일이 있거나 분석 화면일 때 처음 불러옴
+# (홈/사용안내 화면은 무거운 모듈 없이 바로 그려지고, 한 번 불러온 모듈은 이후 재실행에서 재사용)
+load_analysis_modules = bool(uploaded_files) or analysis_option not in ["홈", "데이터 분석 사용안내"]
+if load_analysis_modules:
+    from charts import show_bar_chart, show_keyword_chart, show_pie_chart, EMOTION_COLORS, CHART_MODE, CHART_MODES, CHART_NAMES
+    from utils import (
+        generate_wordcloud_data, 
+        wordcloud_image,
+        cached_wordcloud_image,
+        start_wordcloud_render,
+        wordcloud_render_pending,
+        simple_sentiment_analysis, 
+        analyze_options,
+        get_stopwords,
+        add_stopword,
+        reset_stopwords,
+        remove_stopword,
+        DEFAULT_STOPWORDS,
+        analyze_review_categories_by_sentiment,
+        check_sales_columns,
+        get_sales_periods,
+        build_sales_catalog,
+        analyze_top_products_by_period,
+        analyze_sales_efficiency,
+        analyze_price_segments,
+        analyze_review_sales_correlation,
+        calculate_sales_growth_pattern,
+        get_sales_summary_stats,
+        analyze_review_efficiency,
+        analyze_hidden_gems,
+        analyze_underperforming_products,
+        analyze_review_needed_products,
+        analyze_value_products,
+        find_review_column,
+        read_file_header,
+        aggregate_review_file,
+        get_upload_cache,
+        get_analysis_cache,
+        get_token_cache,
+        read_workbook,
+        read_uploaded_workbook,
+        get_parse_pool,
+        find_option_columns,
+        select_analysis_columns,
+        Dataset,
+        file_fingerprint,
+        UPLOAD_PARSE_WORKERS,
+        SHOW_CACHE_PANEL
+    )
+    
+    # 차트 그리기 방식 (브라우저: 집계 표와 Vega-Lite 명세만 보내 서버 CPU 절약)
+    client_charts = st.sidebar.toggle("브라우저에서 차트 그리기", value=CHART_MODE == 'vega', key="client_charts",
+                                      help="차트를 서버에서 이미지로 그리지 않고 브라우저에서 그립니다. 접속자가 많을 때 서버 부하가 줄어듭니다.")
+    default_chart_mode = 'vega' if client_charts else 'image'
+    
+    # 차트별 그리기 방식 (CHART_MODES 환경 변수는 초기 선택값이고, 화면에서 고른 값이 우선)
+    chart_mode_labels = {'default': '전체 설정 따름', 'image': '서버 이미지', 'vega': '브라우저'}
+    with st.sidebar.expander("차트별 그리기 방식"):
+        chart_choices = {
+            name: st.selectbox(label, list(chart_mode_labels), format_func=chart_mode_labels.get, key=f"chart_mode_{name}",
+                               index=list(chart_mode_labels).index(CHART_MODES.get(name, 'default')))
+            for name, label in CHART_NAMES.items()
+        }
+    chart_render_mode = {name: default_chart_mode if choice == 'default' else choice for name, choice in chart_choices.items()}
 
 # 업로드된 파일들 처리
 if uploaded_files:
-    try:
-        for uploaded_file in uploaded_files:
-            # 파일 읽기
-            if uploaded_file.name.endswith('.csv'):
-                df = pd.read_csv(uploaded_file, encoding='utf-8-sig')
-            else:
-                df = pd.read_excel(uploaded_file)
-            
-            # 파일 타입 감지 및 데이터 할당
-            file_type = detect_file_type(df, uploaded_file.name)
-            
-            if file_type == "review":
-                review_df = check_review_columns(df)
-            elif file_type == "option":
-                option_df = check_option_columns(df)
-            elif file_type == "sales":
-                sales_df = df
-            
-    except Exception as e:
-        st.sidebar.error(f"파일 처리 중 오류가 발생했습니다: {e}")
-        st.sidebar.write(f"오류 상세: {type(e).__name__}: {str(e)}")
+    # 파싱, 유형 감지, 컬럼 표준화를 파일별로 동시에 실행 (같은 내용의 파일은 캐시에서 바로 반환)
+    with st.spinner("업로드 파일 읽는 중..."):
+        upload_results = load_uploaded_files(uploaded_files, streaming_mode)
+    
+    upload_timings = []
+    for file_name, file_type, data, error, elapsed in upload_results:
+        if error is not None:
+            st.sidebar.error(f"{file_name} 처리 중 오류가 발생했습니다: {error}")
+            st.sidebar.write(f"오류 상세: {type(error).__name__}: {str(error)}")
+            continue
+        
+        # 메모리 크기 (dtype 최적화 전 크기를 알면 "전 → 후"로 표시)
+        memory = ""
+        if isinstance(data, Dataset):
+            memory_after = data.data.memory_usage(deep=True).sum() / 1024 ** 2
+            memory_before = data.data.attrs.get('memory_before')
+            memory = f", {memory_after:.2f}MB"
+            if memory_before:
+                memory = f", {memory_before / 1024 ** 2:.2f}MB → {memory_after:.2f}MB"
+        upload_timings.append(f"• {file_name} ({file_type}): {elapsed:.2f}초{memory}")
+        
+        if file_type == "review_stream":
+            review_aggregates = data
+        elif file_type == "review":
+            review_dataset = data
+            review_df = data.data
+        elif file_type == "option":
+            option_df = data.data
+        elif file_type == "sales":
+            sales_dataset = data
+            sales_df = data.data
+    
+    # 파일별 읽기 시간과 메모리 사용량
+    if upload_timings:
+        with st.sidebar.expander("⏱️ 파일 읽기 시간 / 메모리"):
+            st.markdown("  \n".join(upload_timings))
+    
+    # 업로드 캐시 현황
+    upload_cache_stats = get_upload_cache().stats()
+    st.sidebar.caption(f"🗂️ 캐시된 업로드 파일 {upload_cache_stats['파일수']}개 "
+                       f"({upload_cache_stats['사용량MB']:.1f}MB / {upload_cache_stats['최대MB']:.0f}MB)")
+
+# 분석 캐시 관리 패널 (관리자용, 모든 세션이 공유하는 캐시라 SHOW_CACHE_PANEL=1일 때만 표시)
+if load_analysis_modules and SHOW_CACHE_PANEL:
+    analysis_cache = get_analysis_cache()
+    analysis_cache_stats = analysis_cache.stats()
+    with st.sidebar.expander(f"🧠 분석 캐시 {analysis_cache_stats['사용량MB']:.1f}MB / {analysis_cache_stats['최대MB']:.0f}MB"):
+        st.caption(f"항목 {analysis_cache_stats['항목수']}개 · 적중 {analysis_cache_stats['적중']} · "
+                   f"미스 {analysis_cache_stats['미스']} · 제거 {analysis_cache_stats['제거']} · "
+                   f"만료 {analysis_cache_stats['만료']} (유효 시간 {analysis_cache.ttl}초)")
+        
+        function_stats = analysis_cache.function_stats()
+        st.dataframe(function_stats.round(2), hide_index=True, use_container_width=True)
+        st.dataframe(analysis_cache.entries().round(2), hide_index=True, use_container_width=True)
+        
+        clear_target = st.selectbox("비울 대상", ["전체"] + function_stats['함수'].tolist(), key="analysis_cache_clear_target")
+        if st.button("분석 캐시 비우기", key="analysis_cache_clear"):
+            analysis_cache.clear(None if clear_target == "전체" else clear_target)
+            st.rerun()
+    
+    # 형태소 분석 토큰 캐시 현황 (디스크 캐시, 적중/미스/제거는 이 서버 프로세스가 시작된 뒤의 횟수)
+    token_cache = get_token_cache()
+    if token_cache is not None:
+        token_cache_stats = token_cache.stats()
+        st.sidebar.caption(f"🔤 토큰 캐시 {token_cache_stats['항목수']:,}개 / {token_cache_stats['최대항목수']:,}개 · "
+                           f"적중 {token_cache_stats['적중']:,} · 미스 {token_cache_stats['미스']:,} · "
+                           f"제거 {token_cache_stats['제거']:,}")
 
 # 브랜드 메시지 표시 로직 - 라디오 버튼 값 기준
 if analysis_option != "홈":
@@ -509,15 +889,7 @@ if analysis_option == "홈":
                 if key in st.session_state:
                     del st.session_state[key]
             
-            # 캐시는 유지하고 session state만 정리 (대용량 데이터 재분석 성능 보장)
-            # st.cache_data.clear()  # 의도적으로 주석 처리 - 빠른 재분석을 위해 캐시 유지
-            
-            # matplotlib 관련 정리
-            try:
-                import matplotlib.pyplot as plt
-                plt.close('all')  # 모든 matplotlib figure 닫기
-            except:
-                pass
+            # 분석 캐시는 유지하고 session state만 정리 (메모리 한도/유효 시간으로 관리되며 비우기는 분석 캐시 패널에서)
             
             st.session_state.analysis_option = "리뷰 분석 - 감정분석"
             st.rerun()
@@ -695,22 +1067,22 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
         if not uploaded_files:
             if analysis_option in ["리뷰 분석 - 워드클라우드", "리뷰 분석 - 감정분석"]:
                 try:
-                    review_df = pd.read_excel("data/reviewcontents.xlsx")
-                    review_df = check_review_columns(review_df)
+                    review_dataset = load_sample_file("data/reviewcontents.xlsx", "review")
+                    review_df = review_dataset.data
                 except FileNotFoundError:
                     st.warning("⚠️ 샘플 리뷰 데이터 파일을 찾을 수 없습니다. 좌측 사이드바에서 리뷰 데이터 파일을 업로드해주세요.")
                     st.stop()
             elif analysis_option == "스토어 전체 판매현황":
                 try:
-                    sales_df = pd.read_excel("data/스토어전체판매현황.xlsx")
+                    sales_dataset = load_sample_file("data/스토어전체판매현황.xlsx", "sales")
+                    sales_df = sales_dataset.data
                 except FileNotFoundError:
                     st.warning("⚠️ 샘플 판매현황 데이터 파일을 찾을 수 없습니다. 좌측 사이드바에서 판매현황 데이터 파일을 업로드해주세요.")
                     st.stop()
             
             if analysis_option == "옵션 분석":
                 try:
-                    option_df = pd.read_excel("data/옵션비율.xlsx")
-                    option_df = check_option_columns(option_df)
+                    option_df = load_sample_file("data/옵션비율.xlsx", "option").data
                 except FileNotFoundError:
                     st.warning("⚠️ 샘플 옵션 데이터 파일을 찾을 수 없습니다. 좌측 사이드바에서 옵션 데이터 파일을 업로드해주세요.")
                     st.stop()
@@ -720,12 +1092,12 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
             st.header("📊 리뷰 워드클라우드 분석")
             
             # 데이터 확인
-            if review_df is None or review_df.empty:
+            if review_aggregates is None and (review_df is None or review_df.empty):
                 st.error("⚠️ 리뷰 데이터가 없습니다. 리뷰 컨텐츠 파일을 업로드해주세요.")
                 st.info("💡 업로드된 파일에서 다음 컬럼 중 하나가 포함되어야 합니다: REVIEW_CONTENT, review_content, 리뷰내용, 내용, CONTENT")
                 st.stop()
 
-            if 'review_content' not in review_df.columns:
+            if review_aggregates is None and 'review_content' not in review_df.columns:
                 st.error("⚠️ 리뷰 내용 컬럼을 찾을 수 없습니다.")
                 st.info(f"현재 컬럼: {list(review_df.columns)}")
                 st.stop()
@@ -749,91 +1121,22 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
                 - **마케팅 포인트 도출**: 긍정적 키워드를 마케팅 문구에 활용
                 """)
             
-            # 불용어 관리 UI 표시
-            render_stopwords_ui()
+            # 스트리밍 모드 안내 및 표본 리뷰
+            render_review_sample(review_aggregates)
             
-          
-            st.markdown("<br>", unsafe_allow_html=True)
-            st.subheader("📊 워드클라우드 분석 결과")
-            st.markdown("<br>", unsafe_allow_html=True)
-            
-            with st.spinner("워드클라우드 생성 중..."):
-                word_count, top_words = generate_wordcloud_data(review_df, 'review_content')
-                
-                # 워드클라우드 생성
-                if word_count:
-                    wc = create_wordcloud(word_count)
-                    
-                    # 워드클라우드와 상위 20개 단어를 좌우로 배치
-                    col1, col2 = st.columns([1, 1])
-                    
-                    with col1:
-                        # 워드클라우드 제목 추가 (중앙 정렬)
-                        st.markdown("<h3 style='text-align: center;'>워드클라우드</h3>", unsafe_allow_html=True)
-                        
-                        # 워드클라우드 표시
-                        fig1, ax = plt.subplots(figsize=(8, 8))
-                        ax.imshow(wc, interpolation='bilinear')
-                        ax.axis('off')
-                        ax.set_aspect('equal')  # 정사각형 비율 강제 적용
-                        plt.tight_layout(pad=0)
-                        st.pyplot(fig1)
-                        plt.close(fig1)  # 메모리 정리
-                    
-                    with col2:
-                        # 상위 20개 단어 표시 (중앙 정렬)
-                        st.markdown("<h3 style='text-align: center;'>상위 20개 단어</h3>", unsafe_allow_html=True)
-                        
-                        # 상위 단어 막대 그래프
-                        top_words_df = pd.DataFrame({
-                            '단어': list(top_words.keys()),
-                            '언급 횟수': list(top_words.values())
-                        })
-                        
-                        # 리뷰수 기준 내림차순 정렬 (높은 수가 위쪽에)
-                        top_words_df = top_words_df.sort_values('언급 횟수', ascending=True)
-                        
-                        # 상위 20개 단어 차트 생성
-                        fig2, ax = plt.subplots(figsize=(8, 8))
-                        bars = ax.barh(top_words_df['단어'], top_words_df['언급 횟수'], color='steelblue')
-                        
-                        # 리뷰 수 표시
-                        for i, bar in enumerate(bars):
-                            width = bar.get_width()
-                            ax.text(width + width*0.02, bar.get_y() + bar.get_height()/2, 
-                                    f'{int(width):,}', 
-                                    va='center', fontsize=10)
-                    
-                        # x축 범위 조정 (여백 줄이기)
-                        if len(top_words) > 0:
-                            max_count = max(top_words.values())
-                            ax.set_xlim(0, max_count * 1.15)  # 텍스트 위한 여유 공간
-                    
-                        # y축 레이블 폰트 크기 조정
-                        ax.tick_params(axis='y', labelsize=10)
-                        ax.tick_params(axis='x', labelsize=10)
-                    
-                        # 한글 폰트 적용
-                        set_korean_font(ax)
-                    
-                        # 그래프 제목 및 레이아웃 조정
-                        ax.set_title('')
-                        plt.tight_layout(pad=0)
-                        st.pyplot(fig2, use_container_width=True)
-                        plt.close(fig2)  # 메모리 정리
-                else:
-                    st.warning("분석할 리뷰 데이터가 충분하지 않습니다.")
+            # 불용어 관리와 워드클라우드 결과 (불용어 변경 시 이 영역만 다시 실행)
+            render_wordcloud_section(review_dataset, review_aggregates, chart_render_mode)
         
         elif analysis_option == "리뷰 분석 - 감정분석":
             st.header("😊 리뷰 감정분석")
             
             # 데이터 확인
-            if review_df is None or review_df.empty:
+            if review_aggregates is None and (review_df is None or review_df.empty):
                 st.error("⚠️ 리뷰 데이터가 없습니다. 리뷰 컨텐츠 파일을 업로드해주세요.")
                 st.info("💡 업로드된 파일에서 다음 컬럼 중 하나가 포함되어야 합니다: REVIEW_CONTENT, review_content, 리뷰내용, 내용, CONTENT")
                 st.stop()
 
-            if 'review_content' not in review_df.columns:
+            if review_aggregates is None and 'review_content' not in review_df.columns:
                 st.error("⚠️ 리뷰 내용 컬럼을 찾을 수 없습니다.")
                 st.info(f"현재 컬럼: {list(review_df.columns)}")
                 st.stop()
@@ -861,53 +1164,30 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
                 - **마케팅 전략**: 긍정 키워드를 활용한 홍보 포인트 도출
                 """)
             
+            # 스트리밍 모드 안내 및 표본 리뷰
+            render_review_sample(review_aggregates)
+            
             with st.spinner("감정 분석 중..."):
-                # 감정 분석 수행
-                df_sentiment, sentiment_counts = simple_sentiment_analysis(review_df, 'review_content')
+                # 감정 분석 수행 (스트리밍 모드에서는 집계 결과 사용)
+                if review_aggregates is not None:
+                    sentiment_counts = review_aggregates.sentiment_counts()
+                else:
+                    sentiment_dataset, sentiment_counts = simple_sentiment_analysis(review_dataset, 'review_content')
                 
                 # 감정 분석 결과 표시
+                emotions = sentiment_counts['감정'].tolist()
+                emotion_colors = [EMOTION_COLORS[emotion] for emotion in emotions]
                 col1, col2 = st.columns(2)
                 
                 with col1:
                     # 감정별 리뷰 수 막대 그래프
-                    fig, ax = plt.subplots(figsize=(6, 4))
-                    
-                    # 감정별 색상 매핑
-                    emotion_colors = {'긍정': '#28a745', '중립': '#ffa500', '부정': '#dc3545'}
-                    colors = [emotion_colors[emotion] for emotion in sentiment_counts['감정']]
-                    
-                    ax.bar(sentiment_counts['감정'], sentiment_counts['리뷰 수'], color=colors)
-                    ax.set_title('감정별 리뷰 수', pad=20)
-                    ax.set_ylabel('리뷰 수')
-                    for i, v in enumerate(sentiment_counts['리뷰 수']):
-                        ax.text(i, v + max(sentiment_counts['리뷰 수']) * 0.01, str(v), ha='center', va='bottom')
-                    
-                    # y축 범위 조정 (위쪽 여백 확보)
-                    max_val = max(sentiment_counts['리뷰 수'])
-                    ax.set_ylim(0, max_val * 1.15)
-                    
-                    # 한글 폰트 적용
-                    set_korean_font(ax)
-                    
-                    st.pyplot(fig)
+                    show_bar_chart('sentiment', emotions, sentiment_counts['리뷰 수'], figsize=(6, 4), mode=chart_render_mode,
+                                   color=emotion_colors, title='감정별 리뷰 수', title_pad=20, ylabel='리뷰 수', value_format='{}')
                 
                 with col2:
                     # 감정 비율 파이 차트
-                    fig, ax = plt.subplots(figsize=(6, 4))
-                    
-                    # 감정별 색상 매핑
-                    emotion_colors = {'긍정': '#28a745', '중립': '#ffa500', '부정': '#dc3545'}
-                    colors = [emotion_colors[emotion] for emotion in sentiment_counts['감정']]
-                    
-                    ax.pie(sentiment_counts['리뷰 수'], labels=sentiment_counts['감정'], 
-                           autopct='%1.1f%%', colors=colors, startangle=90)
-                    ax.set_title('감정 분포 비율', pad=20)
-                    ax.axis('equal')
-                    
-                    # 한글 폰트 적용
-                    set_korean_font(ax)
-                    
-                    st.pyplot(fig)
+                    show_pie_chart('sentiment', emotions, sentiment_counts['리뷰 수'], figsize=(6, 4), mode=chart_render_mode,
+                                   color=emotion_colors, title='감정 분포 비율')
                 
                 # 섹션 구분
                 st.markdown("---")
@@ -937,129 +1217,73 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
                 </style>
                 """, unsafe_allow_html=True)
                 
+                # 세 감정의 카테고리 분석을 한 번에 계산 (탭은 결과만 나눠 사용)
+                with st.spinner("리뷰 카테고리 분석 중..."):
+                    if review_aggregates is not None:
+                        category_analysis = review_aggregates.category_tables()
+                    else:
+                        category_analysis = analyze_review_categories_by_sentiment(sentiment_dataset, 'review_content')
+                
                 # 탭 생성
                 tab1, tab2, tab3 = st.tabs(["긍정 리뷰", "중립 리뷰", "부정 리뷰"])
                 
                 with tab1:
                     # 긍정 리뷰 카테고리 분석
                     st.markdown("### 📊 긍정 리뷰 카테고리 분석")
-                    with st.spinner("긍정 리뷰 카테고리 분석 중..."):
-                        positive_category_analysis = analyze_positive_review_categories(df_sentiment, 'review_content')
+                    positive_category_analysis = category_analysis['긍정']
+                    
+                    if not positive_category_analysis.empty:
+                        st.dataframe(positive_category_analysis, use_container_width=True, hide_index=True)
                         
-                        if not positive_category_analysis.empty:
-                            st.dataframe(positive_category_analysis, use_container_width=True, hide_index=True)
-                            
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            
-                            # 카테고리별 리뷰 수 시각화
-                            if len(positive_category_analysis) > 0:
-                                fig, ax = plt.subplots(figsize=(8, 4))
-                                ax.bar(positive_category_analysis['카테고리'], positive_category_analysis['리뷰 수'], color='#28a745')
-                                ax.set_title('긍정 리뷰 카테고리별 언급 빈도')
-                                ax.set_ylabel('리뷰 수')
-                                ax.tick_params(axis='x', rotation=45)
-                                
-                                # 한글 폰트 적용
-                                set_korean_font(ax)
-                                
-                                plt.tight_layout()
-                                st.pyplot(fig)
-                        else:
-                            st.info("긍정 리뷰에서 분석 가능한 카테고리를 찾을 수 없습니다.")
+                        st.markdown("<br>", unsafe_allow_html=True)
+                        
+                        # 카테고리별 리뷰 수 시각화
+                        if len(positive_category_analysis) > 0:
+                            show_bar_chart('categories', positive_category_analysis['카테고리'], positive_category_analysis['리뷰 수'],
+                                           mode=chart_render_mode, color='#28a745', title='긍정 리뷰 카테고리별 언급 빈도', ylabel='리뷰 수',
+                                           value_format=None, rotation=45)
+                    else:
+                        st.info("긍정 리뷰에서 분석 가능한 카테고리를 찾을 수 없습니다.")
                 
                 with tab2:
                     # 중립 리뷰 카테고리 분석
                     st.markdown("### 📊 중립 리뷰 카테고리 분석")
-                    with st.spinner("중립 리뷰 카테고리 분석 중..."):
-                        neutral_category_analysis = analyze_neutral_review_categories(df_sentiment, 'review_content')
+                    neutral_category_analysis = category_analysis['중립']
+                    
+                    if not neutral_category_analysis.empty:
+                        st.dataframe(neutral_category_analysis, use_container_width=True, hide_index=True)
                         
-                        if not neutral_category_analysis.empty:
-                            st.dataframe(neutral_category_analysis, use_container_width=True, hide_index=True)
-                            
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            
-                            # 카테고리별 리뷰 수 시각화
-                            if len(neutral_category_analysis) > 0:
-                                fig, ax = plt.subplots(figsize=(8, 4))
-                                
-                                # 막대 너비 설정 (카테고리 수에 따라 조정)
-                                bar_width = max(0.3, min(0.6, 2.0 / len(neutral_category_analysis)))
-                                
-                                bars = ax.bar(range(len(neutral_category_analysis)), 
-                                            neutral_category_analysis['리뷰 수'], 
-                                            width=bar_width, 
-                                            color='#ffa500')
-                                
-                                # 막대 위에 숫자 표시
-                                for i, v in enumerate(neutral_category_analysis['리뷰 수']):
-                                    ax.text(i, v + max(neutral_category_analysis['리뷰 수']) * 0.02, 
-                                           str(v), ha='center', va='bottom')
-                                
-                                # y축 범위 조정 (위쪽 여백 확보)
-                                max_val = max(neutral_category_analysis['리뷰 수'])
-                                ax.set_ylim(0, max_val * 1.15)
-                                
-                                # x축 설정
-                                ax.set_xticks(range(len(neutral_category_analysis)))
-                                ax.set_xticklabels(neutral_category_analysis['카테고리'], rotation=45)
-                                
-                                ax.set_title('중립 리뷰 카테고리별 언급 빈도')
-                                ax.set_ylabel('리뷰 수')
-                                
-                                # 한글 폰트 적용
-                                set_korean_font(ax)
-                                
-                                plt.tight_layout()
-                                st.pyplot(fig)
-                        else:
-                            st.info("중립 리뷰에서 분석 가능한 카테고리를 찾을 수 없습니다.")
+                        st.markdown("<br>", unsafe_allow_html=True)
+                        
+                        # 카테고리별 리뷰 수 시각화
+                        if len(neutral_category_analysis) > 0:
+                            # 막대 너비는 카테고리 수에 따라 조정
+                            show_bar_chart('categories', neutral_category_analysis['카테고리'], neutral_category_analysis['리뷰 수'],
+                                           mode=chart_render_mode, color='#ffa500', title='중립 리뷰 카테고리별 언급 빈도', ylabel='리뷰 수',
+                                           value_format='{}', value_offset=0.02, rotation=45,
+                                           bar_width=max(0.3, min(0.6, 2.0 / len(neutral_category_analysis))))
+                    else:
+                        st.info("중립 리뷰에서 분석 가능한 카테고리를 찾을 수 없습니다.")
                 
                 with tab3:
                     # 부정 리뷰 카테고리 분석
                     st.markdown("### 📊 부정 리뷰 카테고리 분석")
-                    with st.spinner("부정 리뷰 카테고리 분석 중..."):
-                        negative_category_analysis = analyze_negative_review_categories(df_sentiment, 'review_content')
+                    negative_category_analysis = category_analysis['부정']
+                    
+                    if not negative_category_analysis.empty:
+                        st.dataframe(negative_category_analysis, use_container_width=True, hide_index=True)
                         
-                        if not negative_category_analysis.empty:
-                            st.dataframe(negative_category_analysis, use_container_width=True, hide_index=True)
-                            
-                            st.markdown("<br>", unsafe_allow_html=True)
-                            
-                            # 카테고리별 리뷰 수 시각화
-                            if len(negative_category_analysis) > 0:
-                                fig, ax = plt.subplots(figsize=(8, 4))
-                                
-                                # 막대 너비 설정 (카테고리 수에 따라 조정)
-                                bar_width = max(0.3, min(0.6, 2.0 / len(negative_category_analysis)))
-                                
-                                bars = ax.bar(range(len(negative_category_analysis)), 
-                                            negative_category_analysis['리뷰 수'], 
-                                            width=bar_width, 
-                                            color='#dc3545')
-                                
-                                # 막대 위에 숫자 표시
-                                for i, v in enumerate(negative_category_analysis['리뷰 수']):
-                                    ax.text(i, v + max(negative_category_analysis['리뷰 수']) * 0.02, 
-                                           str(v), ha='center', va='bottom')
-                                
-                                # y축 범위 조정 (위쪽 여백 확보)
-                                max_val = max(negative_category_analysis['리뷰 수'])
-                                ax.set_ylim(0, max_val * 1.15)
-                                
-                                # x축 설정
-                                ax.set_xticks(range(len(negative_category_analysis)))
-                                ax.set_xticklabels(negative_category_analysis['카테고리'], rotation=45)
-                                
-                                ax.set_title('부정 리뷰 카테고리별 언급 빈도')
-                                ax.set_ylabel('리뷰 수')
-                                
-                                # 한글 폰트 적용
-                                set_korean_font(ax)
-                                
-                                plt.tight_layout()
-                                st.pyplot(fig)
-                        else:
-                            st.info("부정 리뷰에서 분석 가능한 카테고리를 찾을 수 없습니다.")
+                        st.markdown("<br>", unsafe_allow_html=True)
+                        
+                        # 카테고리별 리뷰 수 시각화
+                        if len(negative_category_analysis) > 0:
+                            # 막대 너비는 카테고리 수에 따라 조정
+                            show_bar_chart('categories', negative_category_analysis['카테고리'], negative_category_analysis['리뷰 수'],
+                                           mode=chart_render_mode, color='#dc3545', title='부정 리뷰 카테고리별 언급 빈도', ylabel='리뷰 수',
+                                           value_format='{}', value_offset=0.02, rotation=45,
+                                           bar_width=max(0.3, min(0.6, 2.0 / len(negative_category_analysis))))
+                    else:
+                        st.info("부정 리뷰에서 분석 가능한 카테고리를 찾을 수 없습니다.")
         
         elif analysis_option == "옵션 분석":
             st.header("🎯 옵션 분석")
@@ -1112,33 +1336,8 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
                 st.markdown("<br><br>", unsafe_allow_html=True)
                 
                 # 상위 10개 옵션 막대 그래프
-                fig, ax = plt.subplots(figsize=(10, 6))
-                
-                # 막대 그래프 생성 (인덱스를 X축 위치로 사용)
-                x_positions = range(len(top_options))
-                bars = ax.bar(x_positions, top_options['count'], color='steelblue')
-                
-                # X축 레이블 설정 (옵션명)
-                ax.set_xticks(x_positions)
-                ax.set_xticklabels(top_options['option_info'], rotation=45, ha='right')
-                
-                # 막대 위에 판매량 표시
-                for i, v in enumerate(top_options['count']):
-                    ax.text(i, v + max(top_options['count']) * 0.01, 
-                           f'{v:,}', ha='center', va='bottom')
-                
-                # Y축 범위 조정 (위쪽 여백 확보)
-                max_val = max(top_options['count'])
-                ax.set_ylim(0, max_val * 1.15)
-                
-                ax.set_title('상위 10개 옵션 판매량')
-                ax.set_ylabel('판매량')
-                
-                # 한글 폰트 적용
-                set_korean_font(ax)
-                
-                plt.tight_layout()
-                st.pyplot(fig)
+                show_bar_chart('options', top_options['option_info'], top_options['count'], figsize=(10, 6), mode=chart_render_mode,
+                               title='상위 10개 옵션 판매량', ylabel='판매량', rotation=45, ha='right')
         
         elif analysis_option == "스토어 전체 판매현황":
             if sales_df is not None:
@@ -1150,7 +1349,7 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
                     ### 🏪 스토어 전체 판매현황 분석이란?
                     스토어의 **전체 상품 판매 데이터**를 다각도로 분석하여 매출 성과와 트렌드를 파악하는 종합 분석입니다.
                     
-                    ### 📊 제공하는 4가지 분석
+                    ### 📊 제공하는 5가지 분석
                     
                     #### 1. 🏆 매출 랭킹
                     - 기간별 매출 상위 10개 상품 순위
@@ -1172,194 +1371,23 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
                     - **잠재력 미달**: 리뷰는 좋은데 매출이 예상보다 낮은 상품 (리뷰 점수 4.0 이상 & 매출 상위 75%에 못미치는 상품)
                     - **리뷰 확보 필요**: 매출은 높은데 리뷰가 적은 상품 (매출 상위 50% & 리뷰수 하위 50%에 속하는 상품)
                     - **가성비 인증**: 저렴한 가격 + 높은 리뷰 점수 상품 (가격 하위 50% & 리뷰 점수 4.0 이상)
+                    
+                    #### 5. 📈 성장 패턴
+                    **성장률 = 단기 기간 매출 ÷ 장기 기간 매출 × (장기 일수 ÷ 단기 일수)**
+                    - 단기 매출을 장기 기간 기준으로 환산해 최근 추세를 비교 (판매건수도 같은 방식)
+                    - 성장률 1.2 초과 성장형, 0.8~1.2 안정형, 0.8 미만 감소형
                     """)
                 
                 # 사용 가능한 기간 가져오기
                 available_periods = get_sales_periods(sales_df)
                 
+                # 합계 행 제외, 기간별 유효 상품 판별을 한 번만 계산해 모든 분석에서 공유
+                sales_catalog = build_sales_catalog(sales_dataset)
+                
                 if len(available_periods) == 0:
                     st.error("매출 데이터를 찾을 수 없습니다.")
                 else:
-                    # 기간 선택 필터
-                    st.subheader("📅 분석 기간 선택")
-                    
-                    selected_period = st.selectbox(
-                        "매출 분석 기간을 선택하세요:",
-                        available_periods,
-                        index=len(available_periods) - 1 if '1년' in available_periods else 0
-                    )
-                    
-                    # 매출 요약 통계
-                    st.subheader("📊 매출 요약 통계")
-                    summary_stats = get_sales_summary_stats(sales_df, selected_period)
-                    
-                    if summary_stats:
-                        col1, col2, col3, col4 = st.columns(4)
-                        with col1:
-                            st.metric("총 매출", f"{summary_stats['총매출']:,}원")
-                        with col2:
-                            st.metric("평균 매출", f"{summary_stats['평균매출']:,}원")
-                        with col3:
-                            st.metric("상품 수", f"{summary_stats['상품수']:,}개")
-                        with col4:
-                            st.metric("최대 매출", f"{summary_stats['최대매출']:,}원")
-                    
-                    # 탭 폰트 크기 강제 적용 (감정분석과 동일한 크기)
-                    st.markdown("""
-                    <style>
-                    .stTabs [data-baseweb="tab-list"] button [data-testid="stMarkdownContainer"] p {
-                        font-size: 24px !important;
-                        font-weight: 600 !important;
-                    }
-                    </style>
-                    """, unsafe_allow_html=True)
-                    
-                    # 분석 탭 생성
-                    tab1, tab2, tab3, tab4 = st.tabs(["매출 랭킹", "매출 효율성", "가격대별 분석", "리뷰-매출 인사이트"])
-                    
-                    with tab1:
-                        st.subheader(f"🏆 {selected_period} 매출 상위 10개 상품")
-                        top_products = analyze_top_products_by_period(sales_df, selected_period, 10)
-                        
-                        if not top_products.empty:
-                            st.dataframe(top_products, use_container_width=True, hide_index=True)
-                            
-                            # 매출 랭킹 시각화
-                            fig, ax = plt.subplots(figsize=(12, 6))
-                            
-                            bars = ax.bar(range(len(top_products)), 
-                                         top_products[f'{selected_period} 매출'], 
-                                         color='steelblue')
-                            
-                            ax.set_xticks(range(len(top_products)))
-                            ax.set_xticklabels([name[:15] + '...' if len(name) > 15 else name 
-                                               for name in top_products['상품명']], 
-                                              rotation=45, ha='right')
-                            
-                            for i, v in enumerate(top_products[f'{selected_period} 매출']):
-                                ax.text(i, v + max(top_products[f'{selected_period} 매출']) * 0.01, 
-                                       f'{v:,.0f}', ha='center', va='bottom', fontsize=8)
-                            
-                            ax.set_ylabel('매출 (원)')
-                            ax.set_title(f'{selected_period} 매출 상위 10개 상품')
-                            set_korean_font(ax)
-                            plt.tight_layout()
-                            st.pyplot(fig)
-                        else:
-                            st.info("매출 데이터가 없습니다.")
-                    
-                    with tab2:
-                        st.subheader(f"⚡ {selected_period} 매출 효율성 분석")
-                        efficiency_data = analyze_sales_efficiency(sales_df, selected_period)
-                        
-                        if not efficiency_data.empty:
-                            st.dataframe(efficiency_data, use_container_width=True, hide_index=True)
-                        else:
-                            st.info("매출 효율성 분석을 위한 데이터가 부족합니다.")
-                    
-                    with tab3:
-                        st.subheader(f"💰 가격대별 {selected_period} 매출 분석")
-                        price_segments = analyze_price_segments(sales_df, selected_period)
-                        
-                        if not price_segments.empty:
-                            st.dataframe(price_segments, use_container_width=True, hide_index=True)
-                        else:
-                            st.info("가격대별 분석을 위한 데이터가 부족합니다.")
-                    
-                    with tab4:
-                        st.subheader(f"💡 {selected_period} 리뷰-매출 인사이트")
-                        
-                        # 리뷰 데이터 컬럼 확인
-                        has_review_score = '리뷰점수' in sales_df.columns
-                        has_review_count = '리뷰수' in sales_df.columns
-                        has_price = '기본판매가격' in sales_df.columns
-                        
-                        if not has_review_score and not has_review_count:
-                            st.info("💡 리뷰-매출 인사이트 분석을 위해서는 리뷰 점수 또는 리뷰수 데이터가 필요합니다.")
-                            st.info("📋 필요한 컬럼: '리뷰점수', '리뷰수', '기본판매가격' (선택사항)")
-                        else:
-                            # 리뷰 효율성 분석
-                            st.markdown("#### 📈 리뷰 효율성 분석")
-                            if has_review_count:
-                                st.info("💡 리뷰 1건당 매출이 높은 상품 분석")
-                                
-                                with st.spinner("리뷰 효율성 분석 중..."):
-                                    efficiency_result = analyze_review_efficiency(sales_df, selected_period)
-                                    
-                                    if not efficiency_result.empty:
-                                        st.dataframe(efficiency_result, use_container_width=True, hide_index=True)
-                                    else:
-                                        st.info("분석 가능한 데이터가 부족합니다.")
-                            else:
-                                st.info("리뷰 효율성 분석을 위해서는 '리뷰수' 컬럼이 필요합니다.")
-                            
-                            st.divider()
-                            
-                            # 숨겨진 보석 상품
-                            st.markdown("#### 💎 숨겨진 보석 상품")
-                            if has_review_score:
-                                st.info("💡 매출은 낮지만 리뷰 점수가 높은 상품 (리뷰 점수 4.5+ & 매출 하위 50%)")
-                                
-                                with st.spinner("숨겨진 보석 분석 중..."):
-                                    gems_result = analyze_hidden_gems(sales_df, selected_period)
-                                    
-                                    if not gems_result.empty:
-                                        st.dataframe(gems_result, use_container_width=True, hide_index=True)
-                                    else:
-                                        st.info("조건에 맞는 숨겨진 보석 상품이 없습니다.")
-                            else:
-                                st.info("숨겨진 보석 분석을 위해서는 '리뷰점수' 컬럼이 필요합니다.")
-                            
-                            st.divider()
-                            
-                            # 잠재력 미달 상품
-                            st.markdown("#### ⚠️ 잠재력 미달 상품")
-                            if has_review_score:
-                                st.info("💡 리뷰는 좋은데 매출이 예상보다 낮은 상품 (리뷰 점수 4.0+ & 매출 상위 75% 미달)")
-                                
-                                with st.spinner("잠재력 미달 분석 중..."):
-                                    underperform_result = analyze_underperforming_products(sales_df, selected_period)
-                                    
-                                    if not underperform_result.empty:
-                                        st.dataframe(underperform_result, use_container_width=True, hide_index=True)
-                                    else:
-                                        st.info("조건에 맞는 잠재력 미달 상품이 없습니다.")
-                            else:
-                                st.info("잠재력 미달 분석을 위해서는 '리뷰점수' 컬럼이 필요합니다.")
-                            
-                            st.divider()
-                            
-                            # 리뷰 확보 필요 상품
-                            st.markdown("#### 📝 리뷰 확보 필요 상품")
-                            if has_review_count:
-                                st.info("💡 매출은 높은데 리뷰가 적은 상품 (매출 상위 50% & 리뷰수 하위 50%)")
-                                
-                                with st.spinner("리뷰 확보 필요 분석 중..."):
-                                    review_needed_result = analyze_review_needed_products(sales_df, selected_period)
-                                    
-                                    if not review_needed_result.empty:
-                                        st.dataframe(review_needed_result, use_container_width=True, hide_index=True)
-                                    else:
-                                        st.info("조건에 맞는 리뷰 확보 필요 상품이 없습니다.")
-                            else:
-                                st.info("리뷰 확보 필요 분석을 위해서는 '리뷰수' 컬럼이 필요합니다.")
-                            
-                            st.divider()
-                            
-                            # 가성비 인증 상품
-                            st.markdown("#### 💰 가성비 인증 상품")
-                            if has_review_score and has_price:
-                                st.info("💡 저렴한 가격 + 높은 리뷰 점수 상품 (가격 하위 50% & 리뷰 점수 4.0+)")
-                                
-                                with st.spinner("가성비 인증 분석 중..."):
-                                    value_result = analyze_value_products(sales_df, selected_period)
-                                    
-                                    if not value_result.empty:
-                                        st.dataframe(value_result, use_container_width=True, hide_index=True)
-                                    else:
-                                        st.info("조건에 맞는 가성비 인증 상품이 없습니다.")
-                            else:
-                                st.info("가성비 인증 분석을 위해서는 '리뷰점수'와 '기본판매가격' 컬럼이 필요합니다.")
+                    render_sales_section(sales_catalog, available_periods, chart_render_mode)
                         
             else:
                 st.error("⚠️ 판매현황 데이터가 없습니다. 스토어 전체 판매현황 파일을 업로드해주세요.")
@@ -1368,3 +1396,15 @@ elif analysis_option not in ["홈", "데이터 분석 사용안내"]:
 
     except Exception as e:
         st.error(f"데이터 처리 중 오류가 발생했습니다: {e}")
+
+# 화면을 모두 그린 뒤 분석 모듈과 리뷰 분석용 형태소 분석기(JVM)를 백그라운드에서 미리 준비
+# (OKT_WARMUP=0이면 백그라운드에서 아무 모듈도 불러오지 않음, 값은 utils.OKT_WARMUP과 같은 환경 변수)
+def warm_up_analysis_modules():
+    from utils import start_okt_warmup
+    start_okt_warmup()
+
+if os.environ.get('OKT_WARMUP', '1') != '0':
+    if 'utils' in sys.modules:
+        warm_up_analysis_modules()
+    else:
+        threading.Thread(target=warm_up_analysis_modules, name='analysis-warmup', daemon=True).start()
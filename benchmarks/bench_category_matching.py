@@ -0,0 +1,116 @@
+"""리뷰 카테고리 분석 벤치마크: 키워드별 str.contains vs 키워드 매처(Aho-Corasick)
+
+샘플 리뷰(data/reviewcontents.xlsx)의 단어를 섞어 대부분 서로 다른 리뷰를 만들고,
+기존 방식(카테고리/키워드마다 전체 컬럼 str.contains)과 새 방식(리뷰당 한 번 스캔)의
+결과가 같은지 확인한 뒤 실행 시간을 비교합니다.
+
+실행: python benchmarks/bench_category_matching.py [리뷰 수]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import (clean_text, analyze_categories_in_texts, get_category_matcher,
+                   POSITIVE_CATEGORY_KEYWORDS, NEUTRAL_CATEGORY_KEYWORDS, NEGATIVE_CATEGORY_KEYWORDS)
+
+SAMPLE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'reviewcontents.xlsx')
+
+CATEGORY_KEYWORDS = {
+    '긍정': POSITIVE_CATEGORY_KEYWORDS,
+    '중립': NEUTRAL_CATEGORY_KEYWORDS,
+    '부정': NEGATIVE_CATEGORY_KEYWORDS,
+}
+
+
+def legacy_analyze(sentiment_reviews, category_keywords):
+    """기존 구현: 카테고리마다 정규식 한 번 + 키워드마다 str.contains 한 번"""
+    if len(sentiment_reviews) == 0:
+        return pd.DataFrame(columns=['카테고리', '리뷰 수', '비율(%)', '주요 키워드'])
+
+    category_results = []
+    total_sentiment = len(sentiment_reviews)
+
+    for category, keywords in category_keywords.items():
+        pattern = '|'.join(keywords)
+        category_mask = sentiment_reviews.str.contains(pattern, na=False, case=False)
+        category_count = int(category_mask.sum())
+
+        if category_count > 0:
+            mentioned_keywords = []
+            for keyword in keywords:
+                keyword_count = sentiment_reviews.str.contains(keyword, na=False, case=False).sum()
+                if keyword_count > 0:
+                    mentioned_keywords.append((keyword, keyword_count))
+
+            mentioned_keywords.sort(key=lambda x: x[1], reverse=True)
+            top_keywords = [f"{kw[0]}({kw[1]})" for kw in mentioned_keywords[:10]]
+
+            category_results.append({
+                '카테고리': category,
+                '리뷰 수': category_count,
+                '비율(%)': round((category_count / total_sentiment) * 100, 1),
+                '주요 키워드': ', '.join(top_keywords)
+            })
+
+    result_df = pd.DataFrame(category_results)
+    if len(result_df) > 0:
+        result_df = result_df.sort_values('리뷰 수', ascending=False).reset_index(drop=True)
+
+    return result_df
+
+
+def make_reviews(n_reviews, seed=0):
+    """샘플 리뷰 단어를 무작위로 이어 붙여 합성 리뷰를 만듭니다."""
+    rng = np.random.default_rng(seed)
+    sample = pd.read_excel(SAMPLE_PATH)['리뷰내용'].dropna().map(clean_text)
+    words = np.array(' '.join(sample).split())
+
+    lengths = rng.integers(3, 30, size=n_reviews)
+    starts = rng.integers(0, len(words) - 30, size=n_reviews)
+    return pd.Series([' '.join(words[s:s + l]) for s, l in zip(starts, lengths)])
+
+
+def run(label, reviews, sentiments):
+    print(f"\n[{label}] 리뷰 {len(reviews):,}개 "
+          f"(고유 {reviews.nunique():,}개, 감정 분포 {sentiments.value_counts().to_dict()})")
+
+    start = time.perf_counter()
+    legacy = {s: legacy_analyze(reviews[sentiments == s], kw) for s, kw in CATEGORY_KEYWORDS.items()}
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    current = {s: analyze_categories_in_texts(reviews[sentiments == s], kw) for s, kw in CATEGORY_KEYWORDS.items()}
+    current_time = time.perf_counter() - start
+
+    for sentiment in CATEGORY_KEYWORDS:
+        pd.testing.assert_frame_equal(legacy[sentiment], current[sentiment], check_dtype=False)
+
+    print(f"  기존 str.contains : {legacy_time:8.3f}초")
+    print(f"  키워드 매처       : {current_time:8.3f}초  ({legacy_time / current_time:.1f}배, 결과 동일)")
+
+
+def main():
+    n_reviews = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    reviews = make_reviews(n_reviews)
+    rng = np.random.default_rng(1)
+
+    # 매처 생성 비용은 프로세스당 한 번이므로 측정에서 제외
+    start = time.perf_counter()
+    matcher = get_category_matcher()
+    print(f"매처 생성: 키워드 {len(matcher.keywords)}개, {time.perf_counter() - start:.4f}초")
+
+    # 샘플 데이터와 비슷한 감정 분포 / 균등 분포
+    skewed = pd.Series(rng.choice(['긍정', '중립', '부정'], size=n_reviews, p=[0.18, 0.81, 0.01]))
+    uniform = pd.Series(rng.choice(['긍정', '중립', '부정'], size=n_reviews))
+
+    run('샘플 분포', reviews, skewed)
+    run('균등 분포', reviews, uniform)
+
+
+if __name__ == '__main__':
+    main()
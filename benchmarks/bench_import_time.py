@@ -0,0 +1,75 @@
+"""앱 시작 시간 벤치마크: 모듈 import 시간 감사 + 홈/안내 화면 첫 화면 시간
+
+1) python -X importtime으로 utils를 불러올 때 시간이 많이 드는 모듈을 누적 시간 순으로 보여줍니다.
+2) 새 프로세스에서 AppTest로 각 화면을 처음 실행하는 시간을 잽니다. (서버처럼 streamlit은 미리 불러온 상태,
+   화면과 무관한 형태소 분석기 예열은 끔. OKT_WARMUP=0이면 앱이 백그라운드에서 모듈을 불러오지 않으므로
+   불러온 모듈 목록은 실행 시점과 관계없이 같음)
+
+실행: python benchmarks/bench_import_time.py [상위 모듈 수] [앱 디렉토리]
+(앱 디렉토리를 지정하면 그 디렉토리의 app.py / utils.py를 측정, 예: 변경 전 커밋을 git worktree로 꺼내 비교)
+측정 결과: benchmarks/import_time_report.txt
+"""
+import os
+import sys
+import subprocess
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PAGES = ["홈", "데이터 분석 사용안내", "리뷰 분석 - 워드클라우드"]
+
+FIRST_RUN_SCRIPT = """
+import sys, time
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=600)
+at.session_state['analysis_option'] = {page!r}
+start = time.perf_counter()
+at.run()
+elapsed = time.perf_counter() - start
+heavy = [name for name in ('pandas', 'matplotlib.pyplot', 'seaborn', 'wordcloud', 'konlpy') if name in sys.modules]
+print(f"{{elapsed:.3f}} {{','.join(heavy) or '-'}}")
+"""
+
+
+def import_report(module='utils', top=15, root=ROOT):
+    """-X importtime 출력에서 (누적 마이크로초, 모듈 이름)을 누적 시간 순으로 반환합니다."""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            cwd=root, capture_output=True, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        depth = (len(name) - len(name.lstrip())) // 2
+        # 최상위 import와 그 바로 아래 모듈만 (하위 모듈은 상위 누적 시간에 포함)
+        if depth <= 2:
+            rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def first_run_time(page, root=ROOT):
+    """새 프로세스에서 화면을 처음 실행하는 시간(초)과 그때 불러온 무거운 모듈"""
+    env = dict(os.environ, OKT_WARMUP='0')
+    script = FIRST_RUN_SCRIPT.format(app=os.path.join(root, 'app.py'), page=page)
+    result = subprocess.run([sys.executable, '-W', 'ignore', '-c', script],
+                            cwd=root, env=env, capture_output=True, text=True, check=True)
+    elapsed, heavy = result.stdout.strip().splitlines()[-1].split()
+    return float(elapsed), heavy
+
+
+def main():
+    top = int(sys.argv[1]) if len(sys.argv) > 1 else 15
+    root = os.path.abspath(sys.argv[2]) if len(sys.argv) > 2 else ROOT
+    
+    print("import utils 누적 시간 상위 모듈")
+    for cumulative, name in import_report(top=top, root=root):
+        print(f"  {cumulative / 1000:8.1f}ms  {name}")
+    
+    print("\n화면별 첫 실행 시간 (새 프로세스, 3회 중 최소)")
+    for page in PAGES:
+        runs = [first_run_time(page, root) for _ in range(3)]
+        elapsed = min(run[0] for run in runs)
+        print(f"  {page:16s}: {elapsed:6.2f}초  불러온 모듈: {runs[0][1]}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+"""리뷰 분석 최대 메모리 벤치마크: 전체 로드 vs 스트리밍 집계
+
+샘플 리뷰(data/reviewcontents.xlsx) 두 개씩을 무작위로 이어 붙여 서로 다른 리뷰로 큰 CSV를 만들고,
+각 방식을 빈 토큰 캐시를 가진 별도 프로세스에서 실행해 최대 RSS와 결과 일치 여부를 비교합니다.
+(모든 리뷰가 캐시에 없으므로 형태소 분석 워커가 실제로 실행됨. 워커 RSS는 워커 하나의 최대값)
+
+실행: python benchmarks/bench_streaming_memory.py [리뷰 수] [워커 수]
+"""
+import os
+import sys
+import time
+import resource
+import tempfile
+import multiprocessing
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+SAMPLE_PATH = os.path.join(ROOT, 'data', 'reviewcontents.xlsx')
+
+
+def make_csv(n_reviews, seed=0):
+    """샘플 리뷰 두 개를 무작위로 이어 붙여 중복이 거의 없는 리뷰 CSV 바이트를 만듭니다."""
+    sample = pd.read_excel(SAMPLE_PATH)['리뷰내용'].fillna('').astype(str).to_numpy(dtype=object)
+    rng = np.random.default_rng(seed)
+    first = sample[rng.integers(0, len(sample), size=n_reviews)]
+    second = sample[rng.integers(0, len(sample), size=n_reviews)]
+    reviews = pd.DataFrame({'리뷰내용': first + ' ' + second}).drop_duplicates()
+    return reviews.to_csv(index=False).encode('utf-8-sig'), len(reviews)
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 RSS(MB). ru_maxrss는 exec 전 부모 값을 물려받으므로 VmHWM을 우선 사용"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def worker_peak_rss_mb():
+    """종료된 자식 프로세스(토큰화 워커) 중 가장 큰 최대 RSS(MB)"""
+    return resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / 1024
+
+
+def run_full(path, queue):
+    import io
+    import utils
+
+    # 업로드된 파일처럼 원본 바이트는 메모리에 있는 상태에서 시작
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    start = time.perf_counter()
+    df = pd.read_csv(io.BytesIO(data), encoding='utf-8-sig').rename(columns={'리뷰내용': 'review_content'})
+    word_count, _ = utils.generate_wordcloud_data(df, 'review_content', utils.DEFAULT_STOPWORDS)
+    df_sentiment, sentiment_counts = utils.simple_sentiment_analysis(df, 'review_content')
+    tables = utils.analyze_review_categories_by_sentiment(df_sentiment, 'review_content')
+    elapsed = time.perf_counter() - start
+
+    queue.put((elapsed, peak_rss_mb(), worker_peak_rss_mb(), word_count, sentiment_counts, tables))
+
+
+def run_streaming(path, queue):
+    import utils
+
+    with open(path, 'rb') as f:
+        data = f.read()
+
+    start = time.perf_counter()
+    aggregates = utils.aggregate_review_file(data, 'reviews.csv')
+    word_count, _ = aggregates.word_counts(utils.DEFAULT_STOPWORDS)
+    sentiment_counts = aggregates.sentiment_counts()
+    tables = aggregates.category_tables()
+    elapsed = time.perf_counter() - start
+
+    queue.put((elapsed, peak_rss_mb(), worker_peak_rss_mb(), word_count, sentiment_counts, tables))
+
+
+def measure(target, data, n_workers):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'reviews.csv')
+        with open(path, 'wb') as f:
+            f.write(data)
+
+        # 실행마다 빈 토큰 캐시를 써서 모든 리뷰를 새로 토큰화 (환경변수는 자식 프로세스의 utils 임포트 시 적용)
+        os.environ['TOKEN_CACHE_PATH'] = os.path.join(tmp, 'token_cache.sqlite')
+        os.environ['TOKENIZER_WORKERS'] = str(n_workers)
+
+        context = multiprocessing.get_context('spawn')
+        queue = context.Queue()
+        process = context.Process(target=target, args=(path, queue))
+        process.start()
+        result = queue.get()
+        process.join()
+    return result
+
+
+def main():
+    n_reviews = int(sys.argv[1]) if len(sys.argv) > 1 else 200_000
+    n_workers = int(sys.argv[2]) if len(sys.argv) > 2 else max(2, (os.cpu_count() or 1) - 1)
+    data, n_unique = make_csv(n_reviews)
+    print(f"리뷰 {n_unique:,}개 (중복 제외), CSV {len(data) / 1024 ** 2:.1f}MB, 토큰화 워커 {n_workers}개 "
+          f"(원본 바이트는 두 방식 모두 메모리에 보관, 토큰 캐시는 비어 있음)")
+
+    full = measure(run_full, data, n_workers)
+    streaming = measure(run_streaming, data, n_workers)
+
+    assert full[3] == streaming[3] and list(full[3]) == list(streaming[3])
+    assert full[4].equals(streaming[4])
+    assert all(full[5][sentiment].equals(streaming[5][sentiment]) for sentiment in full[5])
+
+    for label, (elapsed, max_rss, worker_rss, *_) in [('전체 로드', full), ('스트리밍', streaming)]:
+        print(f"  {label:6s}: 최대 RSS 메인 {max_rss:8.1f}MB + 워커 {n_workers} x {worker_rss:6.1f}MB, {elapsed:6.1f}초")
+    print("  결과 동일")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,264 @@
+"""분석 화면 차트 모듈: 서버에서 matplotlib 이미지로 그리거나 브라우저에서 Vega-Lite로 그립니다.
+
+서버 이미지 모드는 pyplot 전역 상태를 쓰지 않는 Figure 객체로 그려 PNG(또는 SVG) 바이트로 저장한 뒤 바로 해제하고,
+데이터, 스타일, 폰트를 키로 분석 캐시에 보관해 같은 차트를 다시 그리지 않습니다.
+브라우저 모드는 작은 집계 표와 Vega-Lite 명세만 보내고 그리기는 브라우저가 맡아 서버 CPU를 쓰지 않습니다.
+"""
+import io
+import os
+import functools
+
+import pandas as pd
+import streamlit as st
+import matplotlib
+from matplotlib.figure import Figure
+import matplotlib.font_manager as fm
+
+from utils import analysis_cached, get_korean_font
+
+# st.pyplot 기본 저장 설정과 같은 해상도 / 여백
+CHART_DPI = 200
+
+# 감정별 색상
+EMOTION_COLORS = {'긍정': '#28a745', '중립': '#ffa500', '부정': '#dc3545'}
+
+# 기본 차트 모드 ('image': 서버에서 matplotlib 이미지, 'vega': 브라우저에서 Vega-Lite)
+CHART_MODE = os.environ.get('CHART_MODE', 'image')
+
+# 화면에서 차트별 모드를 고를 수 있는 차트 (차트 이름: 표시 이름)
+CHART_NAMES = {'keywords': '상위 20개 단어', 'sentiment': '감정 분포', 'categories': '감정별 카테고리',
+               'options': '옵션 상위 10개', 'sales_ranking': '매출 랭킹'}
+
+# 차트별 초기 모드 (예: CHART_MODES="keywords=vega,sentiment=image")
+# 화면의 차트별 설정 초기값으로 쓰이며, 화면에서 고른 모드가 항상 우선
+CHART_MODES = {name: mode for name, mode in (item.split('=', 1) for item in os.environ.get('CHART_MODES', '').split(',') if '=' in item)
+               if mode in ('image', 'vega')}
+
+
+@functools.lru_cache(maxsize=None)
+def setup_korean_font(font_path, font_family):
+    """matplotlib 기본 폰트를 한글 폰트로 설정하고 축 레이블에 쓸 폰트 속성을 반환합니다. (폰트별로 한 번만 설정)"""
+    korean_font_prop = None
+
+    try:
+        if font_path:
+            korean_font_prop = fm.FontProperties(fname=font_path)
+            print(f"한글 폰트 설정 완료: {font_path}")
+        else:
+            # 폰트 파일이 없으면 시스템 내장 폰트 이름 사용 (Windows: 맑은 고딕, macOS: AppleGothic, 리눅스: 나눔 또는 기본 폰트)
+            korean_font_prop = fm.FontProperties(family=font_family)
+            print(f"기본 폰트 사용: {font_family}")
+        matplotlib.rcParams['font.family'] = font_family
+    except Exception as e:
+        print(f"폰트 설정 오류: {e}")
+
+    matplotlib.rcParams['axes.unicode_minus'] = False
+    return korean_font_prop
+
+def set_korean_font(ax, korean_font_prop):
+    """matplotlib axes의 제목, 축 이름, 눈금 레이블에 한글 폰트를 설정합니다."""
+    if korean_font_prop:
+        ax.set_xlabel(ax.get_xlabel(), fontproperties=korean_font_prop)
+        ax.set_ylabel(ax.get_ylabel(), fontproperties=korean_font_prop)
+        ax.set_title(ax.get_title(), fontproperties=korean_font_prop)
+
+        # x축, y축 틱 레이블에 폰트 적용
+        for label in ax.get_xticklabels():
+            label.set_fontproperties(korean_font_prop)
+        for label in ax.get_yticklabels():
+            label.set_fontproperties(korean_font_prop)
+
+
+def _draw_bar(ax, labels, values, color='steelblue', title='', ylabel='', value_format='{:,}', value_offset=0.01,
+              value_fontsize=None, rotation=0, ha='center', bar_width=0.8, title_pad=None):
+    """세로 막대 그래프 (막대 위 값 표시, 위쪽 여백 15%)"""
+    positions = range(len(values))
+    ax.bar(positions, values, width=bar_width, color=color)
+
+    # 막대 위에 값 표시
+    if value_format:
+        for i, v in enumerate(values):
+            ax.text(i, v + max(values) * value_offset, value_format.format(v), ha='center', va='bottom',
+                    fontsize=value_fontsize)
+        ax.set_ylim(0, max(values) * 1.15)
+
+    ax.set_xticks(positions)
+    ax.set_xticklabels(labels, rotation=rotation, ha=ha)
+    ax.set_title(title, pad=title_pad)
+    ax.set_ylabel(ylabel)
+
+def _draw_barh(ax, labels, values, color='steelblue'):
+    """가로 막대 그래프 (아래에서 위로 값이 커지는 순서, 막대 끝에 값 표시)"""
+    bars = ax.barh(labels, values, color=color)
+
+    for bar in bars:
+        width = bar.get_width()
+        ax.text(width + width * 0.02, bar.get_y() + bar.get_height() / 2, f'{int(width):,}', va='center', fontsize=10)
+
+    # x축 범위 조정 (텍스트 위한 여유 공간)
+    if len(values) > 0:
+        ax.set_xlim(0, max(values) * 1.15)
+
+    ax.tick_params(axis='y', labelsize=10)
+    ax.tick_params(axis='x', labelsize=10)
+
+def _draw_pie(ax, labels, values, color, title=''):
+    """비율 파이 차트"""
+    ax.pie(values, labels=labels, autopct='%1.1f%%', colors=color, startangle=90)
+    ax.set_title(title, pad=20)
+    ax.axis('equal')
+
+CHART_DRAWERS = {'bar': _draw_bar, 'barh': _draw_barh, 'pie': _draw_pie}
+
+
+@analysis_cached
+def render_chart(kind, figsize, spec, font_path, font_family, image_format='png', layout_pad=1.08):
+    """차트 종류, 크기, 데이터/스타일 묶음으로 그림을 그려 이미지 바이트로 반환합니다. (같은 입력이면 캐시에서 반환)"""
+    fig = Figure(figsize=figsize)
+    try:
+        ax = fig.subplots()
+        CHART_DRAWERS[kind](ax, **dict(spec))
+        set_korean_font(ax, setup_korean_font(font_path, font_family))
+        fig.tight_layout(pad=layout_pad)
+
+        buffer = io.BytesIO()
+        fig.savefig(buffer, format=image_format, dpi=CHART_DPI, bbox_inches='tight')
+        return buffer.getvalue()
+    finally:
+        # pyplot에 등록되지 않은 Figure라도 그린 요소를 바로 정리
+        fig.clear()
+
+def _as_list(values):
+    """Series, 배열 등을 캐시 키로 쓰기 좋은 파이썬 값 리스트로 바꿉니다."""
+    return values.tolist() if hasattr(values, 'tolist') else list(values)
+
+def _chart(kind, figsize, labels, values, image_format='png', layout_pad=1.08, **style):
+    spec = tuple(sorted({'labels': _as_list(labels), 'values': _as_list(values), **style}.items()))
+    font = get_korean_font()
+    return render_chart(kind, figsize, spec, font['path'], font['family'], image_format, layout_pad)
+
+
+def bar_chart(labels, values, figsize=(8, 4), image_format='png', **style):
+    """세로 막대 그래프 이미지 (style: color, title, ylabel, value_format, rotation, ha, bar_width 등)"""
+    if 'color' in style and not isinstance(style['color'], str):
+        style['color'] = _as_list(style['color'])
+    return _chart('bar', figsize, labels, values, image_format, **style)
+
+def keyword_bar_chart(top_words, figsize=(8, 8), image_format='png'):
+    """상위 키워드 가로 막대 그래프 이미지 (언급 횟수가 많은 단어가 위쪽)"""
+    words = sorted(top_words.items(), key=lambda item: item[1])
+    return _chart('barh', figsize, [word for word, _ in words], [count for _, count in words], image_format,
+                  layout_pad=0)
+
+def pie_chart(labels, values, figsize=(6, 4), image_format='png', **style):
+    """비율 파이 차트 이미지 (style: color, title)"""
+    if 'color' in style and not isinstance(style['color'], str):
+        style['color'] = _as_list(style['color'])
+    return _chart('pie', figsize, labels, values, image_format, **style)
+
+
+def chart_mode(name, mode=None):
+    """차트를 그릴 모드를 정합니다. (화면에서 고른 모드 > CHART_MODES 차트별 지정 > 기본 모드)
+
+    mode: 'image' / 'vega' 또는 화면의 차트별 설정 {차트 이름: 모드}
+    """
+    if isinstance(mode, dict):
+        mode = mode.get(name)
+    return mode or CHART_MODES.get(name) or CHART_MODE
+
+def _d3_format(value_format):
+    """'{:,.0f}' 같은 파이썬 서식을 Vega-Lite(d3) 서식으로 바꿉니다. (두 서식 문법이 같은 범위만 사용)"""
+    return value_format[2:-1] if value_format and value_format.startswith('{:') else ''
+
+def _color_column(color, n):
+    """막대/조각별 색상 목록 (한 가지 색이면 개수만큼 반복)"""
+    return [color] * n if isinstance(color, str) else _as_list(color)
+
+def bar_chart_spec(labels, values, color='steelblue', title='', ylabel='', value_format='{:,}', rotation=0,
+                   bar_width=0.8, **_):
+    """세로 막대 그래프의 (데이터, Vega-Lite 명세). 서버 이미지와 같은 순서, 색상, 값 표시"""
+    labels, values = _as_list(labels), _as_list(values)
+    data = pd.DataFrame({'label': labels, 'value': values, 'color': _color_column(color, len(values))})
+
+    layers = [{'mark': {'type': 'bar', 'width': {'band': bar_width}},
+               'encoding': {'color': {'field': 'color', 'type': 'nominal', 'scale': None}}}]
+    if value_format:
+        layers.append({'mark': {'type': 'text', 'baseline': 'bottom', 'dy': -2},
+                       'encoding': {'text': {'field': 'value', 'type': 'quantitative', 'format': _d3_format(value_format)}}})
+
+    spec = {
+        'encoding': {
+            'x': {'field': 'label', 'type': 'nominal', 'sort': None, 'title': None, 'axis': {'labelAngle': -rotation}},
+            'y': {'field': 'value', 'type': 'quantitative', 'title': ylabel or None}
+        },
+        'layer': layers
+    }
+    if title:
+        spec['title'] = title
+    return data, spec
+
+def keyword_chart_spec(top_words):
+    """상위 키워드 가로 막대 그래프의 (데이터, Vega-Lite 명세). 언급 횟수가 많은 단어가 위쪽"""
+    data = pd.DataFrame({'word': list(top_words.keys()), 'count': list(top_words.values())})
+    spec = {
+        'encoding': {
+            'y': {'field': 'word', 'type': 'nominal', 'sort': '-x', 'title': None},
+            'x': {'field': 'count', 'type': 'quantitative', 'title': None}
+        },
+        'layer': [
+            {'mark': {'type': 'bar', 'color': 'steelblue'}},
+            {'mark': {'type': 'text', 'align': 'left', 'dx': 3},
+             'encoding': {'text': {'field': 'count', 'type': 'quantitative', 'format': ','}}}
+        ]
+    }
+    return data, spec
+
+def pie_chart_spec(labels, values, color, title=''):
+    """비율 파이 차트의 (데이터, Vega-Lite 명세). 조각마다 비율(%) 표시"""
+    labels, values = _as_list(labels), _as_list(values)
+    total = sum(values)
+    data = pd.DataFrame({'label': labels, 'value': values,
+                         'percent': [value / total if total else 0 for value in values]})
+    spec = {
+        'encoding': {
+            'theta': {'field': 'value', 'type': 'quantitative', 'stack': True},
+            'color': {'field': 'label', 'type': 'nominal', 'sort': None, 'legend': {'title': None},
+                      'scale': {'domain': labels, 'range': _color_column(color, len(labels))}},
+            'order': {'field': 'order', 'type': 'quantitative'}
+        },
+        'transform': [{'window': [{'op': 'row_number', 'as': 'order'}]}],
+        'layer': [
+            {'mark': {'type': 'arc', 'outerRadius': 100}},
+            {'mark': {'type': 'text', 'radius': 125},
+             'encoding': {'text': {'field': 'percent', 'type': 'quantitative', 'format': '.1%'}}}
+        ],
+        'view': {'stroke': None}
+    }
+    if title:
+        spec['title'] = title
+    return data, spec
+
+
+def show_bar_chart(name, labels, values, figsize=(8, 4), mode=None, **style):
+    """세로 막대 그래프를 화면에 표시합니다. (name: 차트별 모드 지정에 쓰는 이름)"""
+    if chart_mode(name, mode) == 'vega':
+        data, spec = bar_chart_spec(labels, values, **style)
+        st.vega_lite_chart(data, spec, use_container_width=True)
+    else:
+        st.image(bar_chart(labels, values, figsize, **style))
+
+def show_keyword_chart(top_words, mode=None):
+    """상위 키워드 가로 막대 그래프를 화면에 표시합니다."""
+    if chart_mode('keywords', mode) == 'vega':
+        data, spec = keyword_chart_spec(top_words)
+        st.vega_lite_chart(data, spec, use_container_width=True)
+    else:
+        st.image(keyword_bar_chart(top_words))
+
+def show_pie_chart(name, labels, values, figsize=(6, 4), mode=None, **style):
+    """비율 파이 차트를 화면에 표시합니다."""
+    if chart_mode(name, mode) == 'vega':
+        data, spec = pie_chart_spec(labels, values, **style)
+        st.vega_lite_chart(data, spec, use_container_width=True)
+    else:
+        st.image(pie_chart(labels, values, figsize, **style))
@@ -0,0 +1,83 @@
+"""read_file_header 테스트: 엑셀 헤더를 pd.read_excel(nrows=0)과 같은 컬럼 이름으로 읽는지 확인
+
+실행: python -m pytest -q tests
+"""
+import datetime
+import io
+import os
+import sys
+import zipfile
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import read_file_header  # noqa: E402
+
+
+def make_workbook(cells):
+    """{(행, 열): 값} 셀로 xlsx 바이트를 만듭니다. (행/열 번호는 1부터)"""
+    workbook = Workbook()
+    sheet = workbook.active
+    for (row, column), value in cells.items():
+        sheet.cell(row, column, value)
+    buffer = io.BytesIO()
+    workbook.save(buffer)
+    return buffer.getvalue()
+
+
+def replace_sheet_xml(data, sheet_data):
+    """첫 시트의 <sheetData>를 주어진 XML로 바꾼 xlsx 바이트를 만듭니다. (인라인 문자열 등 직접 작성한 셀)"""
+    source = zipfile.ZipFile(io.BytesIO(data))
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w') as target:
+        for item in source.infolist():
+            content = source.read(item.filename)
+            if item.filename == 'xl/worksheets/sheet1.xml':
+                xml = content.decode('utf-8')
+                start, end = xml.index('<sheetData'), xml.index('</sheetData>') + len('</sheetData>')
+                content = (xml[:start] + f'<sheetData>{sheet_data}</sheetData>' + xml[end:]).encode('utf-8')
+            target.writestr(item, content)
+    return buffer.getvalue()
+
+
+def expected_header(data):
+    return list(pd.read_excel(io.BytesIO(data), nrows=0).columns)
+
+
+CASES = {
+    'plain': {(1, 1): '상품명', (1, 2): '1년매출', (2, 1): '상품 A', (2, 2): 100},
+    'blank_first_row': {(2, 1): 'h1', (2, 2): 'h2', (3, 1): 1, (3, 2): 2},
+    'date_header': {(1, 1): 'a', (1, 2): datetime.datetime(2024, 1, 2), (2, 1): 1, (2, 2): 2},
+    'numeric_header': {(1, 1): 'a', (1, 2): 3, (1, 3): 2.5, (2, 1): 1},
+    'duplicate_header': {(1, 1): 'a', (1, 2): 'a', (1, 4): 'a.1', (1, 5): 'b', (1, 6): 'b', (2, 1): 1, (2, 7): 3},
+    'blank_middle_cells': {(1, 1): 'a', (1, 3): 'c', (1, 5): None, (2, 1): 1, (2, 5): 5},
+}
+
+
+@pytest.mark.parametrize('name', CASES)
+def test_header_matches_read_excel(name):
+    data = make_workbook(CASES[name])
+    assert read_file_header(data, 'sample.xlsx') == expected_header(data)
+
+
+def test_inline_string_header_matches_read_excel():
+    data = replace_sheet_xml(make_workbook({(1, 1): 'x'}), (
+        '<row r="1">'
+        '<c r="A1" t="inlineStr"><is><t>리뷰내용</t></is></c>'
+        '<c r="B1" t="inlineStr"><is><r><t>평</t></r><r><t>점</t></r></is></c>'
+        '<c r="C1" t="inlineStr"><is><t>리뷰내용</t></is></c>'
+        '</row>'
+        '<row r="2"><c r="A2" t="inlineStr"><is><t>좋아요</t></is></c><c r="B2"><v>5</v></c></row>'
+    ))
+    assert read_file_header(data, 'sample.xlsx') == expected_header(data) == ['리뷰내용', '평점', '리뷰내용.1']
+
+
+def test_missing_first_row_is_not_read_from_later_rows():
+    data = replace_sheet_xml(make_workbook({(1, 1): 'x'}), (
+        '<row r="3"><c r="A3" t="inlineStr"><is><t>h1</t></is></c><c r="B3" t="inlineStr"><is><t>h2</t></is></c></row>'
+    ))
+    assert read_file_header(data, 'sample.xlsx') == expected_header(data)
@@ -0,0 +1,45 @@
+"""calculate_sales_growth_pattern 테스트: 합계 행 제외, 성장 패턴 분류
+
+실행: python -m pytest -q tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import build_sales_catalog, calculate_sales_growth_pattern  # noqa: E402
+
+
+def make_sales_frame():
+    # 7일 매출 × 365/7 ÷ 1년 매출: A 1.0(안정형), B 2.0(성장형), C 0.5(감소형)
+    return pd.DataFrame({
+        '상품명': ['상품 A', '상품 B', '상품 C', '합계', '토탈 매출', '상품 D'],
+        '7일매출': [7000, 14000, 3500, 24500, 24500, np.nan],
+        '1년매출': [365000, 365000, 365000, 1095000, 1095000, 0],
+        '7일판매건수': [7, 7, 7, 21, 21, 0],
+        '1년판매건수': [365, 182.5, 730, 1277.5, 1277.5, 0],
+    })
+
+
+def test_growth_pattern_excludes_total_rows():
+    result = calculate_sales_growth_pattern(make_sales_frame(), '7일', '1년')
+
+    # 합계/토탈 행과 1년 매출이 없는 상품은 제외
+    assert result['상품명'].tolist() == ['상품 A', '상품 B', '상품 C']
+    assert result['성장패턴'].tolist() == ['안정형', '성장형', '감소형']
+    assert result['판매건수패턴'].tolist() == ['안정형', '성장형', '감소형']
+
+
+def test_growth_pattern_accepts_catalog():
+    df = make_sales_frame()
+    from_catalog = calculate_sales_growth_pattern(build_sales_catalog(df), '7일', '1년')
+
+    pd.testing.assert_frame_equal(from_catalog, calculate_sales_growth_pattern(df, '7일', '1년'))
+
+
+def test_growth_pattern_unavailable_period():
+    assert calculate_sales_growth_pattern(make_sales_frame(), '1개월', '1년').empty
@@ -0,0 +1,29 @@
+"""analyze_review_needed_products 테스트: dtype 축소된 리뷰수 컬럼에서 부족도 계산
+
+실행: python -m pytest -q tests
+"""
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils import analyze_review_needed_products, build_sales_catalog, optimize_dtypes  # noqa: E402
+
+
+def test_review_needed_with_downcast_review_counts():
+    # 리뷰수가 모두 int8 최대값(127)이라 optimize_dtypes가 int8로 축소
+    df = optimize_dtypes(pd.DataFrame({
+        '상품명': ['상품 A', '상품 B', '상품 C', '상품 D', '합계'],
+        '1년매출': [100, 200, 300, 400, 1000],
+        '리뷰수': [127, 127, 127, 127, 127],
+    }))
+    assert df['리뷰수'].dtype == np.int8
+
+    result = analyze_review_needed_products(build_sales_catalog(df), '1년')
+
+    assert result['상품명'].tolist() == ['상품 D', '상품 C']
+    np.testing.assert_allclose(result['매출대비리뷰부족도'], [400 / 128, 300 / 128])
@@ -0,0 +1,56 @@
+"""엑셀/CSV 사이드카 캐시 테스트: 최근에 읽은 사본 유지, 같은 파일 동시 저장
+
+실행: python -m pytest -q tests
+"""
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import utils  # noqa: E402
+
+
+def make_csv(n):
+    return pd.DataFrame({'상품명': [f'상품 {i}' for i in range(n)], '1년매출': range(n)}).to_csv(index=False).encode('utf-8-sig')
+
+
+def sidecar_names(directory):
+    return sorted(name for name in os.listdir(directory) if name.endswith(('.feather', '.pkl')))
+
+
+def test_recently_read_sidecar_survives_eviction(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, 'WORKBOOK_CACHE_DIR', str(tmp_path))
+    monkeypatch.setattr(utils, 'WORKBOOK_CACHE_MAX_FILES', 2)
+
+    utils.read_uploaded_workbook(make_csv(1), 'first.csv')
+    utils.read_uploaded_workbook(make_csv(2), 'second.csv')
+    first = [name for name in sidecar_names(tmp_path) if name.startswith('first')]
+
+    # 가장 먼저 저장한 사본을 다시 읽으면 가장 최근에 쓴 사본이 됨
+    for path in tmp_path.iterdir():
+        os.utime(path, (time.time() - 60, time.time() - 60))
+    utils.read_uploaded_workbook(make_csv(1), 'first.csv')
+    utils.read_uploaded_workbook(make_csv(3), 'third.csv')
+
+    names = sidecar_names(tmp_path)
+    assert first[0] in names
+    assert not any(name.startswith('second') for name in names)
+
+
+def test_concurrent_writes_of_same_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(utils, 'WORKBOOK_CACHE_DIR', str(tmp_path))
+    data = make_csv(1000)
+    expected = utils.optimize_dtypes(utils._parse_table(data, 'same.csv'))
+
+    # 사본이 없는 상태에서 여러 스레드가 같은 파일을 동시에 파싱해 저장
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(lambda _: utils.read_uploaded_workbook(data, 'same.csv'), range(8)))
+
+    assert all(result.equals(expected) for result in results)
+    assert len(sidecar_names(tmp_path)) == 1
+    assert not any(name.endswith('.tmp') for name in os.listdir(tmp_path))
@@ -1,18 +1,84 @@
 import pandas as pd
 import numpy as np
 import re
-from collections import Counter
-import matplotlib.pyplot as plt
-import seaborn as sns
-from wordcloud import WordCloud
-from konlpy.tag import Okt
+from collections import Counter, OrderedDict, deque
 import streamlit as st
-import matplotlib.font_manager as fm
 import os
 import platform
+import multiprocessing
+import threading
+import heapq
+import functools
+import inspect
+import hashlib
+import json
+import sqlite3
+import time
+import warnings
+import io
+import pickle
+import zipfile
+import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
-# 한글 자연어 처리를 위한 Okt 객체 초기화
-okt = Okt()
+# wordcloud, konlpy(JVM), matplotlib.font_manager는 처음 필요한 함수 안에서 불러옴 (홈 화면 등 시작 시간 단축)
+
+# 한글 자연어 처리를 위한 Okt 객체 (JVM 기동 비용이 크므로 처음 필요할 때 생성)
+# 워커 프로세스와 백그라운드 스레드에서도 쓰이므로 st.cache_resource 대신 모듈 전역으로 관리
+_okt = None
+_okt_lock = threading.Lock()
+_okt_warmup_lock = threading.Lock()
+_okt_warmup_started = False
+
+# 백그라운드에서 그리는 중인 워드클라우드 (같은 이미지를 중복해서 그리지 않도록)와 그리기에 실패한 워드클라우드
+_wordcloud_jobs = set()
+_wordcloud_failed = set()
+_wordcloud_jobs_lock = threading.Lock()
+
+# 화면이 그려진 뒤 백그라운드에서 JVM을 미리 띄울지 여부
+OKT_WARMUP = os.environ.get('OKT_WARMUP', '1') != '0'
+
+# 토큰화 엔진 설정 (환경변수로 조정 가능)
+TOKENIZER_WORKERS = int(os.environ.get('TOKENIZER_WORKERS', max(1, (os.cpu_count() or 1) - 1)))
+TOKENIZER_BATCH_SIZE = int(os.environ.get('TOKENIZER_BATCH_SIZE', 1000))
+# 이 개수 미만의 리뷰는 프로세스 풀을 띄우지 않고 현재 프로세스에서 처리 (JVM 기동 비용 절약)
+TOKENIZER_MIN_PARALLEL = int(os.environ.get('TOKENIZER_MIN_PARALLEL', 5000))
+
+# 디스크 토큰 캐시 설정 (경로를 빈 문자열로 지정하면 캐시 사용 안 함)
+CACHE_DIR = os.environ.get('SMARTDATA_CACHE_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache'))
+TOKEN_CACHE_PATH = os.environ.get('TOKEN_CACHE_PATH', os.path.join(CACHE_DIR, 'token_cache.sqlite'))
+TOKEN_CACHE_MAX_ENTRIES = int(os.environ.get('TOKEN_CACHE_MAX_ENTRIES', 500000))
+
+# 대용량 리뷰 스트리밍 설정 (청크 크기, 보관할 샘플 행 수)
+REVIEW_CHUNK_SIZE = int(os.environ.get('REVIEW_CHUNK_SIZE', 10000))
+REVIEW_SAMPLE_SIZE = int(os.environ.get('REVIEW_SAMPLE_SIZE', 1000))
+
+# 엑셀/CSV를 변환해 둔 컬럼 형식 사본(사이드카) 디렉토리와 최대 보관 파일 수 (경로를 빈 문자열로 지정하면 사용 안 함)
+WORKBOOK_CACHE_DIR = os.environ.get('WORKBOOK_CACHE_DIR', os.path.join(CACHE_DIR, 'workbooks'))
+WORKBOOK_CACHE_MAX_FILES = int(os.environ.get('WORKBOOK_CACHE_MAX_FILES', 50))
+
+# 찾은 한글 폰트를 기록해 두는 파일 (새 프로세스가 폰트 디렉토리를 다시 검색하지 않도록)
+FONT_CACHE_PATH = os.environ.get('FONT_CACHE_PATH', os.path.join(CACHE_DIR, 'font_cache.json'))
+
+# 여러 업로드 파일을 동시에 읽는 스레드 수 (처음 보는 엑셀 파일은 같은 수의 워커 프로세스에서 파싱)
+UPLOAD_PARSE_WORKERS = int(os.environ.get('UPLOAD_PARSE_WORKERS', 4))
+# 이 크기(KB) 미만의 엑셀 파일은 워커 프로세스로 보내지 않고 현재 프로세스에서 파싱 (워커 기동/전송 비용이 더 큼)
+UPLOAD_PROCESS_PARSE_MIN_KB = int(os.environ.get('UPLOAD_PROCESS_PARSE_MIN_KB', 1024))
+
+# 업로드 파일 파싱 결과 캐시의 최대 메모리 (MB)
+UPLOAD_CACHE_MAX_MB = int(os.environ.get('UPLOAD_CACHE_MAX_MB', 512))
+
+# 분석 결과 캐시의 최대 메모리 (MB)와 항목 유효 시간 (초, 0이면 만료 없음)
+ANALYSIS_CACHE_MAX_MB = int(os.environ.get('ANALYSIS_CACHE_MAX_MB', 1024))
+ANALYSIS_CACHE_TTL = int(os.environ.get('ANALYSIS_CACHE_TTL', 6 * 3600))
+
+# 워드클라우드에 그리는 최대 단어 수와 미리보기 배율 (미리보기는 1/배율 크기 캔버스에 배치한 뒤 확대)
+WORDCLOUD_MAX_WORDS = 100
+WORDCLOUD_PREVIEW_SCALE = int(os.environ.get('WORDCLOUD_PREVIEW_SCALE', 4))
+
+# 사이드바에 분석 캐시 관리 패널 표시 (서버 관리자용)
+SHOW_CACHE_PANEL = os.environ.get('SHOW_CACHE_PANEL', '0') == '1'
 
 # 기본 불용어 목록 (필요에 따라 추가 가능)
 DEFAULT_STOPWORDS = ['이', '가', '은', '는', '을', '를', '에', '의', '과', '와', '에서', '로', '으로', '하다', '있다', '되다', '것']
@@ -87,6 +153,7 @@ def get_font_path():
     
     # 시스템에 설치된 폰트 중 한글 폰트 찾기
     try:
+        import matplotlib.font_manager as fm
         korean_fonts = [f for f in fm.findSystemFonts() if any(name in f.lower() for name in ['gothic', 'gulim', 'batang', 'malgun', 'nanum', 'gungsuh'])]
         
         if korean_fonts:
@@ -98,8 +165,95 @@ def get_font_path():
     print("한글 폰트를 찾을 수 없습니다. 기본 폰트를 사용합니다.")
     return None
 
-# 시스템에서 사용 가능한 한글 폰트 경로 찾기
-KOREAN_FONT_PATH = get_font_path()
+def get_font_family(font_path):
+    """matplotlib에서 쓸 폰트 이름을 정합니다. (경로가 없으면 플랫폼 기본 한글 폰트 이름)"""
+    import matplotlib.font_manager as fm
+    
+    if font_path:
+        return fm.FontProperties(fname=font_path).get_name()
+    
+    system_platform = platform.system()
+    if system_platform == 'Windows':
+        return 'Malgun Gothic'
+    if system_platform == 'Darwin':
+        return 'AppleGothic'
+    
+    # 리눅스: matplotlib에 등록된 나눔 폰트, 없으면 기본 폰트
+    nanum_fonts = [f.name for f in fm.fontManager.ttflist if 'Nanum' in f.name]
+    return nanum_fonts[0] if nanum_fonts else 'DejaVu Sans'
+
+def _font_sources(font_path):
+    """폰트 기록의 유효성 확인용 폰트 파일 수정 시각 (파일이 없으면 None)"""
+    try:
+        return {font_path: os.stat(font_path).st_mtime_ns}
+    except OSError:
+        return None
+
+def resolve_korean_font(cache_path=FONT_CACHE_PATH):
+    """한글 폰트 경로와 이름을 반환합니다. (찾은 폰트는 파일에 기록해 두고 폰트 파일 수정 시각이 같으면 검색 없이 재사용)"""
+    if cache_path:
+        try:
+            with open(cache_path, encoding='utf-8') as f:
+                cached = json.load(f)
+            if (cached['path'] and cached['platform'] == platform.system()
+                    and cached['sources'] == _font_sources(cached['path'])):
+                return {'path': cached['path'], 'family': cached['family']}
+        except (OSError, ValueError, KeyError):
+            pass
+    
+    font_path = get_font_path()
+    font = {'path': font_path, 'family': get_font_family(font_path)}
+    
+    # 못 찾은 결과는 기록하지 않음 (폰트를 새로 설치하면 다음 프로세스에서 바로 찾도록)
+    if cache_path and font_path:
+        try:
+            os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+            tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'platform': platform.system(), 'sources': _font_sources(font_path), **font}, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except OSError as e:
+            print(f"폰트 기록 저장 실패: {e}")
+    
+    return font
+
+@functools.lru_cache(maxsize=1)
+def get_korean_font():
+    """시스템에서 사용 가능한 한글 폰트 (matplotlib 설정과 워드클라우드가 함께 사용, 프로세스당 한 번 확인)"""
+    return resolve_korean_font()
+
+def get_okt():
+    """프로세스 전체에서 공유하는 Okt 객체를 반환합니다. (처음 호출될 때 JVM 기동)"""
+    global _okt
+    
+    if _okt is None:
+        with _okt_lock:
+            if _okt is None:
+                from konlpy.tag import Okt
+                _okt = Okt()
+    
+    return _okt
+
+def _warm_up_okt():
+    """JVM을 띄우고 예열 문장을 한 번 분석해 둡니다."""
+    try:
+        get_okt().pos('형태소 분석기를 미리 준비합니다')
+    except Exception as e:
+        print(f"형태소 분석기 예열 중 오류: {e}")
+
+def start_okt_warmup():
+    """백그라운드 스레드에서 형태소 분석기 예열을 시작합니다. (프로세스당 한 번, 화면을 막지 않음)"""
+    global _okt_warmup_started
+    
+    if not OKT_WARMUP or _okt is not None:
+        return
+    
+    with _okt_warmup_lock:
+        if _okt_warmup_started:
+            return
+        _okt_warmup_started = True
+    
+    threading.Thread(target=_warm_up_okt, name='okt-warmup', daemon=True).start()
 
 def clean_text(text):
     """텍스트 전처리 함수"""
@@ -114,58 +268,572 @@ def clean_text(text):
     
     return text
 
-def extract_nouns(text):
-    """명사 추출 함수"""
-    clean = clean_text(text)
+# 토큰 캐시: 정제된 리뷰 텍스트의 해시 -> 형태소 분석 결과 (표층형, 품사, 앞 공백 여부)
+class TokenCache:
+    """정제된 리뷰 텍스트의 해시를 키로 형태소 분석 결과를 저장하는 SQLite 캐시 (LRU 방식 용량 제한)"""
+    
+    # SQLite 한 쿼리에 넣을 수 있는 파라미터 수 제한을 고려한 묶음 크기
+    QUERY_CHUNK = 500
+    
+    def __init__(self, path, max_entries):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS pos_tokens ('
+            'key TEXT PRIMARY KEY, surfaces TEXT NOT NULL, tags TEXT NOT NULL, spaces TEXT NOT NULL, '
+            'last_used REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_pos_tokens_last_used ON pos_tokens(last_used)')
+        self._conn.commit()
+    
+    @staticmethod
+    def make_key(clean):
+        """정제된 텍스트의 캐시 키(해시)를 생성합니다."""
+        return hashlib.sha1(clean.encode('utf-8')).hexdigest()
+    
+    @staticmethod
+    def _encode(surfaces, tags, spaces):
+        return '\t'.join(surfaces), '\t'.join(tags), ''.join('1' if space else '0' for space in spaces)
+    
+    @staticmethod
+    def _decode(surfaces, tags, spaces):
+        if not surfaces:
+            return [], [], []
+        return surfaces.split('\t'), tags.split('\t'), [flag == '1' for flag in spaces]
+    
+    def get_many(self, keys):
+        """키 목록 중 캐시에 있는 항목을 {키: (표층형, 품사, 앞 공백 여부)} 형태로 반환합니다."""
+        keys = list(keys)
+        found = {}
+        now = time.time()
+        
+        with self._lock:
+            for i in range(0, len(keys), self.QUERY_CHUNK):
+                chunk = keys[i:i + self.QUERY_CHUNK]
+                placeholders = ','.join('?' * len(chunk))
+                rows = self._conn.execute(
+                    f'SELECT key, surfaces, tags, spaces FROM pos_tokens WHERE key IN ({placeholders})', chunk
+                ).fetchall()
+                for key, surfaces, tags, spaces in rows:
+                    found[key] = self._decode(surfaces, tags, spaces)
+            
+            # 조회된 항목의 최근 사용 시각 갱신 (LRU)
+            self._conn.executemany('UPDATE pos_tokens SET last_used = ? WHERE key = ?',
+                                   [(now, key) for key in found])
+            self._conn.commit()
+            
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        
+        return found
+    
+    def put_many(self, items):
+        """{키: (표층형, 품사, 앞 공백 여부)} 항목을 저장하고 용량을 넘으면 오래된 항목부터 제거합니다."""
+        if not items:
+            return
+        
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                'INSERT OR REPLACE INTO pos_tokens (key, surfaces, tags, spaces, last_used) VALUES (?, ?, ?, ?, ?)',
+                [(key, *self._encode(*tokens), now) for key, tokens in items.items()]
+            )
+            
+            overflow = self._count() - self.max_entries
+            if overflow > 0:
+                self._conn.execute(
+                    'DELETE FROM pos_tokens WHERE key IN (SELECT key FROM pos_tokens ORDER BY last_used LIMIT ?)',
+                    (overflow,)
+                )
+                self.evictions += overflow
+            
+            self._conn.commit()
+    
+    def _count(self):
+        return self._conn.execute('SELECT COUNT(*) FROM pos_tokens').fetchone()[0]
+    
+    def stats(self):
+        """캐시 적중/미스/제거 횟수와 저장된 항목 수를 반환합니다."""
+        with self._lock:
+            entries = self._count()
+        
+        return {
+            '항목수': entries,
+            '최대항목수': self.max_entries,
+            '적중': self.hits,
+            '미스': self.misses,
+            '제거': self.evictions
+        }
+    
+    def clear(self):
+        """캐시의 모든 항목을 삭제합니다."""
+        with self._lock:
+            self._conn.execute('DELETE FROM pos_tokens')
+            self._conn.commit()
+
+@st.cache_resource(show_spinner=False)
+def get_token_cache():
+    """프로세스 전체에서 공유하는 토큰 캐시를 반환합니다. (사용할 수 없으면 None)"""
+    if not TOKEN_CACHE_PATH:
+        return None
     
-    if not clean:
-        return []
+    try:
+        return TokenCache(TOKEN_CACHE_PATH, TOKEN_CACHE_MAX_ENTRIES)
+    except (sqlite3.Error, OSError) as e:
+        print(f"토큰 캐시를 열 수 없어 캐시 없이 진행합니다: {e}")
+        return None
+
+def _tokenize_batch(cleaned_texts):
+    """정제된 리뷰 배치를 okt.pos 한 번으로 분석합니다. (워커 프로세스에서 실행)
     
-    # 명사 추출
-    nouns = okt.nouns(clean)
+    리뷰마다 (표층형 목록, 품사 목록, 앞 공백 여부 목록)을 반환합니다.
+    앞 공백 여부가 있으면 토큰만으로 정제된 리뷰 텍스트를 그대로 복원할 수 있습니다.
+    """
+    results = []
     
-    # 현재 세션의 불용어 목록 가져오기
-    stopwords = get_stopwords()
+    for clean in cleaned_texts:
+        surfaces, tags, spaces = [], [], []
+        position = 0
+        
+        for word, tag in get_okt().pos(clean):
+            found = clean.find(word, position)
+            surfaces.append(word)
+            tags.append(tag)
+            spaces.append(found > position)
+            if found >= 0:
+                position = found + len(word)
+        
+        results.append((surfaces, tags, spaces))
     
-    # 불용어 및 한 글자 단어 제거
-    nouns = [word for word in nouns if word not in stopwords and len(word) > 1]
+    return results
+
+class TokenizerPool:
+    """여러 번의 토큰화 호출이 함께 쓰는 워커 프로세스 풀
+    
+    스트리밍 모드처럼 청크마다 토큰화할 때 청크마다 새 인터프리터와 JVM을 띄우지 않도록
+    처음 필요할 때 한 번만 만들고, with 블록이 끝나면 종료합니다.
+    """
+    
+    def __init__(self, n_workers=None):
+        self.n_workers = n_workers or TOKENIZER_WORKERS
+        self._executor = None
+    
+    def executor(self):
+        """워커 풀을 반환합니다. (처음 호출될 때 생성)"""
+        if self._executor is None:
+            # JVM이 떠 있는 프로세스를 fork 하지 않도록 spawn 방식 사용
+            mp_context = multiprocessing.get_context('spawn')
+            self._executor = ProcessPoolExecutor(max_workers=self.n_workers, mp_context=mp_context)
+        return self._executor
+    
+    @property
+    def started(self):
+        return self._executor is not None
+    
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+
+def _tokenize_parallel(cleaned_texts, n_workers, batch_size, pool=None):
+    """정제된 리뷰를 배치로 나누어 워커 프로세스 풀에서 토큰화합니다. (pool이 없으면 이번 호출에서만 쓰는 풀 생성)"""
+    batches = [cleaned_texts[i:i + batch_size] for i in range(0, len(cleaned_texts), batch_size)]
+    results = []
+    
+    # 이미 떠 있는 공유 풀이 있으면 작은 청크도 풀에서 처리 (현재 프로세스에 JVM을 또 띄우지 않음)
+    # 그 외에 데이터가 작거나 워커가 1개면 현재 프로세스에서 순차 처리
+    pool_ready = pool is not None and pool.started
+    if n_workers <= 1 or not batches or (not pool_ready and (len(batches) <= 1 or len(cleaned_texts) < TOKENIZER_MIN_PARALLEL)):
+        for batch in batches:
+            results.extend(_tokenize_batch(batch))
+        return results
+    
+    owned_pool = pool is None
+    if owned_pool:
+        pool = TokenizerPool(min(n_workers, len(batches)))
     
-    return nouns
+    try:
+        # map은 배치 순서를 유지하므로 결과도 입력 순서와 동일하게 합쳐짐
+        for batch_result in pool.executor().map(_tokenize_batch, batches):
+            results.extend(batch_result)
+    except (BrokenProcessPool, OSError) as e:
+        print(f"토큰화 워커 풀 오류, 순차 처리로 전환합니다: {e}")
+        # 고장 난 풀은 닫아 두고 다음 호출에서 새로 생성
+        pool.close()
+        results = []
+        for batch in batches:
+            results.extend(_tokenize_batch(batch))
+    finally:
+        if owned_pool:
+            pool.close()
+    
+    return results
+
+def tokenize_reviews(texts, n_workers=None, batch_size=None, pool=None):
+    """리뷰별 (표층형, 품사, 앞 공백 여부) 목록을 반환합니다. 토큰 캐시에 없는 리뷰만 형태소 분석기를 거칩니다.
+    
+    pool: 여러 호출이 함께 쓰는 TokenizerPool (없으면 호출마다 필요할 때 풀 생성)
+    """
+    n_workers = n_workers or TOKENIZER_WORKERS
+    batch_size = batch_size or TOKENIZER_BATCH_SIZE
+    
+    cleaned = [clean_text(text) for text in texts]
+    keys = [TokenCache.make_key(clean) if clean else None for clean in cleaned]
+    
+    # 중복 리뷰는 한 번만 분석
+    unique = {}
+    for key, clean in zip(keys, cleaned):
+        if key is not None and key not in unique:
+            unique[key] = clean
+    
+    cache = get_token_cache()
+    tokens = cache.get_many(unique.keys()) if cache is not None else {}
+    
+    missing_keys = [key for key in unique if key not in tokens]
+    if missing_keys:
+        new_tokens = dict(zip(missing_keys, _tokenize_parallel([unique[key] for key in missing_keys], n_workers, batch_size, pool)))
+        tokens.update(new_tokens)
+        if cache is not None:
+            cache.put_many(new_tokens)
+    
+    empty = ([], [], [])
+    return [tokens[key] if key is not None else empty for key in keys]
+
+class TokenTable:
+    """데이터셋 전체의 형태소 분석 결과를 한 번에 보관하는 토큰 테이블
+    
+    tokens 컬럼: review_idx(리뷰 위치), surface(표층형), surface_id(표층형 번호), tag(품사), space(앞 공백 여부)
+    워드클라우드 명사, 감정분석 형태소, 카테고리 키워드 검색이 모두 이 테이블에서 파생됩니다.
+    """
+    
+    def __init__(self, tokens, n_reviews, vocabulary):
+        self.tokens = tokens
+        self.n_reviews = n_reviews
+        self.vocabulary = vocabulary
+    
+    def memory_usage(self):
+        """대략적인 메모리 크기(바이트). surface 컬럼은 어휘의 문자열 객체를 공유하므로 문자열은 어휘에서 한 번만 셈"""
+        return int(self.tokens.memory_usage(index=True).sum() + self.vocabulary.memory_usage(deep=True))
+    
+    def nouns(self):
+        """명사 토큰을 등장 순서대로 반환합니다."""
+        return self.tokens.loc[self.tokens['tag'] == 'Noun', 'surface']
+    
+    def _split_by_review(self, values):
+        if self.n_reviews == 0:
+            return []
+        counts = np.bincount(self.tokens['review_idx'].to_numpy(), minlength=self.n_reviews)
+        return np.split(values, np.cumsum(counts)[:-1])
+    
+    def word_ids(self, words):
+        """단어 목록을 표층형 번호 배열로 바꿉니다. (데이터셋에 없는 단어는 제외)"""
+        ids = self.vocabulary.get_indexer(pd.Index(list(words), dtype=object))
+        return ids[ids >= 0]
+    
+    def count_per_review(self, word_ids):
+        """리뷰별로 주어진 번호의 토큰이 몇 번 나오는지 셉니다."""
+        mask = np.isin(self.tokens['surface_id'].to_numpy(), word_ids)
+        return np.bincount(self.tokens['review_idx'].to_numpy()[mask], minlength=self.n_reviews)
+    
+    def review_morphs(self):
+        """리뷰별 형태소(표층형) 목록을 반환합니다."""
+        return [list(morphs) for morphs in self._split_by_review(self.tokens['surface'].to_numpy(dtype=object))]
+    
+    def review_texts(self):
+        """토큰으로 복원한 리뷰별 정제 텍스트를 반환합니다. (캐시 크기에 잡히지 않도록 보관하지 않음)"""
+        surfaces = self.tokens['surface'].to_numpy(dtype=object)
+        prefixed = np.where(self.tokens['space'].to_numpy(), ' ' + surfaces, surfaces)
+        return [''.join(parts) for parts in self._split_by_review(prefixed)]
 
-@st.cache_data(show_spinner=False)
-def generate_wordcloud_data(df, column_name='review_content'):
-    """워드클라우드 생성 데이터 준비 함수"""
+def make_token_table(texts, n_workers=None, batch_size=None, pool=None):
+    """리뷰 텍스트 목록으로부터 토큰 테이블을 만듭니다. (캐시하지 않음)"""
+    review_idx, surfaces, tags, spaces = [], [], [], []
+    
+    for i, (review_surfaces, review_tags, review_spaces) in enumerate(tokenize_reviews(texts, n_workers, batch_size, pool)):
+        review_idx.extend([i] * len(review_surfaces))
+        surfaces.extend(review_surfaces)
+        tags.extend(review_tags)
+        spaces.extend(review_spaces)
+    
+    # 표층형을 정수 번호로 변환 (감정 점수 등은 번호 배열로 벡터 계산)
+    surface_ids, vocabulary = pd.factorize(pd.Series(surfaces, dtype=object))
+    vocabulary = pd.Index(vocabulary, dtype=object)
+    
+    tokens = pd.DataFrame({
+        'review_idx': np.array(review_idx, dtype=np.int32),
+        # 토큰마다 따로 만들어진 문자열 대신 어휘의 문자열 객체를 공유
+        'surface': pd.Series(vocabulary.to_numpy()[surface_ids], dtype=object),
+        'surface_id': surface_ids.astype(np.int32),
+        'tag': pd.Categorical(tags),
+        'space': np.array(spaces, dtype=bool)
+    })
     
-    # 모든 리뷰 텍스트 결합
-    all_reviews = ' '.join(df[column_name].dropna().astype(str))
+    return TokenTable(tokens, len(texts), vocabulary)
+
+# 분석 캐시 키로 쓰는 데이터셋 지문
+def fingerprint_dataframe(data):
+    """데이터프레임(또는 Series) 내용 전체를 해시한 지문 (불러온 원본의 지문이 없을 때만 사용)"""
+    columns = list(data.columns) if isinstance(data, pd.DataFrame) else [data.name]
+    hasher = hashlib.sha1(repr(columns).encode('utf-8'))
+    hasher.update(pd.util.hash_pandas_object(data, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()[:16]
+
+class Dataset:
+    """분석 데이터와 불러올 때 한 번 계산한 내용 지문을 함께 담습니다. (캐시 함수는 프레임 대신 지문으로 키를 만듦)"""
+    
+    def __init__(self, data, fingerprint=None, column_fingerprints=None):
+        self.data = data
+        self.fingerprint = fingerprint if fingerprint is not None else fingerprint_dataframe(data)
+        self._column_fingerprints = column_fingerprints or {}
+    
+    def column(self, name):
+        """컬럼 하나를 지문이 붙은 Dataset으로 반환합니다."""
+        fingerprint = self._column_fingerprints.get(name, f"{self.fingerprint}:{name}")
+        return Dataset(self.data[name], fingerprint)
+    
+    def derive(self, data, step):
+        """이 데이터셋에 컬럼을 더해 만든 결과를 감쌉니다. (기존 컬럼의 지문은 그대로 이어받음)"""
+        column_fingerprints = {name: self.column(name).fingerprint for name in self.data.columns}
+        return Dataset(data, f"{self.fingerprint}:{step}", column_fingerprints)
+
+def as_dataset(data):
+    """데이터프레임이면 내용 지문을 계산해 Dataset으로 감쌉니다."""
+    return data if isinstance(data, Dataset) else Dataset(data)
+
+class AnalysisCache:
+    """분석 함수 결과를 (함수 이름, 인자 키)로 보관하는 메모리 제한 LRU/TTL 캐시
+    
+    전체 크기가 최대 메모리를 넘으면 오래 쓰지 않은 항목부터 제거하고, 저장 후 ttl초가 지난 항목은
+    다음 조회 때 다시 계산합니다. 결과는 복사 없이 공유하므로 읽기 전용으로 사용합니다.
+    """
+    
+    def __init__(self, max_bytes, ttl=0):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._stats = {}
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def _function_stats(self, name):
+        return self._stats.setdefault(name, {'적중': 0, '미스': 0, '제거': 0, '만료': 0})
+    
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self.total_bytes -= entry['size']
+        return entry
+    
+    def get(self, name, key):
+        """(찾았는지 여부, 값)을 반환합니다. 유효 시간이 지난 항목은 지우고 미스로 처리합니다."""
+        now = time.time()
+        with self._lock:
+            stats = self._function_stats(name)
+            entry = self._entries.get(key)
+            if entry is not None and self.ttl and now - entry['created'] > self.ttl:
+                self._remove(key)
+                stats['만료'] += 1
+                entry = None
+            if entry is None:
+                stats['미스'] += 1
+                return False, None
+            
+            self._entries.move_to_end(key)
+            entry['used'] = now
+            entry['hits'] += 1
+            stats['적중'] += 1
+            return True, entry['value']
+    
+    def put(self, name, key, value, elapsed=0.0):
+        """값을 저장하고 최대 메모리를 넘으면 오래 쓰지 않은 항목부터 제거합니다."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            print(f"분석 캐시: {name} 결과 {size / 1024 ** 2:.1f}MB가 최대 메모리를 넘어 캐시하지 않습니다.")
+            return
+        
+        now = time.time()
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {'name': name, 'value': value, 'size': size, 'elapsed': elapsed,
+                                  'created': now, 'used': now, 'hits': 0}
+            self.total_bytes += size
+            
+            while self.total_bytes > self.max_bytes:
+                evicted = self._remove(next(iter(self._entries)))
+                self._function_stats(evicted['name'])['제거'] += 1
+    
+    def stats(self):
+        """캐시 전체 통계를 반환합니다."""
+        with self._lock:
+            totals = Counter()
+            for stats in self._stats.values():
+                totals.update(stats)
+            return {
+                '항목수': len(self._entries),
+                '사용량MB': self.total_bytes / 1024 ** 2,
+                '최대MB': self.max_bytes / 1024 ** 2,
+                '적중': totals['적중'],
+                '미스': totals['미스'],
+                '제거': totals['제거'],
+                '만료': totals['만료']
+            }
+    
+    def function_stats(self):
+        """함수별 항목 수, 사용량과 적중/미스/제거/만료 횟수를 표로 반환합니다."""
+        with self._lock:
+            rows = {name: {'함수': name, '항목수': 0, '사용량MB': 0.0, **stats} for name, stats in self._stats.items()}
+            for entry in self._entries.values():
+                rows[entry['name']]['항목수'] += 1
+                rows[entry['name']]['사용량MB'] += entry['size'] / 1024 ** 2
+        return pd.DataFrame(list(rows.values()),
+                            columns=['함수', '항목수', '사용량MB', '적중', '미스', '제거', '만료'])
+    
+    def entries(self):
+        """항목별 크기, 계산 시간, 경과 시간을 최근 사용 순서로 반환합니다."""
+        now = time.time()
+        with self._lock:
+            rows = [{
+                '함수': entry['name'],
+                '키': key[:12],
+                '크기MB': entry['size'] / 1024 ** 2,
+                '계산초': entry['elapsed'],
+                '적중': entry['hits'],
+                '저장후초': now - entry['created'],
+                '미사용초': now - entry['used']
+            } for key, entry in reversed(self._entries.items())]
+        return pd.DataFrame(rows, columns=['함수', '키', '크기MB', '계산초', '적중', '저장후초', '미사용초'])
+    
+    def clear(self, name=None):
+        """모든 항목(또는 한 함수의 항목)을 지웁니다. 통계 횟수는 유지합니다."""
+        with self._lock:
+            for key in [key for key, entry in self._entries.items() if name is None or entry['name'] == name]:
+                self._remove(key)
+
+@st.cache_resource(show_spinner=False)
+def get_analysis_cache():
+    """프로세스 전체에서 공유하는 분석 결과 캐시를 반환합니다."""
+    return AnalysisCache(ANALYSIS_CACHE_MAX_MB * 1024 ** 2, ANALYSIS_CACHE_TTL)
+
+def _analysis_key_part(value):
+    """캐시 키에 쓸 인자 표현 (Dataset은 지문, 프레임은 내용 해시, 나머지는 repr)"""
+    if isinstance(value, Dataset):
+        return ('dataset', value.fingerprint)
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return ('frame', fingerprint_dataframe(value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_analysis_key_part(item) for item in value)
+    if isinstance(value, dict):
+        return tuple((key, _analysis_key_part(item)) for key, item in sorted(value.items()))
+    return repr(value)
+
+def analysis_cached(func):
+    """함수 결과를 공유 분석 캐시에 보관하는 데코레이터 (기본값을 채운 인자로 키를 만들어 호출 방식과 무관)"""
+    signature = inspect.signature(func)
+    name = func.__name__
+    
+    def make_key(args, kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        parts = tuple((arg, _analysis_key_part(value)) for arg, value in bound.arguments.items())
+        return hashlib.sha1(repr((name, parts)).encode('utf-8')).hexdigest()
+    
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        key = make_key(args, kwargs)
+        cache = get_analysis_cache()
+        found, value = cache.get(name, key)
+        if found:
+            return value
+        
+        start = time.perf_counter()
+        value = func(*args, **kwargs)
+        cache.put(name, key, value, time.perf_counter() - start)
+        return value
+    
+    # 계산 없이 캐시만 조회: (찾았는지 여부, 값)
+    wrapper.lookup = lambda *args, **kwargs: get_analysis_cache().get(name, make_key(args, kwargs))
+    wrapper.clear = lambda: get_analysis_cache().clear(name)
+    return wrapper
+
+# 토큰 테이블은 용량이 크므로 복사 없이 공유 (읽기 전용으로 사용)
+@analysis_cached
+def build_token_table(texts, n_workers=None, batch_size=None):
+    """리뷰 텍스트(Series 또는 Dataset.column)로부터 토큰 테이블을 만듭니다. (데이터셋당 한 번만 분석)"""
+    if isinstance(texts, Dataset):
+        texts = texts.data
+    return make_token_table(texts, n_workers, batch_size)
+
+@analysis_cached
+def count_review_nouns(texts, min_length=2, n_workers=None, batch_size=None):
+    """불용어를 적용하지 않은 명사 빈도수를 계산합니다. (데이터셋당 한 번만 계산되어 캐시됨)"""
     
-    # 명사 추출
-    all_nouns = extract_nouns(all_reviews)
+    # 공유 토큰 테이블에서 명사 빈도수 계산 (길이 조건만 미리 적용)
+    noun_count = Counter(build_token_table(texts, n_workers, batch_size).nouns())
     
-    # 빈도수 계산
-    word_count = Counter(all_nouns)
+    return Counter({word: count for word, count in noun_count.items() if len(word) >= min_length})
+
+def filter_word_counts(noun_count, stopwords):
+    """명사 빈도수에서 불용어를 빼냅니다. (토큰화 없이 불용어 수만큼의 작업만 수행)"""
+    word_count = noun_count.copy()
+    
+    for word in stopwords:
+        word_count.pop(word, None)
+    
+    return word_count
+
+def generate_wordcloud_data(df, column_name='review_content', stopwords=None, n_workers=None, batch_size=None):
+    """워드클라우드 생성 데이터 준비 함수 (df: DataFrame 또는 Dataset)"""
+    
+    # 불용어가 지정되지 않으면 현재 세션의 불용어 목록 사용
+    if stopwords is None:
+        stopwords = get_stopwords()
+    
+    # 캐시된 명사 빈도수에서 불용어만 제거 (불용어가 바뀌어도 다시 토큰화하지 않음)
+    texts = as_dataset(df).column(column_name)
+    word_count = filter_word_counts(count_review_nouns(texts, 2, n_workers, batch_size), stopwords)
     
     # 상위 단어 추출
     top_words = dict(word_count.most_common(20))
     
     return word_count, top_words
 
-def create_wordcloud(word_count, width=1200, height=800):
-    """워드클라우드 시각화 함수"""
+def create_wordcloud(word_count, width=1200, height=800, scale=1, font_path=None):
+    """워드클라우드 시각화 함수 (scale: 배치는 width × height 크기로 하고 이미지만 배율만큼 키움)"""
     
     # 워드클라우드 생성
     wc_params = {
         'width': width, 
         'height': height, 
+        'scale': scale,
         'background_color': 'white',
-        'max_words': 100,
+        'max_words': WORDCLOUD_MAX_WORDS,
         'prefer_horizontal': 0.9
     }
     
     # 한글 폰트 경로가 있으면 추가
-    if KOREAN_FONT_PATH:
-        wc_params['font_path'] = KOREAN_FONT_PATH
+    font_path = font_path or get_korean_font()['path']
+    if font_path:
+        wc_params['font_path'] = font_path
     
+    from wordcloud import WordCloud
     wc = WordCloud(**wc_params)
     
     # 단어 빈도수 데이터로 워드클라우드 생성
@@ -173,46 +841,99 @@ def create_wordcloud(word_count, width=1200, height=800):
     
     return wc
 
-@st.cache_data(show_spinner=False)
-def simple_sentiment_analysis(df, column_name='review_content'):
-    """간단한 감정 분석 함수"""
-    
-    # 긍정/부정 키워드 (실제로는 더 많은 단어와 더 정교한 방법 사용 필요)
-    positive_words = ['좋다', '좋은', '좋아요', '만족', '최고', '추천', '맛있다', '편리하다', '빠르다', '친절하다']
-    negative_words = ['나쁘다', '별로', '실망', '불만', '최악', '싫다', '아쉽다', '느리다', '불친절하다']
+def wordcloud_frequencies(word_count, max_words=WORDCLOUD_MAX_WORDS):
+    """배치에 실제로 쓰이는 상위 단어만 (단어, 빈도) 튜플로 반환합니다. (WordCloud와 같은 순서, 같은 빈도는 기존 순서)"""
+    return tuple(heapq.nlargest(max_words, word_count.items(), key=lambda item: item[1]))
+
+@analysis_cached
+def render_wordcloud_png(frequencies, width, height, scale, font_path):
+    """상위 단어 빈도로 워드클라우드를 그려 PNG 바이트로 반환합니다. (같은 단어, 크기, 폰트면 배치 없이 캐시에서 반환)"""
+    buffer = io.BytesIO()
+    create_wordcloud(dict(frequencies), width, height, scale, font_path).to_image().save(buffer, format='PNG')
+    return buffer.getvalue()
+
+def _wordcloud_render_args(word_count, tier, width, height):
+    # 미리보기는 배율만큼 작은 캔버스에 배치하고 같은 크기로 확대 (배치 비용이 배율의 제곱만큼 줄어듦)
+    scale = WORDCLOUD_PREVIEW_SCALE if tier == 'preview' else 1
+    return wordcloud_frequencies(word_count), width // scale, height // scale, scale, get_korean_font()['path']
+
+def wordcloud_image(word_count, tier='full', width=1200, height=800):
+    """워드클라우드 PNG 바이트를 반환합니다. (tier: 'preview' 저해상도 미리보기 / 'full' 원본 해상도)"""
+    return render_wordcloud_png(*_wordcloud_render_args(word_count, tier, width, height))
+
+def cached_wordcloud_image(word_count, tier='full', width=1200, height=800):
+    """이미 그려 둔 워드클라우드 PNG 바이트를 반환합니다. (없으면 None, 새로 그리지 않음)"""
+    found, image = render_wordcloud_png.lookup(*_wordcloud_render_args(word_count, tier, width, height))
+    return image if found else None
+
+def start_wordcloud_render(word_count, tier='full', width=1200, height=800):
+    """백그라운드 스레드에서 워드클라우드를 그려 캐시에 넣습니다.
+    
+    그리는 중이면 True를 반환합니다. (같은 이미지를 그리는 중이면 다시 시작하지 않고, 전에 실패한 이미지면 False)
+    """
+    args = _wordcloud_render_args(word_count, tier, width, height)
+    
+    with _wordcloud_jobs_lock:
+        if args in _wordcloud_failed:
+            return False
+        if args in _wordcloud_jobs:
+            return True
+        _wordcloud_jobs.add(args)
+    
+    def render():
+        try:
+            render_wordcloud_png(*args)
+        except Exception as e:
+            print(f"워드클라우드 백그라운드 생성 실패: {e}")
+            with _wordcloud_jobs_lock:
+                _wordcloud_failed.add(args)
+        finally:
+            with _wordcloud_jobs_lock:
+                _wordcloud_jobs.discard(args)
+    
+    threading.Thread(target=render, name='wordcloud-render', daemon=True).start()
+    return True
+
+def wordcloud_render_pending(word_count, tier='full', width=1200, height=800):
+    """워드클라우드를 백그라운드에서 아직 그리는 중인지 확인합니다."""
+    args = _wordcloud_render_args(word_count, tier, width, height)
+    with _wordcloud_jobs_lock:
+        return args in _wordcloud_jobs
+
+# 감정 사전 (실제로는 더 많은 단어와 더 정교한 방법 사용 필요)
+POSITIVE_WORDS = ('좋다', '좋은', '좋아요', '만족', '최고', '추천', '맛있다', '편리하다', '빠르다', '친절하다')
+NEGATIVE_WORDS = ('나쁘다', '별로', '실망', '불만', '최악', '싫다', '아쉽다', '느리다', '불친절하다')
+
+def score_sentiment(token_table, positive_words=POSITIVE_WORDS, negative_words=NEGATIVE_WORDS):
+    """토큰 테이블에서 리뷰별 감정 점수를 계산합니다. (-1: 매우 부정, 1: 매우 긍정)"""
+    positive_score = token_table.count_per_review(token_table.word_ids(positive_words))
+    negative_score = token_table.count_per_review(token_table.word_ids(negative_words))
     
-    # 감정 점수 계산 함수
-    def get_sentiment_score(text):
-        if not isinstance(text, str):
-            return 0
-        
-        clean = clean_text(text)
-        if not clean:
-            return 0
-        
-        # 형태소 분석
-        morphs = okt.morphs(clean)
-        
-        # 긍정/부정 점수 계산
-        positive_score = sum(1 for word in morphs if word in positive_words)
-        negative_score = sum(1 for word in morphs if word in negative_words)
-        
-        # 최종 점수 (-1: 매우 부정, 1: 매우 긍정)
-        return (positive_score - negative_score) / (positive_score + negative_score + 0.001)
+    return (positive_score - negative_score) / (positive_score + negative_score + 0.001)
+
+def label_sentiment(scores):
+    """감정 점수를 긍정/중립/부정으로 분류합니다."""
+    return np.select([scores > 0.3, scores < -0.3], ['긍정', '부정'], default='중립')
+
+@analysis_cached
+def simple_sentiment_analysis(df, column_name='review_content', positive_words=POSITIVE_WORDS, negative_words=NEGATIVE_WORDS):
+    """간단한 감정 분석 함수 (Dataset을 주면 결과 프레임도 지문이 붙은 Dataset으로 반환)"""
+    dataset = as_dataset(df)
     
-    # 리뷰별 감정 점수 계산
-    df['sentiment_score'] = df[column_name].apply(get_sentiment_score)
+    # 리뷰별 감정 점수 계산 (공유 토큰 테이블의 표층형 번호로 벡터 계산)
+    sentiment_score = score_sentiment(build_token_table(dataset.column(column_name)), positive_words, negative_words)
     
     # 긍정/중립/부정 분류
-    df['sentiment'] = df['sentiment_score'].apply(
-        lambda x: '긍정' if x > 0.3 else ('부정' if x < -0.3 else '중립')
-    )
+    result = dataset.data.assign(sentiment_score=sentiment_score, sentiment=label_sentiment(sentiment_score))
     
     # 감정별 카운트
-    sentiment_counts = df['sentiment'].value_counts().reset_index()
+    sentiment_counts = result['sentiment'].value_counts().reset_index()
     sentiment_counts.columns = ['감정', '리뷰 수']
     
-    return df, sentiment_counts
+    if isinstance(df, Dataset):
+        result = dataset.derive(result, f"sentiment:{column_name}:{positive_words}:{negative_words}")
+    
+    return result, sentiment_counts
 
 def analyze_options(df, option_column='option_info', count_column='count'):
     """옵션 분석 함수"""
@@ -226,96 +947,229 @@ def analyze_options(df, option_column='option_info', count_column='count'):
     
     return top_options
 
-@st.cache_data(show_spinner=False)
-def analyze_positive_review_categories(df, review_column):
-    """긍정 리뷰를 카테고리별로 분석합니다."""
-    
-    # 카테고리별 키워드 정의 (확장 가능)
-    category_keywords = {
-        '맛': ['맛있', '달콤', '고소', '진한', '부드러', '깔끔', '신선', '풍미', '향', '달달', '짭짤', '매콤', '시원', '담백', '진짜맛있', '존맛'],
-        '식감': ['쫄깃', '바삭', '촉촉', '부드러', '탱탱', '씹히', '질감', '식감', '텍스처', '크런치', '쫀득', '말랑', '단단'],
-        '배송': ['배송', '포장', '빠른', '신속', '안전', '포장상태', '배달', '택배', '도착', '빨리', '신속배송', '당일배송'],
-        '가격': ['저렴', '합리적', '가성비', '할인', '싼', '경제적', '가격', '비용', '돈', '가격대비', '세일', '특가'],
-        '서비스': ['친절', '응답', '문의', '교환', '환불', '고객서비스', '직원', '상담', '대응', '서비스', '응대'],
-        '품질': ['품질', '만족', '좋은', '훌륭', '우수', '최고', '완벽', '정성', '고급', '퀄리티'],
-        '외관': ['예쁜', '깔끔', '포장', '디자인', '색깔', '모양', '보기좋', '깨끗', '이쁜', '예뻐', '디자인이쁜'],
-        '양': ['많이', '푸짐', '양많', '충분', '넉넉', '가득', '풍성', '듬뿍']
-    }
-    
-    return _analyze_review_categories_by_sentiment(df, review_column, '긍정', category_keywords)
+# 감정별 리뷰 카테고리 키워드 사전 (확장 가능)
+POSITIVE_CATEGORY_KEYWORDS = {
+    '맛': ['맛있', '달콤', '고소', '진한', '부드러', '깔끔', '신선', '풍미', '향', '달달', '짭짤', '매콤', '시원', '담백', '진짜맛있', '존맛'],
+    '식감': ['쫄깃', '바삭', '촉촉', '부드러', '탱탱', '씹히', '질감', '식감', '텍스처', '크런치', '쫀득', '말랑', '단단'],
+    '배송': ['배송', '포장', '빠른', '신속', '안전', '포장상태', '배달', '택배', '도착', '빨리', '신속배송', '당일배송'],
+    '가격': ['저렴', '합리적', '가성비', '할인', '싼', '경제적', '가격', '비용', '돈', '가격대비', '세일', '특가'],
+    '서비스': ['친절', '응답', '문의', '교환', '환불', '고객서비스', '직원', '상담', '대응', '서비스', '응대'],
+    '품질': ['품질', '만족', '좋은', '훌륭', '우수', '최고', '완벽', '정성', '고급', '퀄리티'],
+    '외관': ['예쁜', '깔끔', '포장', '디자인', '색깔', '모양', '보기좋', '깨끗', '이쁜', '예뻐', '디자인이쁜'],
+    '양': ['많이', '푸짐', '양많', '충분', '넉넉', '가득', '풍성', '듬뿍']
+}
 
-@st.cache_data(show_spinner=False)
-def analyze_neutral_review_categories(df, review_column):
-    """중립 리뷰를 카테고리별로 분석합니다."""
-    
-    # 중립 리뷰 카테고리별 키워드 정의
-    category_keywords = {
-        '일반적': ['그냥', '보통', '평범', '무난', '일반적', '나쁘지않', '그럭저럭', '평균'],
-        '애매한 맛': ['그저그런', '평범한맛', '특별하지않', '무난한맛', '그런대로'],
-        '보통 품질': ['보통품질', '평균적', '무난한품질', '그럭저럭품질'],
-        '가격 무난': ['적당', '그럭저럭가격', '무난한가격', '평균가격'],
-        '배송 보통': ['보통배송', '평균배송', '무난한배송'],
-        '애매한 평가': ['모르겠', '애매', '그냥그래', '특별한감정없', '딱히'],
-        '기대와 다름': ['기대보다', '생각보다', '예상과달라', '기대와달라']
-    }
-    
-    return _analyze_review_categories_by_sentiment(df, review_column, '중립', category_keywords)
+NEUTRAL_CATEGORY_KEYWORDS = {
+    '일반적': ['그냥', '보통', '평범', '무난', '일반적', '나쁘지않', '그럭저럭', '평균'],
+    '애매한 맛': ['그저그런', '평범한맛', '특별하지않', '무난한맛', '그런대로'],
+    '보통 품질': ['보통품질', '평균적', '무난한품질', '그럭저럭품질'],
+    '가격 무난': ['적당', '그럭저럭가격', '무난한가격', '평균가격'],
+    '배송 보통': ['보통배송', '평균배송', '무난한배송'],
+    '애매한 평가': ['모르겠', '애매', '그냥그래', '특별한감정없', '딱히'],
+    '기대와 다름': ['기대보다', '생각보다', '예상과달라', '기대와달라']
+}
 
-@st.cache_data(show_spinner=False)
-def analyze_negative_review_categories(df, review_column):
-    """부정 리뷰를 카테고리별로 분석합니다."""
+NEGATIVE_CATEGORY_KEYWORDS = {
+    '맛 문제': ['맛없', '별로', '짜다', '달다', '시다', '쓰다', '비린내', '냄새', '맛이이상', '맛이없어'],
+    '품질 문제': ['품질나쁘', '조잡', '싸구려', '부실', '불량', '하자', '망가져', '깨져'],
+    '배송 문제': ['배송늦', '포장불량', '배송문제', '늦게도착', '파손', '포장상태나쁘', '배송오류'],
+    '가격 불만': ['비싸', '비쌈', '가격부담', '가성비나쁘', '돈아까워', '가격대비별로'],
+    '서비스 불만': ['불친절', '응답없', '문의무시', '서비스나쁘', '대응늦', '무례'],
+    '크기/양 부족': ['작다', '적어', '양적어', '크기작아', '부족', '양부족'],
+    '기대 실망': ['실망', '기대이하', '후회', '별로야', '최악', '다시안사'],
+    '기타 불만': ['불편', '문제', '고장', '작동안됨', '사용법복잡']
+}
+
+SENTIMENT_CATEGORY_KEYWORDS = {
+    '긍정': POSITIVE_CATEGORY_KEYWORDS,
+    '중립': NEUTRAL_CATEGORY_KEYWORDS,
+    '부정': NEGATIVE_CATEGORY_KEYWORDS
+}
+
+class KeywordMatcher:
+    """여러 키워드를 리뷰당 한 번의 스캔으로 찾는 Aho-Corasick 오토마톤
     
-    # 부정 리뷰 카테고리별 키워드 정의
-    category_keywords = {
-        '맛 문제': ['맛없', '별로', '짜다', '달다', '시다', '쓰다', '비린내', '냄새', '맛이이상', '맛이없어'],
-        '품질 문제': ['품질나쁘', '조잡', '싸구려', '부실', '불량', '하자', '망가져', '깨져'],
-        '배송 문제': ['배송늦', '포장불량', '배송문제', '늦게도착', '파손', '포장상태나쁘', '배송오류'],
-        '가격 불만': ['비싸', '비쌈', '가격부담', '가성비나쁘', '돈아까워', '가격대비별로'],
-        '서비스 불만': ['불친절', '응답없', '문의무시', '서비스나쁘', '대응늦', '무례'],
-        '크기/양 부족': ['작다', '적어', '양적어', '크기작아', '부족', '양부족'],
-        '기대 실망': ['실망', '기대이하', '후회', '별로야', '최악', '다시안사'],
-        '기타 불만': ['불편', '문제', '고장', '작동안됨', '사용법복잡']
-    }
+    키워드 전체로 트라이와 실패 링크를 한 번 만든 뒤 완전한 상태 전이표(DFA)로 펼쳐 두고,
+    모든 리뷰를 글자 위치 단위로 나란히(NumPy 벡터 연산) 한 번씩만 훑어 포함된 키워드를 찾습니다.
+    """
     
-    return _analyze_review_categories_by_sentiment(df, review_column, '부정', category_keywords)
-
-def _analyze_review_categories_by_sentiment(df, review_column, sentiment_type, category_keywords):
-    """특정 감정의 리뷰를 카테고리별로 분석하는 공통 함수"""
+    def __init__(self, keywords):
+        self.keywords = tuple(sorted({keyword.lower() for keyword in keywords if keyword}))
+        self.keyword_index = {keyword: i for i, keyword in enumerate(self.keywords)}
+        
+        # 키워드에 쓰인 글자만 알파벳으로 사용 (0번은 '그 외 글자')
+        alphabet = sorted({char for keyword in self.keywords for char in keyword})
+        char_ids = {char: i + 1 for i, char in enumerate(alphabet)}
+        lut_size = max([0x10000] + [ord(char) + 1 for char in alphabet]) + 1
+        self._char_ids = np.zeros(lut_size, dtype=np.int32)
+        self._char_ids[[ord(char) for char in alphabet]] = np.arange(1, len(alphabet) + 1)
+        
+        # 트라이 구성: 상태마다 다음 글자 -> 다음 상태, 그 상태에서 끝나는 키워드 번호
+        goto = [{}]
+        output = [set()]
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                if char not in goto[state]:
+                    goto.append({})
+                    output.append(set())
+                    goto[state][char] = len(goto) - 1
+                state = goto[state][char]
+            output[state].add(keyword_id)
+        
+        # 너비 우선으로 실패 링크를 따라가며 전이표를 채우고, 실패 링크의 출력까지 합쳐 둠
+        delta = np.zeros((len(goto), len(alphabet) + 1), dtype=np.int32)
+        fail = [0] * len(goto)
+        queue = deque()
+        for char, next_state in goto[0].items():
+            delta[0, char_ids[char]] = next_state
+            queue.append(next_state)
+        while queue:
+            state = queue.popleft()
+            delta[state] = delta[fail[state]]
+            for char, next_state in goto[state].items():
+                fail[next_state] = delta[fail[state], char_ids[char]]
+                output[next_state] |= output[fail[next_state]]
+                delta[state, char_ids[char]] = next_state
+                queue.append(next_state)
+        self._delta = delta
+        
+        # 상태별 출력 키워드를 CSR 형태로 보관
+        self._output_ptr = np.zeros(len(goto) + 1, dtype=np.int64)
+        self._output_ptr[1:] = np.cumsum([len(ids) for ids in output])
+        self._output_ids = np.array([i for ids in output for i in sorted(ids)], dtype=np.int64)
+        self._has_output = np.diff(self._output_ptr) > 0
+    
+    def scan_pairs(self, texts):
+        """(리뷰 번호, 키워드 번호) 적중 쌍을 중복 없이 반환합니다."""
+        texts = [text if isinstance(text, str) else '' for text in texts]
+        if not texts or not self.keywords:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        
+        # 전체 리뷰를 이어 붙여 소문자화 (글자 수가 바뀌는 드문 경우만 리뷰별로 처리)
+        joined = ''.join(texts)
+        lowered = joined.lower()
+        if len(lowered) != len(joined):
+            texts = [text.lower() for text in texts]
+            lowered = ''.join(texts)
+        lengths = np.fromiter(map(len, texts), dtype=np.int64, count=len(texts))
+        
+        # 글자 -> 알파벳 번호로 한 번에 변환
+        codepoints = np.frombuffer(lowered.encode('utf-32-le'), dtype=np.uint32)
+        chars = self._char_ids[np.minimum(codepoints, len(self._char_ids) - 1)]
+        offsets = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+        
+        # 긴 리뷰부터 정렬해 두면 j번째 글자가 있는 리뷰는 항상 앞쪽 k개
+        order = np.argsort(-lengths, kind='stable')
+        starts = offsets[order]
+        active_counts = np.searchsorted(-lengths[order], -np.arange(lengths.max()), side='left')
+        
+        state = np.zeros(len(texts), dtype=np.int32)
+        hit_texts, hit_states = [], []
+        for position, k in enumerate(active_counts):
+            current = state[:k] = self._delta[state[:k], chars[starts[:k] + position]]
+            hit = np.flatnonzero(self._has_output[current])
+            if hit.size:
+                hit_texts.append(order[hit])
+                hit_states.append(current[hit])
+        
+        if not hit_texts:
+            return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+        
+        # 상태 -> 출력 키워드로 펼친 뒤 (리뷰, 키워드) 쌍 중복 제거
+        hit_texts = np.concatenate(hit_texts)
+        hit_states = np.concatenate(hit_states)
+        counts = self._output_ptr[hit_states + 1] - self._output_ptr[hit_states]
+        first = np.repeat(self._output_ptr[hit_states] - np.cumsum(counts) + counts, counts)
+        keyword_ids = self._output_ids[first + np.arange(counts.sum())]
+        
+        pairs = np.unique(np.repeat(hit_texts, counts) * len(self.keywords) + keyword_ids)
+        return pairs // len(self.keywords), pairs % len(self.keywords)
     
-    # 해당 감정 리뷰만 필터링
-    sentiment_reviews = df[df['sentiment'] == sentiment_type].copy()
+    def scan(self, texts):
+        """리뷰별 키워드 적중 집합 목록을 반환합니다."""
+        texts = list(texts)
+        hit_sets = [set() for _ in texts]
+        
+        for text_id, keyword_id in zip(*self.scan_pairs(texts)):
+            hit_sets[text_id].add(self.keywords[keyword_id])
+        
+        return [frozenset(hits) for hits in hit_sets]
     
-    if len(sentiment_reviews) == 0:
+    def find(self, text):
+        """텍스트에 포함된 키워드 집합을 반환합니다."""
+        return self.scan([text])[0]
+
+@st.cache_resource(show_spinner=False)
+def get_category_matcher():
+    """모든 감정 카테고리 사전의 키워드로 만든 매처를 반환합니다. (프로세스당 한 번 생성)"""
+    keywords = [keyword
+                for category_keywords in SENTIMENT_CATEGORY_KEYWORDS.values()
+                for keywords in category_keywords.values()
+                for keyword in keywords]
+    return KeywordMatcher(keywords)
+
+def _get_matcher_for(*category_keyword_dicts):
+    """카테고리 사전을 모두 포함하는 매처를 반환합니다. (기본 사전이 아니면 새로 생성)"""
+    matcher = get_category_matcher()
+    keywords = [keyword
+                for category_keywords in category_keyword_dicts
+                for keywords in category_keywords.values()
+                for keyword in keywords]
+    
+    if all(keyword.lower() in matcher.keyword_index for keyword in keywords):
+        return matcher
+    return KeywordMatcher(keywords)
+
+def count_category_hits(matcher, text_ids, keyword_ids, category_keywords, weights=None):
+    """적중 쌍으로 카테고리별 리뷰 수와 키워드별 리뷰 수를 셉니다. (weights: 리뷰별 중복 횟수)"""
+    if weights is None:
+        weights = np.ones(int(text_ids.max()) + 1 if len(text_ids) else 0, dtype=np.int64)
+    weights = np.asarray(weights)
+    
+    pair_weights = weights[text_ids]
+    keyword_totals = np.bincount(keyword_ids, weights=pair_weights, minlength=len(matcher.keywords))
+    keyword_counts = Counter({keyword: int(total)
+                              for keyword, total in zip(matcher.keywords, keyword_totals) if total > 0})
+    
+    # 카테고리마다 해당 키워드가 하나라도 걸린 리뷰 수
+    category_counts = Counter()
+    for category, keywords in category_keywords.items():
+        category_mask = np.zeros(len(matcher.keywords), dtype=bool)
+        category_mask[[matcher.keyword_index[keyword.lower()] for keyword in keywords if keyword]] = True
+        category_hit = np.zeros(len(weights), dtype=bool)
+        category_hit[text_ids[category_mask[keyword_ids]]] = True
+        review_count = int(weights[category_hit].sum())
+        if review_count > 0:
+            category_counts[category] = review_count
+    
+    return category_counts, keyword_counts
+
+def build_category_table(total_reviews, category_counts, keyword_counts, category_keywords):
+    """카테고리별 리뷰 수, 비율, 주요 키워드 표를 만듭니다."""
+    if total_reviews == 0:
         return pd.DataFrame(columns=['카테고리', '리뷰 수', '비율(%)', '주요 키워드'])
     
-    # 각 카테고리별 분석
     category_results = []
-    total_sentiment = len(sentiment_reviews)
     
     for category, keywords in category_keywords.items():
-        # 해당 카테고리 키워드가 포함된 리뷰 필터링
-        pattern = '|'.join(keywords)
-        category_mask = sentiment_reviews[review_column].str.contains(pattern, na=False, case=False)
-        category_reviews = sentiment_reviews[category_mask]
-        
-        if len(category_reviews) > 0:
-            # 실제 언급된 키워드와 빈도 계산
-            mentioned_keywords = []
-            for keyword in keywords:
-                keyword_count = sentiment_reviews[review_column].str.contains(keyword, na=False, case=False).sum()
-                if keyword_count > 0:
-                    mentioned_keywords.append((keyword, keyword_count))
+        review_count = category_counts.get(category, 0)
+        
+        if review_count > 0:
+            # 실제 언급된 키워드와 빈도
+            mentioned_keywords = [(keyword, keyword_counts[keyword.lower()])
+                                  for keyword in keywords if keyword_counts[keyword.lower()] > 0]
             
             # 빈도순으로 정렬하고 상위 10개 선택
             mentioned_keywords.sort(key=lambda x: x[1], reverse=True)
             top_keywords = [f"{kw[0]}({kw[1]})" for kw in mentioned_keywords[:10]]
             
             # 비율 계산
-            percentage = round((len(category_reviews) / total_sentiment) * 100, 1)
+            percentage = round((review_count / total_reviews) * 100, 1)
             
             category_results.append({
                 '카테고리': category,
-                '리뷰 수': len(category_reviews),
+                '리뷰 수': review_count,
                 '비율(%)': percentage,
                 '주요 키워드': ', '.join(top_keywords)
             })
@@ -325,7 +1179,693 @@ def _analyze_review_categories_by_sentiment(df, review_column, sentiment_type, c
     if len(result_df) > 0:
         result_df = result_df.sort_values('리뷰 수', ascending=False).reset_index(drop=True)
     
-    return result_df 
+    return result_df
+
+def _factorize_texts(texts):
+    """텍스트를 고유값 번호로 바꿔 (번호 배열, 고유 텍스트 목록)을 반환합니다. (결측은 -1)"""
+    codes, unique_texts = pd.factorize(texts if isinstance(texts, pd.Series) else pd.Series(list(texts), dtype=object))
+    return codes, np.asarray(unique_texts, dtype=object).tolist()
+
+def analyze_categories_in_texts(texts, category_keywords):
+    """리뷰 텍스트 목록을 한 번씩만 스캔해 카테고리별로 분석합니다."""
+    # 같은 텍스트는 한 번만 스캔하고 횟수로 가중
+    codes, unique_texts = _factorize_texts(texts)
+    weights = np.bincount(codes[codes >= 0], minlength=len(unique_texts))
+    
+    matcher = _get_matcher_for(category_keywords)
+    text_ids, keyword_ids = matcher.scan_pairs(unique_texts)
+    category_counts, keyword_counts = count_category_hits(matcher, text_ids, keyword_ids, category_keywords, weights)
+    
+    return build_category_table(len(codes), category_counts, keyword_counts, category_keywords)
+
+def count_categories_by_group(texts, groups, category_keywords_by_group):
+    """리뷰를 한 번만 스캔한 뒤 그룹(감정)별 (리뷰 수, 카테고리별 리뷰 수, 키워드별 리뷰 수)를 셉니다."""
+    codes, unique_texts = _factorize_texts(texts)
+    groups = np.asarray(groups, dtype=object)
+    
+    matcher = _get_matcher_for(*category_keywords_by_group.values())
+    text_ids, keyword_ids = matcher.scan_pairs(unique_texts)
+    
+    results = {}
+    for group, category_keywords in category_keywords_by_group.items():
+        group_mask = groups == group
+        group_codes = codes[group_mask]
+        weights = np.bincount(group_codes[group_codes >= 0], minlength=len(unique_texts))
+        category_counts, keyword_counts = count_category_hits(matcher, text_ids, keyword_ids, category_keywords, weights)
+        results[group] = (int(group_mask.sum()), category_counts, keyword_counts)
+    
+    return results
+
+def analyze_categories_by_group(texts, groups, category_keywords_by_group):
+    """리뷰를 한 번만 스캔한 뒤 그룹(감정)별 카테고리 표를 만듭니다."""
+    counts = count_categories_by_group(texts, groups, category_keywords_by_group)
+    
+    return {group: build_category_table(*counts[group], category_keywords)
+            for group, category_keywords in category_keywords_by_group.items()}
+
+@analysis_cached
+def analyze_review_categories_by_sentiment(df, review_column):
+    """긍정/중립/부정 리뷰의 카테고리 표를 한 번의 스캔으로 모두 계산합니다. (df: 감정 분석 결과 DataFrame 또는 Dataset)"""
+    dataset = as_dataset(df)
+    
+    # 공유 토큰 테이블에서 복원한 정제 텍스트 기준으로 검색 (원문 재분석 없음)
+    review_texts = pd.Series(build_token_table(dataset.column(review_column)).review_texts(), index=dataset.data.index)
+    
+    return analyze_categories_by_group(review_texts, dataset.data['sentiment'], SENTIMENT_CATEGORY_KEYWORDS)
+
+def analyze_positive_review_categories(df, review_column):
+    """긍정 리뷰를 카테고리별로 분석합니다."""
+    return analyze_review_categories_by_sentiment(df, review_column)['긍정']
+
+def analyze_neutral_review_categories(df, review_column):
+    """중립 리뷰를 카테고리별로 분석합니다."""
+    return analyze_review_categories_by_sentiment(df, review_column)['중립']
+
+def analyze_negative_review_categories(df, review_column):
+    """부정 리뷰를 카테고리별로 분석합니다."""
+    return analyze_review_categories_by_sentiment(df, review_column)['부정']
+
+
+# 대용량 리뷰 파일 스트리밍 분석
+def find_review_column(columns):
+    """리뷰 내용을 담는 컬럼 이름을 찾습니다. (없으면 None)"""
+    potential_review_columns = ['REVIEW_CONTENT', 'review_content', '리뷰내용', '내용', 'CONTENT']
+    
+    for col in potential_review_columns:
+        if col in columns:
+            return col
+    
+    return None
+
+def _excel_header(row):
+    """엑셀 첫 행을 pd.read_excel과 같은 규칙의 컬럼 이름으로 바꿉니다. (빈 칸은 Unnamed, 중복은 .1, .2)"""
+    # 끝쪽의 빈 칸은 pd.read_excel처럼 버림
+    row = list(row)
+    while row and (row[-1] is None or row[-1] == ''):
+        row.pop()
+    
+    header = [f'Unnamed: {i}' if value is None or value == '' else value for i, value in enumerate(row)]
+    unnamed = [i for i, value in enumerate(row) if value is None or value == '']
+    
+    # pandas 파서와 같은 순서와 규칙으로 중복 이름 변경 (이름 있는 컬럼 먼저, 이미 있는 이름은 건너뜀)
+    counts = Counter()
+    for i in [i for i in range(len(header)) if i not in unnamed] + unnamed:
+        name = original = header[i]
+        count = counts[name]
+        while count > 0:
+            counts[original] = count + 1
+            name = f'{original}.{count}'
+            count = count + 1 if name in header else counts[name]
+        header[i] = name
+        counts[name] = count + 1
+    return header
+
+def find_option_columns(columns):
+    """옵션 정보 컬럼과 수량 컬럼 이름을 찾습니다. (없으면 None)"""
+    potential_option_columns = ['OPTION_INFO', 'option_info', '옵션정보', '옵션명', '상품옵션']
+    potential_count_columns = ['COUNT', 'count', '수량', '판매량', '판매수량']
+    
+    option_col = next((col for col in potential_option_columns if col in columns), None)
+    count_col = next((col for col in potential_count_columns if col in columns), None)
+    
+    return option_col, count_col
+
+# 판매현황 분석 함수들이 사용하는 컬럼 (전체 로드 시 이 컬럼만 읽음)
+SALES_ANALYSIS_COLUMNS = ['상품명', '기본판매가격', '리뷰수', '리뷰점수', '판매건수', '주문건수']
+SALES_ANALYSIS_SUFFIXES = ('매출', '판매건수', '주문건수')
+
+def select_analysis_columns(file_type, columns):
+    """파일 유형별로 분석에 쓰는 컬럼(usecols)과 dtype을 고릅니다. (정할 수 없으면 전체 컬럼)"""
+    usecols, dtype = None, None
+    
+    if file_type == "review":
+        review_col = find_review_column(columns)
+        if review_col:
+            usecols, dtype = [review_col], {review_col: str}
+    elif file_type == "option":
+        option_col, count_col = find_option_columns(columns)
+        if option_col and count_col:
+            usecols, dtype = [option_col, count_col], {option_col: str}
+    elif file_type == "sales":
+        if '상품명' in columns:
+            usecols = [col for col in columns
+                       if col in SALES_ANALYSIS_COLUMNS or (isinstance(col, str) and col.endswith(SALES_ANALYSIS_SUFFIXES))]
+            dtype = {'상품명': str}
+    
+    return usecols, dtype
+
+def _xlsx_column_index(cell_ref):
+    """'C1' 같은 셀 주소에서 0부터 시작하는 열 번호를 구합니다."""
+    index = 0
+    for char in cell_ref:
+        if not char.isalpha():
+            break
+        index = index * 26 + (ord(char.upper()) - ord('A') + 1)
+    return index - 1
+
+def _xml_name(element):
+    return element.tag.rsplit('}', 1)[-1]
+
+def _xml_text(element):
+    """<si>/<is> 요소의 문자열을 읽습니다. (서식 있는 문자열의 run 포함, 발음 표기 rPh 제외)"""
+    parts = []
+    for child in element:
+        name = _xml_name(child)
+        if name == 't':
+            parts.append(child.text or '')
+        elif name == 'r':
+            parts.extend(node.text or '' for node in child if _xml_name(node) == 't')
+    return ''.join(parts)
+
+def _read_xlsx_header(source):
+    """xlsx 첫 시트의 첫 행만 XML에서 직접 읽습니다. (시트 크기와 관계없이 일정한 시간)
+    
+    숫자/날짜 셀이 있으면 None을 반환합니다. 날짜 여부는 셀 서식을 봐야 알 수 있으므로 openpyxl로 읽어야 합니다.
+    """
+    with zipfile.ZipFile(source) as archive:
+        # 첫 번째 시트 경로 (workbook.xml의 첫 sheet -> 관계 파일의 대상)
+        workbook = ET.fromstring(archive.read('xl/workbook.xml'))
+        sheet = next(node for node in workbook.iter() if _xml_name(node) == 'sheet')
+        rel_id = next(value for key, value in sheet.attrib.items() if key.endswith('}id'))
+        rels = ET.fromstring(archive.read('xl/_rels/workbook.xml.rels'))
+        target = next(node.get('Target') for node in rels if node.get('Id') == rel_id)
+        sheet_path = target.lstrip('/') if target.startswith('/') else 'xl/' + target
+        
+        # 첫 <row>가 끝나면 바로 중단 (1행이 비어 있으면 <row r="1">이 없으므로 다른 행은 헤더로 쓰지 않음)
+        cells = {}
+        with archive.open(sheet_path) as f:
+            for _, element in ET.iterparse(f, events=('end',)):
+                name = _xml_name(element)
+                if name == 'c':
+                    children = {_xml_name(node): node for node in element}
+                    if element.get('t') == 'inlineStr':
+                        value = _xml_text(children['is']) if 'is' in children else None
+                    else:
+                        value = children['v'].text if 'v' in children else None
+                    cells[_xlsx_column_index(element.get('r', 'A'))] = (element.get('t'), value)
+                elif name == 'row':
+                    if element.get('r', '1') != '1':
+                        cells = {}
+                    break
+        
+        if any(cell_type in (None, 'n', 'd') and value is not None for cell_type, value in cells.values()):
+            return None
+        
+        # 공유 문자열은 필요한 번호까지만 읽음
+        shared_ids = {int(value) for cell_type, value in cells.values() if cell_type == 's' and value is not None}
+        shared = {}
+        if shared_ids:
+            with archive.open('xl/sharedStrings.xml') as f:
+                index = 0
+                for _, element in ET.iterparse(f, events=('end',)):
+                    if _xml_name(element) == 'si':
+                        if index in shared_ids:
+                            shared[index] = _xml_text(element)
+                        index += 1
+                        element.clear()
+                        if index > max(shared_ids):
+                            break
+    
+    header = [None] * (max(cells) + 1 if cells else 0)
+    for column, (cell_type, value) in cells.items():
+        if value is None:
+            continue
+        if cell_type == 's':
+            header[column] = shared.get(int(value))
+        elif cell_type in ('inlineStr', 'str', 'e'):
+            header[column] = value
+        elif cell_type == 'b':
+            header[column] = value == '1'
+    
+    return header
+
+def read_file_header(data, filename):
+    """파일 전체를 읽지 않고 컬럼 이름만 읽습니다. (data: 바이트 또는 파일 경로)"""
+    source = io.BytesIO(data) if isinstance(data, bytes) else data
+    
+    if filename.endswith('.csv'):
+        return list(pd.read_csv(source, encoding='utf-8-sig', nrows=0).columns)
+    
+    try:
+        header = _read_xlsx_header(source)
+        if header is not None:
+            return _excel_header(header)
+    except (KeyError, StopIteration, ValueError, ET.ParseError, zipfile.BadZipFile) as e:
+        print(f"헤더 직접 읽기 실패, openpyxl로 읽습니다 ({filename}): {e}")
+    
+    from openpyxl import load_workbook
+    if isinstance(source, io.BytesIO):
+        source.seek(0)
+    workbook = load_workbook(source, read_only=True, data_only=True)
+    try:
+        header = next(workbook.worksheets[0].iter_rows(max_row=1, values_only=True), ())
+        return _excel_header(header)
+    finally:
+        workbook.close()
+
+def iter_file_chunks(data, filename, chunk_size=None):
+    """CSV/XLSX 파일을 chunk_size 행씩 DataFrame으로 나눠 읽습니다."""
+    chunk_size = chunk_size or REVIEW_CHUNK_SIZE
+    
+    if filename.endswith('.csv'):
+        with pd.read_csv(io.BytesIO(data), encoding='utf-8-sig', chunksize=chunk_size) as reader:
+            yield from reader
+        return
+    
+    # 엑셀은 읽기 전용 모드로 행을 하나씩 읽음 (시트의 행은 메모리에 올리지 않지만,
+    # openpyxl이 공유 문자열 표(sharedStrings.xml)는 통째로 읽으므로 리뷰 원문 크기만큼의 메모리는 여전히 필요)
+    from openpyxl import load_workbook
+    workbook = load_workbook(io.BytesIO(data), read_only=True, data_only=True)
+    try:
+        rows = workbook.worksheets[0].iter_rows(values_only=True)
+        columns = _excel_header(next(rows, ()))
+        
+        chunk = []
+        for row in rows:
+            if all(value is None for value in row):
+                continue
+            chunk.append(row[:len(columns)])
+            if len(chunk) >= chunk_size:
+                yield pd.DataFrame(chunk, columns=columns)
+                chunk = []
+        if chunk:
+            yield pd.DataFrame(chunk, columns=columns)
+    finally:
+        workbook.close()
+
+class ReviewAggregates:
+    """스트리밍 모드에서 리뷰 원문 대신 보관하는 집계 결과
+    
+    청크마다 명사 빈도, 감정별 리뷰 수, 감정별 카테고리/키워드 적중 수를 더해 두고,
+    원문은 저수지 표본 추출(reservoir sampling)로 고른 일부 행만 남깁니다.
+    """
+    
+    def __init__(self, sample_size=None, seed=0):
+        self.n_reviews = 0
+        self.noun_count = Counter()
+        self.sentiment_counter = Counter()
+        self.category_counts = {sentiment: [0, Counter(), Counter()] for sentiment in SENTIMENT_CATEGORY_KEYWORDS}
+        self.sample_size = REVIEW_SAMPLE_SIZE if sample_size is None else sample_size
+        self._sample_rows = []
+        self._sample_columns = None
+        self._rng = np.random.default_rng(seed)
+    
+    def update(self, chunk, review_column='review_content', min_length=2, pool=None):
+        """리뷰 청크 하나를 토큰화해 집계에 더합니다. (pool: 청크끼리 함께 쓰는 TokenizerPool)"""
+        texts = chunk[review_column]
+        token_table = make_token_table(texts, pool=pool)
+        
+        # 명사 빈도 (워드클라우드와 같은 길이 조건)
+        self.noun_count.update(word for word in token_table.nouns() if len(word) >= min_length)
+        
+        # 감정 분류 및 감정별 카테고리 적중 수
+        sentiments = label_sentiment(score_sentiment(token_table))
+        self.sentiment_counter.update(sentiments.tolist())
+        
+        group_counts = count_categories_by_group(token_table.review_texts(), sentiments, SENTIMENT_CATEGORY_KEYWORDS)
+        for sentiment, (total, category_counts, keyword_counts) in group_counts.items():
+            aggregate = self.category_counts[sentiment]
+            aggregate[0] += total
+            aggregate[1].update(category_counts)
+            aggregate[2].update(keyword_counts)
+        
+        self._update_sample(chunk)
+        self.n_reviews += len(chunk)
+    
+    def _update_sample(self, chunk):
+        """저수지 표본 추출로 최대 sample_size개의 행만 남깁니다."""
+        if self.sample_size <= 0 or len(chunk) == 0:
+            return
+        if self._sample_columns is None:
+            self._sample_columns = list(chunk.columns)
+        
+        rows = chunk.reindex(columns=self._sample_columns).itertuples(index=False, name=None)
+        positions = self.n_reviews + np.arange(len(chunk))
+        slots = self._rng.integers(0, positions + 1)
+        
+        for position, slot, row in zip(positions, slots, rows):
+            if position < self.sample_size:
+                self._sample_rows.append(row)
+            elif slot < self.sample_size:
+                self._sample_rows[slot] = row
+    
+    def sample(self):
+        """보관 중인 표본 행을 DataFrame으로 반환합니다."""
+        return pd.DataFrame(self._sample_rows, columns=self._sample_columns)
+    
+    def word_counts(self, stopwords=None):
+        """불용어를 뺀 명사 빈도와 상위 20개 단어를 반환합니다. (generate_wordcloud_data와 같은 형식)"""
+        if stopwords is None:
+            stopwords = get_stopwords()
+        word_count = filter_word_counts(self.noun_count, stopwords)
+        return word_count, dict(word_count.most_common(20))
+    
+    def sentiment_counts(self):
+        """감정별 리뷰 수를 반환합니다. (simple_sentiment_analysis와 같은 형식)"""
+        return pd.DataFrame(self.sentiment_counter.most_common(), columns=['감정', '리뷰 수'])
+    
+    def category_tables(self):
+        """감정별 카테고리 표를 반환합니다. (analyze_review_categories_by_sentiment와 같은 형식)"""
+        return {sentiment: build_category_table(*self.category_counts[sentiment], category_keywords)
+                for sentiment, category_keywords in SENTIMENT_CATEGORY_KEYWORDS.items()}
+
+def aggregate_review_file(data, filename, chunk_size=None, sample_size=None, n_workers=None):
+    """리뷰 파일을 청크 단위로 읽으며 집계만 남깁니다.
+    
+    CSV는 원문 전체를 메모리에 올리지 않습니다. XLSX는 행 단위로 읽지만 openpyxl이 공유 문자열 표를
+    통째로 읽으므로, 리뷰 원문 문자열만큼의 메모리는 파일 크기에 비례해 필요합니다.
+    토큰화 워커 풀은 파일당 한 번만 띄워 모든 청크가 함께 씁니다.
+    """
+    aggregates = ReviewAggregates(sample_size)
+    review_column = None
+    
+    with TokenizerPool(n_workers) as pool:
+        for chunk in iter_file_chunks(data, filename, chunk_size):
+            if review_column is None:
+                review_column = find_review_column(chunk.columns)
+                if review_column is None:
+                    raise ValueError(f"리뷰 내용 컬럼을 찾을 수 없습니다: {list(chunk.columns)}")
+            aggregates.update(chunk, review_column, pool=pool)
+    
+    return aggregates
+
+
+# 엑셀/CSV 사이드카 캐시 (한 번 파싱한 파일은 Feather 사본에서 읽음)
+def _parse_table(data, filename, usecols=None, dtype=None):
+    """CSV/XLSX 바이트를 DataFrame으로 읽습니다. (usecols: 읽을 컬럼, dtype: 컬럼별 타입)"""
+    if filename.endswith('.csv'):
+        return pd.read_csv(io.BytesIO(data), encoding='utf-8-sig', usecols=usecols, dtype=dtype)
+    return pd.read_excel(io.BytesIO(data), usecols=usecols, dtype=dtype)
+
+def _parse_compact(data, filename, usecols=None, dtype=None):
+    """파일을 파싱해 메모리를 적게 쓰는 dtype으로 바꿉니다. (파싱 워커 프로세스에서도 실행)"""
+    return optimize_dtypes(_parse_table(data, filename, usecols, dtype))
+
+def _parse(data, filename, usecols=None, dtype=None, parse_pool=None):
+    """파일을 파싱합니다. 큰 엑셀 파일은 parse_pool이 있으면 워커 프로세스에서 파싱
+    
+    openpyxl은 순수 파이썬이라 파싱하는 동안 GIL을 잡고 있으므로, 스레드만으로는 여러 엑셀 파일을 동시에 읽을 수 없습니다.
+    CSV는 pandas C 파서가 대부분 GIL 없이 읽으므로 현재 스레드에서 읽습니다.
+    """
+    if parse_pool is not None and not filename.endswith('.csv') and len(data) >= UPLOAD_PROCESS_PARSE_MIN_KB * 1024:
+        try:
+            return parse_pool.submit(_parse_compact, data, filename, usecols, dtype).result()
+        except (BrokenProcessPool, OSError) as e:
+            print(f"파싱 워커 풀 오류, 현재 프로세스에서 읽습니다 ({filename}): {e}")
+            # 고장 난 풀은 버리고 다음 업로드에서 새로 생성
+            get_parse_pool.clear()
+    return _parse_compact(data, filename, usecols, dtype)
+
+def _sidecar_path(key, filename, suffix):
+    stem = re.sub(r'[^\w.-]', '_', os.path.splitext(os.path.basename(filename))[0])[:40]
+    return os.path.join(WORKBOOK_CACHE_DIR, f"{stem}-{key}{suffix}")
+
+def _touch_sidecar(path):
+    """사본의 수정 시각을 지금으로 바꿉니다. (정리할 때 최근에 쓴 사본이 남도록 LRU 순서 유지)"""
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def _read_sidecar(key, filename):
+    """사이드카 사본이 있으면 읽어 반환합니다. (Feather는 메모리 맵으로 읽음, 없으면 None)"""
+    feather_path = _sidecar_path(key, filename, '.feather')
+    pickle_path = _sidecar_path(key, filename, '.pkl')
+    
+    try:
+        if os.path.exists(feather_path):
+            import pyarrow.feather as feather
+            df = feather.read_table(feather_path, memory_map=True).to_pandas()
+            _touch_sidecar(feather_path)
+            return df
+        if os.path.exists(pickle_path):
+            df = pd.read_pickle(pickle_path)
+            _touch_sidecar(pickle_path)
+            return df
+    except Exception as e:
+        print(f"사이드카 캐시 읽기 실패 ({filename}): {e}")
+    
+    return None
+
+def _write_sidecar(key, filename, df):
+    """DataFrame을 Feather(실패하면 pickle) 사본으로 저장하고 오래 쓰지 않은 사본을 정리합니다."""
+    os.makedirs(WORKBOOK_CACHE_DIR, exist_ok=True)
+    feather_path = _sidecar_path(key, filename, '.feather')
+    pickle_path = _sidecar_path(key, filename, '.pkl')
+    # 같은 파일을 여러 세션/프로세스가 동시에 저장해도 임시 파일이 겹치지 않도록 쓰는 쪽마다 다른 이름 사용
+    writer = f"{os.getpid()}.{threading.get_ident()}"
+    
+    try:
+        # Feather는 문자열이 아닌 컬럼 이름을 문자열로 바꿔 저장하므로 이 경우는 pickle 사용
+        if not all(isinstance(column, str) for column in df.columns):
+            raise TypeError("컬럼 이름이 모두 문자열이 아닙니다")
+        
+        # 메모리 맵으로 읽을 수 있도록 압축하지 않음
+        import pyarrow.feather as feather
+        tmp_path = f"{feather_path}.{writer}.tmp"
+        try:
+            feather.write_feather(df, tmp_path, compression='uncompressed')
+            os.replace(tmp_path, feather_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    except Exception as e:
+        # 컬럼 이름이 문자열이 아니거나 혼합 타입 컬럼 등 Arrow로 변환할 수 없는 경우
+        print(f"Feather 저장 실패, pickle로 저장합니다 ({filename}): {e}")
+        tmp_path = f"{pickle_path}.{writer}.tmp"
+        try:
+            df.to_pickle(tmp_path)
+            os.replace(tmp_path, pickle_path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+    
+    # 최근에 쓰거나 읽은 사본만 남김 (읽을 때도 수정 시각을 갱신하므로 LRU 순서)
+    # (다른 세션이 먼저 정리한 사본은 건너뜀)
+    sidecars = []
+    for entry in os.scandir(WORKBOOK_CACHE_DIR):
+        if entry.name.endswith(('.feather', '.pkl')):
+            try:
+                sidecars.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                pass
+    for _, path in sorted(sidecars, reverse=True)[WORKBOOK_CACHE_MAX_FILES:]:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+def _load_with_sidecar(key, filename, read_data, usecols=None, dtype=None, parse_pool=None):
+    """사이드카 사본이 있으면 읽고, 없으면 원본을 파싱해 사본을 만듭니다."""
+    if not WORKBOOK_CACHE_DIR:
+        return _parse(read_data(), filename, usecols, dtype, parse_pool)
+    
+    # 읽는 컬럼과 타입이 다르면 다른 사본 (사본은 dtype 변환을 마친 상태로 저장)
+    key = hashlib.sha1(f"{key}:{usecols!r}:{dtype!r}:compact".encode('utf-8')).hexdigest()[:16]
+    
+    df = _read_sidecar(key, filename)
+    if df is not None:
+        return df
+    
+    df = _parse(read_data(), filename, usecols, dtype, parse_pool)
+    
+    try:
+        _write_sidecar(key, filename, df)
+    except OSError as e:
+        print(f"사이드카 캐시 저장 실패 ({filename}): {e}")
+    
+    return df
+
+def file_fingerprint(path):
+    """로컬 파일의 지문 (경로, 수정 시각, 크기 기준)"""
+    stat = os.stat(path)
+    return hashlib.sha1(f"{os.path.abspath(path)}:{stat.st_mtime_ns}:{stat.st_size}".encode('utf-8')).hexdigest()[:16]
+
+def read_workbook(path, usecols=None, dtype=None):
+    """로컬 엑셀/CSV 파일을 읽습니다. (수정 시각과 크기가 같으면 사이드카 사본 사용)"""
+    key = file_fingerprint(path)
+    
+    def read_data():
+        with open(path, 'rb') as f:
+            return f.read()
+    
+    return _load_with_sidecar(key, path, read_data, usecols, dtype)
+
+def read_uploaded_workbook(data, filename, usecols=None, dtype=None, parse_pool=None):
+    """업로드된 엑셀/CSV 바이트를 읽습니다. (내용이 같으면 사이드카 사본 사용, parse_pool: 엑셀 파싱용 프로세스 풀)"""
+    key = hashlib.sha1(data).hexdigest()[:16]
+    return _load_with_sidecar(key, filename, lambda: data, usecols, dtype, parse_pool)
+
+@st.cache_resource(show_spinner=False)
+def get_parse_pool():
+    """여러 엑셀 업로드를 동시에 파싱하는 프로세스 풀 (워커는 처음 파싱할 때 생겨 이후 재실행에서도 재사용)"""
+    # JVM이 떠 있을 수 있는 서버 프로세스를 fork 하지 않도록 spawn 방식 사용
+    return ProcessPoolExecutor(max_workers=UPLOAD_PARSE_WORKERS, mp_context=multiprocessing.get_context('spawn'))
+
+
+# 불러온 데이터의 메모리 절약형 dtype 변환
+def _downcast_float(series):
+    """실수 컬럼을 값과 합계가 그대로 보존될 때만 float32로 바꿉니다."""
+    values = series.to_numpy()
+    compact = values.astype(np.float32)
+    if not np.array_equal(compact.astype(np.float64), values, equal_nan=True):
+        return series
+    # 정수 값이고 절댓값 합이 2**24 이하여야 float32로 더해도 합계·평균이 정확함 (매출 합계 등)
+    finite = values[np.isfinite(values)]
+    if np.any(finite != np.round(finite)) or np.abs(finite).sum() > 2 ** 24:
+        return series
+    return pd.Series(compact, index=series.index, name=series.name)
+
+def optimize_dtypes(df):
+    """숫자 컬럼 축소, 반복되는 문자열 컬럼의 범주형 변환, 날짜 컬럼 변환으로 메모리를 줄입니다.
+    
+    변환 전 메모리 크기(바이트)는 결과의 attrs['memory_before']에 남깁니다. (사이드카 사본에도 함께 저장됨)
+    """
+    memory_before = int(df.memory_usage(deep=True).sum())
+    df = df.copy()
+    
+    # 리뷰 내용, 상품명처럼 값이 대부분 다른 자유 텍스트는 그대로 둠
+    text_columns = {find_review_column(df.columns), 'review_content', '상품명'}
+    
+    for col in df.columns:
+        series = df[col]
+        
+        if pd.api.types.is_bool_dtype(series):
+            continue
+        elif pd.api.types.is_integer_dtype(series):
+            df[col] = pd.to_numeric(series, downcast='integer')
+        elif pd.api.types.is_float_dtype(series):
+            # 합계가 작은 정수 값 실수 컬럼(결측 때문에 float가 된 판매건수 등)만 float32로
+            df[col] = _downcast_float(series)
+        elif (pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)) and col not in text_columns:
+            non_null = series.dropna()
+            if len(non_null) == 0:
+                continue
+            
+            # 날짜 컬럼: 모든 값이 날짜로 읽히는 경우만 변환
+            if isinstance(col, str) and ('날짜' in col or 'date' in col.lower()):
+                parsed = pd.to_datetime(series, errors='coerce')
+                if parsed.notna().sum() == len(non_null):
+                    df[col] = parsed
+                    continue
+            
+            # 반복되는 값이 많은 문자열 컬럼은 범주형으로
+            if non_null.nunique() <= len(non_null) * 0.5:
+                df[col] = series.astype('category')
+    
+    df.attrs['memory_before'] = memory_before
+    return df
+
+
+# 업로드 파일 캐시 (같은 내용의 파일은 다시 파싱하지 않음)
+def estimate_size(value):
+    """캐시 항목의 대략적인 메모리 크기(바이트)를 계산합니다."""
+    if isinstance(value, Dataset):
+        return estimate_size(value.data)
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, (TokenTable, SalesCatalog)):
+        return value.memory_usage()
+    if isinstance(value, (tuple, list)):
+        return sum(estimate_size(item) for item in value)
+    if isinstance(value, dict) and not isinstance(value, Counter):
+        return sum(estimate_size(item) for item in value.values())
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+
+class UploadCache:
+    """업로드 파일 내용 해시 -> 파싱 결과를 보관하는 메모리 제한 LRU 캐시
+    
+    위젯 조작마다 스크립트가 다시 실행되어도 같은 파일은 해시 조회만으로 결과를 돌려줍니다.
+    같은 업로드(file_id)의 해시는 기억해 두어 재실행마다 파일 전체를 해시하지 않습니다.
+    """
+    
+    MAX_DIGESTS = 1000
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._digests = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def __len__(self):
+        return len(self._entries)
+    
+    def content_key(self, uploaded_file):
+        """업로드 파일 내용의 SHA-1 해시를 반환합니다."""
+        file_id = getattr(uploaded_file, 'file_id', None)
+        
+        with self._lock:
+            digest = self._digests.get(file_id) if file_id else None
+        if digest is not None:
+            return digest
+        
+        digest = hashlib.sha1(uploaded_file.getvalue()).hexdigest()
+        if file_id:
+            with self._lock:
+                self._digests[file_id] = digest
+                while len(self._digests) > self.MAX_DIGESTS:
+                    self._digests.popitem(last=False)
+        return digest
+    
+    def get(self, key):
+        """캐시된 값을 반환합니다. (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+    
+    def put(self, key, value):
+        """값을 저장하고 최대 메모리를 넘으면 오래 쓰지 않은 항목부터 제거합니다."""
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            print(f"업로드 캐시: 항목 크기 {size / 1024 ** 2:.1f}MB가 최대 메모리를 넘어 캐시하지 않습니다.")
+            return
+        
+        with self._lock:
+            if key in self._entries:
+                self.total_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            
+            while self.total_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+                self.evictions += 1
+    
+    def stats(self):
+        """캐시 통계를 반환합니다."""
+        with self._lock:
+            return {
+                '파일수': len(self._entries),
+                '사용량MB': self.total_bytes / 1024 ** 2,
+                '최대MB': self.max_bytes / 1024 ** 2,
+                '적중': self.hits,
+                '미스': self.misses,
+                '제거': self.evictions
+            }
+    
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._digests.clear()
+            self.total_bytes = 0
+
+@st.cache_resource(show_spinner=False)
+def get_upload_cache():
+    """프로세스 전체에서 공유하는 업로드 파일 캐시를 반환합니다."""
+    return UploadCache(UPLOAD_CACHE_MAX_MB * 1024 ** 2)
 
 
 # 스토어 전체 판매현황 분석 함수들
@@ -360,43 +1900,247 @@ def get_sales_periods(df):
     return available_periods
 
 
+# "토탈", "TOTAL", "합계" 등 합계 행 판별용 정규식
+TOTAL_ROW_PATTERN = re.compile('토탈|TOTAL|합계|전체|총계', re.IGNORECASE)
+
+# 기간별 분석 큐브에 미리 계산해 두는 순위 수
+SALES_CUBE_TOP_N = 50
+
+
+class SalesCatalog:
+    """판매현황 분석 함수들이 공통으로 쓰는 상품 필터와 숫자 배열을 한 번만 계산해 둡니다."""
+    
+    def __init__(self, df):
+        self.df = df
+        self.columns = df.columns
+        self.names = df['상품명'].array
+        
+        # 숫자 컬럼은 복사 없이 NumPy 배열로 보관
+        self.arrays = {col: df[col].to_numpy() for col in df.columns if pd.api.types.is_numeric_dtype(df[col])}
+        
+        # 합계 행을 제외한 실제 상품 (정규식 한 번으로 판별)
+        self.product_mask = ~df['상품명'].str.contains(TOTAL_ROW_PATTERN, na=False).to_numpy(dtype=bool)
+        
+        # 기간별 유효 상품: 합계 행 제외 & 해당 기간 매출 > 0
+        self.period_masks = {period: self.product_mask & (self.column(f'{period}매출') > 0)
+                             for period in get_sales_periods(df)}
+        self._cube = None
+    
+    def memory_usage(self):
+        """원본 프레임과 카탈로그가 따로 만든 배열을 합친 크기(바이트)
+        
+        샘플 데이터는 업로드 캐시에 들어가지 않고, 업로드 캐시에서 밀려난 프레임도 이 카탈로그가 붙잡고 있으므로
+        프레임은 항상 이 항목의 크기에 포함합니다. (업로드 캐시와 겹쳐 세더라도 분석 캐시 한도가 실제 메모리를 넘지 않도록)
+        """
+        arrays = [self.product_mask, *self.period_masks.values()]
+        # 프레임 버퍼를 그대로 쓰는 컬럼 배열은 프레임 크기에 이미 포함되므로 따로 복사된 배열만 셈
+        arrays += [array for array in self.arrays.values() if array.flags.owndata]
+        if self._cube is not None:
+            arrays += [value for value in vars(self._cube).values() if isinstance(value, np.ndarray)]
+        return int(self.df.memory_usage(index=True, deep=True).sum()) + sum(array.nbytes for array in arrays)
+    
+    def has(self, *columns):
+        """컬럼이 모두 있는지 확인합니다."""
+        return all(col in self.columns for col in columns)
+    
+    def column(self, col):
+        """컬럼 값을 NumPy 배열로 반환합니다."""
+        if col not in self.arrays:
+            self.arrays[col] = self.df[col].to_numpy()
+        return self.arrays[col]
+    
+    def notna(self, col):
+        """값이 있는 행 마스크"""
+        return pd.notna(self.column(col))
+    
+    def period_mask(self, period):
+        """합계 행을 제외하고 해당 기간 매출이 0보다 큰 행 마스크"""
+        if period not in self.period_masks:
+            self.period_masks[period] = self.product_mask & (self.column(f'{period}매출') > 0)
+        return self.period_masks[period]
+    
+    @property
+    def cube(self):
+        """모든 기간의 분석 큐브 (처음 쓸 때 한 번 계산)"""
+        if self._cube is None:
+            self._cube = SalesCube(self, get_sales_periods(self.df))
+        return self._cube
+    
+    def cube_for(self, period, top_n=SALES_CUBE_TOP_N):
+        """기간이 들어 있는 분석 큐브를 반환합니다. (미리 계산하지 않은 기간이나 순위 수는 따로 계산)"""
+        if period in self.cube.index and top_n <= self.cube.top_n:
+            return self.cube
+        return SalesCube(self, [period], max(top_n, SALES_CUBE_TOP_N))
+    
+    def select(self, *masks):
+        """합계 행을 제외하고 주어진 조건을 모두 만족하는 행 위치를 반환합니다."""
+        mask = self.product_mask
+        for condition in masks:
+            mask = mask & condition
+        return np.flatnonzero(mask)
+
+
+def _top_order(values, mask, k):
+    """행(기간)마다 유효한 값 중 큰 순서로 상위 k개 상품 위치 (같은 값은 원래 순서 유지 = nlargest와 동일)"""
+    n_periods, n_items = values.shape
+    k = min(k, n_items)
+    top = np.zeros((n_periods, k), dtype=np.intp)
+    if k == 0:
+        return top
+    
+    # k번째로 큰 값 이상인 후보만 정렬 (경계에서 같은 값은 모두 후보에 포함)
+    keys = np.where(mask, values, -np.inf).astype(np.float64)
+    kth = -np.partition(-keys, k - 1, axis=1)[:, k - 1]
+    rows, cols = np.nonzero(keys >= kth[:, None])
+    order = np.lexsort((cols, -keys[rows, cols], rows))
+    rows, cols = rows[order], cols[order]
+    
+    # 행마다 앞에서부터 k개
+    rank = np.arange(len(rows)) - np.searchsorted(rows, np.arange(n_periods))[rows]
+    keep = rank < k
+    top[rows[keep], rank[keep]] = cols[keep]
+    return top
+
+def _masked_percentile(values, mask, q):
+    """행마다 유효한 값의 백분위수 (Series.quantile과 같은 방식, 유효한 값이 없으면 NaN)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanpercentile(np.where(mask, values, np.nan), q, axis=1)
+
+def _masked_median(values, mask):
+    """행마다 유효한 값의 중간값 (유효한 값이 없으면 NaN)"""
+    with warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        return np.nanmedian(np.where(mask, values, np.nan), axis=1)
+
+
+class SalesCube:
+    """모든 매출 기간의 정렬 순서, 분위수, 중간값, 후보 상품을 (기간 × 상품) 2차원 배열 연산으로 한 번에 계산해 둡니다."""
+    
+    def __init__(self, catalog, periods, top_n=SALES_CUBE_TOP_N):
+        self.periods = list(periods)
+        self.index = {period: j for j, period in enumerate(self.periods)}
+        self.top_n = top_n
+        
+        # (기간 수 × 상품 수) 매출 행렬과 기간별 유효 상품 (합계 행 제외 & 매출 > 0)
+        # 데이터가 float32여도 합계·평균은 float64로 계산
+        sales = np.vstack([catalog.column(f'{period}매출') for period in self.periods]).astype(np.float64)
+        products = catalog.product_mask[None, :]
+        self.valid = products & (sales > 0)
+        self.counts = self.valid.sum(axis=1)
+        
+        # 매출 순위(상위 top_n개)와 요약 통계
+        self.sales_order = _top_order(sales, self.valid, top_n)
+        self.sales_total = np.where(self.valid, sales, 0).sum(axis=1)
+        self.sales_mean = self.sales_total / np.maximum(self.counts, 1)
+        self.sales_median = _masked_median(sales, self.valid)
+        self.sales_max = np.where(self.valid, sales, -np.inf).max(axis=1)
+        self.sales_min = np.where(self.valid, sales, np.inf).min(axis=1)
+        self.sales_top10_cut = _masked_percentile(sales, self.valid, np.array([0.9]) * 100.0)[0]
+        
+        price = catalog.column('기본판매가격')[None, :] if catalog.has('기본판매가격') else None
+        scores = catalog.column('리뷰점수')[None, :] if catalog.has('리뷰점수') else None
+        review_counts = catalog.column('리뷰수')[None, :] if catalog.has('리뷰수') else None
+        
+        if price is not None:
+            # 가격 대비 매출효율성 순위
+            priced = self.valid & (price > 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.efficiency_order = _top_order(sales / price, priced, top_n)
+            self.efficiency_counts = priced.sum(axis=1)
+            
+            # 가격대 사분위수 (매출 값이 있고 가격 > 0인 상품 기준)
+            self.segment_valid = products & pd.notna(sales) & (price > 0)
+            self.segment_quartiles = _masked_percentile(price, self.segment_valid, np.array([0.25, 0.50, 0.75]) * 100.0)
+        
+        if review_counts is not None:
+            # 리뷰 1건당 매출 순위
+            reviewed = self.valid & (review_counts > 0)
+            with np.errstate(divide='ignore', invalid='ignore'):
+                self.review_efficiency_order = _top_order(np.round(sales / review_counts, 0), reviewed, top_n)
+            self.review_efficiency_counts = reviewed.sum(axis=1)
+            
+            # 리뷰 확보 필요: 매출 중간값 이상 & 리뷰수 중간값 이하
+            counted = self.valid & pd.notna(review_counts)
+            self.review_needed = (counted
+                                  & (sales >= _masked_median(sales, counted)[:, None])
+                                  & (review_counts <= _masked_median(review_counts, counted)[:, None]))
+        
+        if scores is not None:
+            scored = self.valid & pd.notna(scores)
+            
+            # 숨겨진 보석: 리뷰 점수 4.5 이상 & 매출 중간값 이하
+            self.hidden_gems = scored & (scores >= 4.5) & (sales <= _masked_median(sales, scored)[:, None])
+            
+            # 잠재력 미달: 리뷰 점수 4.0 이상 & 매출 상위 75% 기준 미만
+            sales_75th = _masked_percentile(sales, scored, np.array([0.75]) * 100.0)[0]
+            self.underperforming = scored & (scores >= 4.0) & (sales < sales_75th[:, None])
+            
+            if price is not None:
+                # 가성비: 가격 중간값 이하 & 리뷰 점수 4.0 이상
+                value_base = scored & (price > 0)
+                self.value_candidates = (value_base & (scores >= 4.0)
+                                         & (price <= _masked_median(price, value_base)[:, None]))
+    
+    def top_rows(self, order, counts, period, n):
+        """기간의 정렬 순서에서 상위 n개 상품 위치"""
+        j = self.index[period]
+        return order[j, :min(n, counts[j])]
+    
+    def rows(self, mask, period):
+        """기간의 후보 마스크에 해당하는 상품 위치"""
+        return np.flatnonzero(mask[self.index[period]])
+
+
+@analysis_cached
+def build_sales_catalog(df):
+    """판매현황 데이터(DataFrame 또는 Dataset)로 SalesCatalog와 전체 기간 분석 큐브를 만듭니다. (같은 데이터면 재사용)"""
+    catalog = SalesCatalog(df.data if isinstance(df, Dataset) else df)
+    
+    # 기간을 바꿀 때는 조회만 하도록 큐브를 미리 계산
+    catalog.cube
+    return catalog
+
+def _as_catalog(data):
+    """데이터프레임이 주어지면 SalesCatalog로 바꿉니다."""
+    return data if isinstance(data, SalesCatalog) else SalesCatalog(data)
+
+def _sorted_positions(values, n, ascending=False):
+    """DataFrame.sort_values(...).head(n)과 같은 순서로 위치를 반환합니다."""
+    return pd.Series(values).sort_values(ascending=ascending).index.to_numpy()[:n]
+
+
 def analyze_top_products_by_period(df, period='1년', top_n=10):
     """선택된 기간의 상위 N개 상품 분석"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     
-    if sales_col not in df.columns:
+    if not catalog.has(sales_col):
         return pd.DataFrame()
     
-    # 매출이 0보다 큰 상품들만 필터링하고, "토탈" 항목 제외
-    filtered_df = df[df[sales_col] > 0].copy()
+    # 매출이 0보다 큰 상품 중 상위 N개 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period, top_n)
+    top_rows = cube.top_rows(cube.sales_order, cube.counts, period, top_n)
     
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
-    
-    if filtered_df.empty:
+    if len(top_rows) == 0:
         return pd.DataFrame()
     
-    # 상위 N개 상품 추출
-    top_products = filtered_df.nlargest(top_n, sales_col)
-    
     # 결과 DataFrame 생성
     result_data = {
-        '순위': range(1, len(top_products) + 1),
-        '상품명': top_products['상품명'].values,
-        f'{period} 매출': top_products[sales_col].values
+        '순위': range(1, len(top_rows) + 1),
+        '상품명': catalog.names[top_rows],
+        f'{period} 매출': catalog.column(sales_col)[top_rows]
     }
     
     # 기본판매가격 컬럼이 있으면 추가
-    if '기본판매가격' in top_products.columns:
-        result_data['기본판매가격'] = top_products['기본판매가격'].values
+    if catalog.has('기본판매가격'):
+        result_data['기본판매가격'] = catalog.column('기본판매가격')[top_rows]
     
     # 판매건수 컬럼이 있으면 추가 (여러 가능한 컬럼명 확인)
     sales_count_cols = ['판매건수', f'{period}판매건수', '주문건수', f'{period}주문건수']
     for col in sales_count_cols:
-        if col in top_products.columns:
-            result_data['판매건수'] = top_products[col].values
+        if catalog.has(col):
+            result_data['판매건수'] = catalog.column(col)[top_rows]
             break
     
     # 컬럼 순서 조정: 순위, 상품명, 기본판매가격, 판매건수, 매출
@@ -414,36 +2158,28 @@ def analyze_top_products_by_period(df, period='1년', top_n=10):
 
 def analyze_sales_efficiency(df, period='1년'):
     """가격 대비 매출 효율성 분석"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     price_col = '기본판매가격'
     
-    if sales_col not in df.columns or price_col not in df.columns:
+    if not catalog.has(sales_col, price_col):
         return pd.DataFrame()
     
-    # 가격과 매출 정보가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=[price_col, sales_col]).copy()
-    filtered_df = filtered_df[(filtered_df[price_col] > 0) & (filtered_df[sales_col] > 0)]
+    # 가격과 매출이 0보다 큰 상품 중 매출효율성(매출/가격) 상위 10개 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period)
+    top_rows = cube.top_rows(cube.efficiency_order, cube.efficiency_counts, period, 10)
     
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
-    
-    if filtered_df.empty:
+    if len(top_rows) == 0:
         return pd.DataFrame()
     
-    # 매출효율성 계산 (매출/가격)
-    filtered_df['매출효율성'] = filtered_df[sales_col] / filtered_df[price_col]
-    
-    # 상위 10개 매출효율성 상품
-    top_efficiency = filtered_df.nlargest(10, '매출효율성')
+    efficiency = catalog.column(sales_col)[top_rows] / catalog.column(price_col)[top_rows]
     
     result = pd.DataFrame({
-        '순위': range(1, len(top_efficiency) + 1),
-        '상품명': top_efficiency['상품명'].values,
-        '기본판매가격': top_efficiency[price_col].values,
-        f'{period} 매출': top_efficiency[sales_col].values,
-        '매출효율성': top_efficiency['매출효율성'].values
+        '순위': range(1, len(top_rows) + 1),
+        '상품명': catalog.names[top_rows],
+        '기본판매가격': catalog.column(price_col)[top_rows],
+        f'{period} 매출': catalog.column(sales_col)[top_rows],
+        '매출효율성': efficiency
     })
     
     return result
@@ -451,34 +2187,28 @@ def analyze_sales_efficiency(df, period='1년'):
 
 def analyze_price_segments(df, period='1년'):
     """가격대별 매출 분석 - 동적 가격대 설정"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     price_col = '기본판매가격'
     
-    if sales_col not in df.columns or price_col not in df.columns:
+    if not catalog.has(sales_col, price_col):
         return pd.DataFrame()
     
-    # 가격과 매출 정보가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=[price_col, sales_col]).copy()
-    
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
+    # 가격과 매출 정보가 있고 가격이 0보다 큰 상품들만 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period)
+    rows = cube.rows(cube.segment_valid, period)
     
-    if filtered_df.empty:
+    if len(rows) < 4:  # 사분위수 계산을 위해 최소 4개 상품 필요
         return pd.DataFrame()
     
-    # 가격이 0보다 큰 상품들만 필터링
-    filtered_df = filtered_df[filtered_df[price_col] > 0]
-    
-    if len(filtered_df) < 4:  # 사분위수 계산을 위해 최소 4개 상품 필요
-        return pd.DataFrame()
+    filtered_df = pd.DataFrame({
+        '상품명': catalog.names[rows],
+        price_col: catalog.column(price_col)[rows],
+        sales_col: catalog.column(sales_col)[rows]
+    })
     
-    # 동적 가격대 설정 (사분위수 기반)
-    price_data = filtered_df[price_col]
-    q1 = price_data.quantile(0.25)
-    q2 = price_data.quantile(0.50)  # 중간값
-    q3 = price_data.quantile(0.75)
+    # 동적 가격대 설정 (사분위수 기반, 큐브에 미리 계산된 값)
+    q1, q2, q3 = cube.segment_quartiles[:, cube.index[period]]  # q2 = 중간값
     
     # 가격대 구간 및 라벨 설정
     price_bins = [0, q1, q2, q3, float('inf')]
@@ -506,26 +2236,28 @@ def analyze_price_segments(df, period='1년'):
 
 def analyze_review_sales_correlation(df, period='1년'):
     """리뷰 점수와 매출의 상관관계 분석"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     review_score_col = '리뷰점수'
     review_count_col = '리뷰수'
     
-    required_cols = [sales_col, review_score_col]
-    if not all(col in df.columns for col in required_cols):
+    if not catalog.has(sales_col, review_score_col):
         return None, pd.DataFrame()
     
-    # 필요한 데이터가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=required_cols).copy()
-    filtered_df = filtered_df[filtered_df[sales_col] > 0]
-    
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
+    # 리뷰 점수가 있고 매출이 0보다 큰 상품들만 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    rows = catalog.select(catalog.period_mask(period), catalog.notna(review_score_col))
     
-    if filtered_df.empty:
+    if len(rows) == 0:
         return None, pd.DataFrame()
     
+    filtered_df = pd.DataFrame({
+        '상품명': catalog.names[rows],
+        review_score_col: catalog.column(review_score_col)[rows],
+        sales_col: catalog.column(sales_col)[rows]
+    })
+    if catalog.has(review_count_col):
+        filtered_df[review_count_col] = catalog.column(review_count_col)[rows]
+    
     # 상관계수 계산
     correlation = filtered_df[review_score_col].corr(filtered_df[sales_col])
     
@@ -552,70 +2284,82 @@ def analyze_review_sales_correlation(df, period='1년'):
     return correlation, review_analysis
 
 
-def calculate_sales_growth_pattern(df):
-    """기간별 매출 성장 패턴 분석"""
-    periods = ['7일', '1개월', '3개월', '6개월', '1년', '2년']
-    available_periods = [p for p in periods if f'{p}매출' in df.columns]
+# 매출 기간별 일수 (성장률 환산용)
+SALES_PERIOD_DAYS = {'7일': 7, '1개월': 30, '3개월': 90, '6개월': 180, '1년': 365, '2년': 730}
+
+def _growth_labels(ratio):
+    """환산 성장률을 안정형(0.8~1.2) / 성장형(1.2 초과) / 감소형으로 분류합니다. (결측값은 감소형)"""
+    return np.select([(ratio >= 0.8) & (ratio <= 1.2), ratio > 1.2], ['안정형', '성장형'], default='감소형')
+
+def calculate_sales_growth_pattern(df, short_period='7일', long_period='1년'):
+    """기간별 매출 성장 패턴 분석 - 단기 매출(판매건수)을 장기 기간 기준으로 환산해 비교"""
+    catalog = _as_catalog(df)
+    available_periods = get_sales_periods(catalog.df)
     
-    if len(available_periods) < 2:
+    if short_period not in available_periods or long_period not in available_periods or short_period == long_period:
         return pd.DataFrame()
     
-    # 각 상품별 기간별 매출 추출
-    growth_data = []
+    short_days = SALES_PERIOD_DAYS[short_period]
+    long_days = SALES_PERIOD_DAYS[long_period]
+    
+    # 장기 매출이 있는 실제 상품만 비교 (합계 행과 결측값은 마스크에서 제외)
+    rows = catalog.select(catalog.period_mask(long_period))
+    short_sales = catalog.column(f'{short_period}매출')[rows]
+    long_sales = catalog.column(f'{long_period}매출')[rows]
+    
+    # 단기 매출을 장기 기간 기준으로 환산한 비율 (예: 7일 vs 1년이면 7일 매출 × 365/7 ÷ 1년 매출)
+    sales_ratio = short_sales / long_sales * long_days / short_days
     
-    for _, row in df.iterrows():
-        product_name = row['상품명']
-        sales_data = []
+    result = pd.DataFrame({
+        '상품명': catalog.names[rows],
+        f'단기매출({short_period})': short_sales,
+        f'장기매출({long_period})': long_sales,
+        '매출성장률': sales_ratio,
+        '성장패턴': _growth_labels(sales_ratio)
+    })
+    
+    # 판매건수 컬럼이 있으면 같은 방식으로 판매건수 성장 패턴도 계산
+    short_count_col = f'{short_period}판매건수'
+    long_count_col = f'{long_period}판매건수'
+    if catalog.has(short_count_col, long_count_col):
+        short_counts = catalog.column(short_count_col)[rows]
+        long_counts = catalog.column(long_count_col)[rows]
+        has_counts = long_counts > 0
         
-        for period in available_periods:
-            sales_col = f'{period}매출'
-            sales_data.append(row[sales_col] if pd.notna(row[sales_col]) else 0)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            count_ratio = np.where(has_counts, short_counts / long_counts * long_days / short_days, np.nan)
         
-        # 단기(7일-1개월) vs 장기(1년-2년) 매출 비교
-        if '7일' in available_periods and '1년' in available_periods:
-            short_term = row['7일매출'] if '7일매출' in df.columns else 0
-            long_term = row['1년매출'] if '1년매출' in df.columns else 0
-            
-            if long_term > 0:
-                growth_ratio = short_term / long_term * 365 / 7  # 연간 환산
-                growth_data.append({
-                    '상품명': product_name,
-                    '단기매출(7일)': short_term,
-                    '장기매출(1년)': long_term,
-                    '성장패턴': '안정형' if 0.8 <= growth_ratio <= 1.2 else ('성장형' if growth_ratio > 1.2 else '감소형')
-                })
+        result[f'단기판매건수({short_period})'] = short_counts
+        result[f'장기판매건수({long_period})'] = long_counts
+        result['판매건수성장률'] = count_ratio
+        result['판매건수패턴'] = pd.Series(_growth_labels(count_ratio)).where(has_counts)
     
-    return pd.DataFrame(growth_data)
+    return result
 
 
 def get_sales_summary_stats(df, period='1년'):
     """매출 요약 통계"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     
-    if sales_col not in df.columns:
+    if not catalog.has(sales_col):
         return {}
     
-    # 토탈 항목을 제외한 실제 상품들만 필터링
-    filtered_df = df[df[sales_col] > 0].copy()
+    # 토탈 항목을 제외한 실제 상품들의 통계 (큐브에 미리 계산된 값)
+    cube = catalog.cube_for(period)
+    j = cube.index[period]
     
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
-    
-    sales_data = filtered_df[sales_col]
-    
-    if sales_data.empty:
+    if cube.counts[j] == 0:
         return {}
     
     summary = {
-        '총매출': int(sales_data.sum()),
-        '평균매출': int(sales_data.mean()),
-        '중간값매출': int(sales_data.median()),
-        '최대매출': int(sales_data.max()),
-        '최소매출': int(sales_data.min()),
-        '상품수': len(sales_data),
-        '매출상위10%기준': int(sales_data.quantile(0.9))
+        '총매출': int(cube.sales_total[j]),
+        '평균매출': int(cube.sales_mean[j]),
+        '중간값매출': int(cube.sales_median[j]),
+        '최대매출': int(cube.sales_max[j]),
+        '최소매출': int(cube.sales_min[j]),
+        '상품수': int(cube.counts[j]),
+        '매출상위10%기준': int(cube.sales_top10_cut[j])
     }
     
     return summary
@@ -623,37 +2367,28 @@ def get_sales_summary_stats(df, period='1년'):
 # 리뷰-매출 인사이트 분석 함수들
 def analyze_review_efficiency(df, period='1년'):
     """리뷰 효율성 분석 - 리뷰 1건당 매출이 높은 상품"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     review_count_col = '리뷰수'
     
-    required_cols = [sales_col, review_count_col]
-    if not all(col in df.columns for col in required_cols):
+    if not catalog.has(sales_col, review_count_col):
         return pd.DataFrame()
     
-    # 필요한 데이터가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=required_cols).copy()
-    filtered_df = filtered_df[(filtered_df[sales_col] > 0) & (filtered_df[review_count_col] > 0)]
-    
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
+    # 매출과 리뷰수가 0보다 큰 상품 중 리뷰 1건당 매출 상위 10개 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period)
+    top_rows = cube.top_rows(cube.review_efficiency_order, cube.review_efficiency_counts, period, 10)
     
-    if filtered_df.empty:
+    if len(top_rows) == 0:
         return pd.DataFrame()
     
-    # 리뷰 1건당 매출 계산
-    filtered_df['리뷰1건당매출'] = (filtered_df[sales_col] / filtered_df[review_count_col]).round(0)
-    
-    # 상위 10개 리뷰 효율성 상품
-    top_efficiency = filtered_df.nlargest(10, '리뷰1건당매출')
+    per_review = (catalog.column(sales_col)[top_rows] / catalog.column(review_count_col)[top_rows]).round(0)
     
     result = pd.DataFrame({
-        '순위': range(1, len(top_efficiency) + 1),
-        '상품명': top_efficiency['상품명'].values,
-        f'{period} 매출': top_efficiency[sales_col].values,
-        '리뷰수': top_efficiency[review_count_col].values,
-        '리뷰1건당매출': top_efficiency['리뷰1건당매출'].astype(int).values
+        '순위': range(1, len(top_rows) + 1),
+        '상품명': catalog.names[top_rows],
+        f'{period} 매출': catalog.column(sales_col)[top_rows],
+        '리뷰수': catalog.column(review_count_col)[top_rows],
+        '리뷰1건당매출': per_review.astype(int)
     })
     
     return result
@@ -661,106 +2396,67 @@ def analyze_review_efficiency(df, period='1년'):
 
 def analyze_hidden_gems(df, period='1년'):
     """숨겨진 보석 상품 - 매출은 낮은데 리뷰 점수가 높은 상품"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     review_score_col = '리뷰점수'
     
-    required_cols = [sales_col, review_score_col]
-    if not all(col in df.columns for col in required_cols):
+    if not catalog.has(sales_col, review_score_col):
         return pd.DataFrame()
     
-    # 필요한 데이터가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=required_cols).copy()
-    filtered_df = filtered_df[filtered_df[sales_col] > 0]
-    
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
-    
-    if filtered_df.empty:
-        return pd.DataFrame()
-    
-    # 매출 하위 50% 기준점 계산
-    sales_median = filtered_df[sales_col].median()
-    
-    # 리뷰 점수 4.5 이상 & 매출 중간값 이하인 상품
-    hidden_gems = filtered_df[
-        (filtered_df[review_score_col] >= 4.5) & 
-        (filtered_df[sales_col] <= sales_median)
-    ].copy()
+    # 리뷰 점수 4.5 이상 & 매출 중간값(하위 50% 기준점) 이하인 상품 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period)
+    gem_rows = cube.rows(cube.hidden_gems, period)
     
-    if hidden_gems.empty:
+    if len(gem_rows) == 0:
         return pd.DataFrame()
     
     # 리뷰 점수 순으로 정렬
-    hidden_gems = hidden_gems.sort_values(review_score_col, ascending=False).head(10)
+    gem_rows = gem_rows[_sorted_positions(catalog.column(review_score_col)[gem_rows], 10)]
     
     result = pd.DataFrame({
-        '순위': range(1, len(hidden_gems) + 1),
-        '상품명': hidden_gems['상품명'].values,
-        f'{period} 매출': hidden_gems[sales_col].values,
-        '리뷰점수': hidden_gems[review_score_col].values
+        '순위': range(1, len(gem_rows) + 1),
+        '상품명': catalog.names[gem_rows],
+        f'{period} 매출': catalog.column(sales_col)[gem_rows],
+        '리뷰점수': catalog.column(review_score_col)[gem_rows]
     })
     
     # 기본판매가격이 있으면 추가
-    if '기본판매가격' in hidden_gems.columns:
-        result['기본판매가격'] = hidden_gems['기본판매가격'].values
+    if catalog.has('기본판매가격'):
+        result['기본판매가격'] = catalog.column('기본판매가격')[gem_rows]
     
     return result
 
 
 def analyze_underperforming_products(df, period='1년'):
     """잠재력 미달 상품 - 리뷰는 좋은데 매출이 예상보다 낮은 상품"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     review_score_col = '리뷰점수'
     review_count_col = '리뷰수'
     
-    required_cols = [sales_col, review_score_col]
-    if not all(col in df.columns for col in required_cols):
+    if not catalog.has(sales_col, review_score_col):
         return pd.DataFrame()
     
-    # 필요한 데이터가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=required_cols).copy()
-    filtered_df = filtered_df[filtered_df[sales_col] > 0]
+    # 리뷰 점수 4.0 이상인데 매출이 상위 75% 기준점에 못미치는 상품 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period)
+    underperforming_rows = cube.rows(cube.underperforming, period)
     
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
-    
-    if filtered_df.empty:
-        return pd.DataFrame()
-    
-    # 리뷰 점수 4.0 이상인 상품들만
-    good_review_products = filtered_df[filtered_df[review_score_col] >= 4.0].copy()
-    
-    if len(good_review_products) == 0:
-        return pd.DataFrame()
-    
-    # 매출 상위 75% 기준점 계산
-    sales_75th = filtered_df[sales_col].quantile(0.75)
-    
-    # 리뷰는 좋은데 매출이 상위 75%에 못미치는 상품
-    underperforming = good_review_products[
-        good_review_products[sales_col] < sales_75th
-    ].copy()
-    
-    if underperforming.empty:
+    if len(underperforming_rows) == 0:
         return pd.DataFrame()
     
     # 리뷰 점수가 높은 순으로 정렬
-    underperforming = underperforming.sort_values(review_score_col, ascending=False).head(10)
+    underperforming_rows = underperforming_rows[_sorted_positions(catalog.column(review_score_col)[underperforming_rows], 10)]
     
     result_data = {
-        '순위': range(1, len(underperforming) + 1),
-        '상품명': underperforming['상품명'].values,
-        f'{period} 매출': underperforming[sales_col].values,
-        '리뷰점수': underperforming[review_score_col].values
+        '순위': range(1, len(underperforming_rows) + 1),
+        '상품명': catalog.names[underperforming_rows],
+        f'{period} 매출': catalog.column(sales_col)[underperforming_rows],
+        '리뷰점수': catalog.column(review_score_col)[underperforming_rows]
     }
     
     # 리뷰수가 있으면 추가
-    if review_count_col in underperforming.columns:
-        result_data['리뷰수'] = underperforming[review_count_col].values
+    if catalog.has(review_count_col):
+        result_data['리뷰수'] = catalog.column(review_count_col)[underperforming_rows]
     
     result = pd.DataFrame(result_data)
     
@@ -769,52 +2465,34 @@ def analyze_underperforming_products(df, period='1년'):
 
 def analyze_review_needed_products(df, period='1년'):
     """리뷰 확보 필요 상품 - 매출은 높은데 리뷰가 적은 상품"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     review_count_col = '리뷰수'
     
-    required_cols = [sales_col, review_count_col]
-    if not all(col in df.columns for col in required_cols):
+    if not catalog.has(sales_col, review_count_col):
         return pd.DataFrame()
     
-    # 필요한 데이터가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=required_cols).copy()
-    filtered_df = filtered_df[filtered_df[sales_col] > 0]
+    # 매출은 중간값 이상 & 리뷰수는 중간값 이하인 상품 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period)
+    needed_rows = cube.rows(cube.review_needed, period)
     
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
-    
-    if filtered_df.empty:
+    if len(needed_rows) == 0:
         return pd.DataFrame()
     
-    # 매출 상위 50% 기준점 계산
-    sales_median = filtered_df[sales_col].median()
-    
-    # 리뷰수 하위 50% 기준점 계산
-    review_median = filtered_df[review_count_col].median()
-    
-    # 매출은 중간값 이상 & 리뷰수는 중간값 이하인 상품
-    review_needed = filtered_df[
-        (filtered_df[sales_col] >= sales_median) & 
-        (filtered_df[review_count_col] <= review_median)
-    ].copy()
-    
-    if review_needed.empty:
-        return pd.DataFrame()
-    
-    # 매출 대비 리뷰 부족도 계산 (매출/리뷰수)
-    review_needed['매출대비리뷰부족도'] = review_needed[sales_col] / (review_needed[review_count_col] + 1)
+    # 매출 대비 리뷰 부족도 계산 (매출/리뷰수, 리뷰수가 int8 등으로 축소돼 있어도 +1이 넘치지 않도록 float64로 계산)
+    review_counts = catalog.column(review_count_col)[needed_rows].astype(np.float64)
+    shortage = catalog.column(sales_col)[needed_rows] / (review_counts + 1)
     
     # 리뷰 부족도가 높은 순으로 정렬
-    review_needed = review_needed.sort_values('매출대비리뷰부족도', ascending=False).head(10)
+    top = _sorted_positions(shortage, 10)
+    needed_rows = needed_rows[top]
     
     result = pd.DataFrame({
-        '순위': range(1, len(review_needed) + 1),
-        '상품명': review_needed['상품명'].values,
-        f'{period} 매출': review_needed[sales_col].values,
-        '리뷰수': review_needed[review_count_col].values,
-        '매출대비리뷰부족도': review_needed['매출대비리뷰부족도'].values
+        '순위': range(1, len(needed_rows) + 1),
+        '상품명': catalog.names[needed_rows],
+        f'{period} 매출': catalog.column(sales_col)[needed_rows],
+        '리뷰수': catalog.column(review_count_col)[needed_rows],
+        '매출대비리뷰부족도': shortage[top]
     })
     
     return result
@@ -822,60 +2500,46 @@ def analyze_review_needed_products(df, period='1년'):
 
 def analyze_value_products(df, period='1년'):
     """가성비 인증 상품 - 저렴한 가격 + 높은 리뷰 점수"""
+    catalog = _as_catalog(df)
     sales_col = f'{period}매출'
     review_score_col = '리뷰점수'
     price_col = '기본판매가격'
     
-    required_cols = [sales_col, review_score_col, price_col]
-    if not all(col in df.columns for col in required_cols):
+    if not catalog.has(sales_col, review_score_col, price_col):
         return pd.DataFrame()
     
-    # 필요한 데이터가 있는 상품들만 필터링
-    filtered_df = df.dropna(subset=required_cols).copy()
-    filtered_df = filtered_df[(filtered_df[sales_col] > 0) & (filtered_df[price_col] > 0)]
-    
-    # "토탈", "TOTAL", "합계" 등의 항목 제외
-    total_keywords = ['토탈', 'TOTAL', 'Total', '합계', '전체', '총계']
-    for keyword in total_keywords:
-        filtered_df = filtered_df[~filtered_df['상품명'].str.contains(keyword, na=False, case=False)]
-    
-    if filtered_df.empty:
-        return pd.DataFrame()
-    
-    # 가격 하위 50% 기준점 계산
-    price_median = filtered_df[price_col].median()
-    
-    # 가격 중간값 이하 & 리뷰 점수 4.0 이상인 상품
-    value_products = filtered_df[
-        (filtered_df[price_col] <= price_median) & 
-        (filtered_df[review_score_col] >= 4.0)
-    ].copy()
+    # 가격 중간값(하위 50% 기준점) 이하 & 리뷰 점수 4.0 이상인 상품 ("토탈", "TOTAL", "합계" 등의 항목 제외)
+    cube = catalog.cube_for(period)
+    value_rows = cube.rows(cube.value_candidates, period)
     
-    if value_products.empty:
+    if len(value_rows) == 0:
         return pd.DataFrame()
     
     # 가성비 점수 계산 (리뷰 점수 / 가격의 정규화 점수)
     # 가격을 0-1로 정규화한 후 (1 - 정규화가격) * 리뷰점수로 계산
-    min_price = value_products[price_col].min()
-    max_price = value_products[price_col].max()
+    value_prices = catalog.column(price_col)[value_rows]
+    value_scores = catalog.column(review_score_col)[value_rows]
+    min_price = value_prices.min()
+    max_price = value_prices.max()
     
     if max_price > min_price:
-        value_products['정규화가격'] = (value_products[price_col] - min_price) / (max_price - min_price)
+        normalized_price = (value_prices - min_price) / (max_price - min_price)
     else:
-        value_products['정규화가격'] = 0
+        normalized_price = 0
     
-    value_products['가성비점수'] = (1 - value_products['정규화가격']) * value_products[review_score_col]
+    value_score = (1 - normalized_price) * value_scores
     
     # 가성비 점수가 높은 순으로 정렬
-    value_products = value_products.sort_values('가성비점수', ascending=False).head(10)
+    top = _sorted_positions(value_score, 10)
+    value_rows = value_rows[top]
     
     result = pd.DataFrame({
-        '순위': range(1, len(value_products) + 1),
-        '상품명': value_products['상품명'].values,
-        '기본판매가격': value_products[price_col].values,
-        '리뷰점수': value_products[review_score_col].values,
-        '가성비점수': value_products['가성비점수'].values,
-        f'{period} 매출': value_products[sales_col].values
+        '순위': range(1, len(value_rows) + 1),
+        '상품명': catalog.names[value_rows],
+        '기본판매가격': catalog.column(price_col)[value_rows],
+        '리뷰점수': catalog.column(review_score_col)[value_rows],
+        '가성비점수': value_score[top],
+        f'{period} 매출': catalog.column(sales_col)[value_rows]
     })
     
     return result
\ No newline at end of file